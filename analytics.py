@@ -0,0 +1,228 @@
+"""Vectorized history analytics with NumPy.
+
+The history is loaded once into three arrays: epoch seconds, minutes and
+type code. The JSON journal is read straight from its binary sidecar; the
+SQLite backend is read through one range query. Each metric is then a few
+whole-array operations, so a full report on 1M sessions takes well under a
+second:
+
+- current and longest daily focus streaks
+- 7- and 30-day rolling focus averages (minutes per day)
+- focus minutes by weekday x hour of day, using session start times
+- focus/break ratios, overall and for the last 30 days
+
+Days are UTC, like the rest of the app, unless a UTC offset is given. NumPy
+is optional: the History dialog shows these numbers only when it is
+installed.
+
+    python analytics.py [history.jsonl|history.db ...] [--json] [--utc-offset HOURS] [--today YYYY-MM-DD]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from history_store import BIN_HEADER, BIN_RECORD, TYPE_CODES, HistoryStore
+
+DAY = 86400
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+FOCUS = TYPE_CODES['focus']
+BREAK = TYPE_CODES['break']
+
+
+def record_dtype():
+    """NumPy view of a binary sidecar record (history_store.BIN_RECORD)"""
+    import numpy as np
+    dtype = np.dtype([('ts', '<i8'), ('minutes', '<u2'), ('code', 'u1'), ('pad', 'V5')])
+    assert dtype.itemsize == BIN_RECORD.size
+    return dtype
+
+
+def index_arrays(data):
+    """(epoch seconds, minutes, type codes) arrays over binary sidecar records"""
+    import numpy as np
+    records = np.frombuffer(data, dtype=record_dtype())
+    return records['ts'], records['minutes'], records['code']
+
+
+def read_index(path):
+    """The same arrays from a binary sidecar file"""
+    with open(path, 'rb') as f:
+        f.seek(BIN_HEADER.size)
+        data = f.read()
+    return index_arrays(data[:len(data) - len(data) % BIN_RECORD.size])
+
+
+def load_arrays(store):
+    """Load any history backend into (epoch seconds, minutes, type codes) arrays"""
+    import numpy as np
+    if hasattr(store, 'index_bytes'):
+        return index_arrays(store.index_bytes())
+    rows = store.range()
+    ts = np.fromiter((row[0] for row in rows), np.int64, len(rows))
+    minutes = np.fromiter((row[2] or 0 for row in rows), np.int64, len(rows))
+    codes = np.fromiter((TYPE_CODES.get(row[1], 0) for row in rows), np.uint8, len(rows))
+    return ts, minutes, codes
+
+
+def daily_focus(ts, minutes, codes, today, utc_offset=0):
+    """(first day number, focus minutes per day from that day through `today`)"""
+    import numpy as np
+    focus = codes == FOCUS
+    days = (ts[focus] + utc_offset) // DAY
+    weights = minutes[focus]
+    today_n = (today - datetime.date(1970, 1, 1)).days
+    keep = days <= today_n
+    days, weights = days[keep], weights[keep]
+    if not days.size:
+        return today_n, np.zeros(1)
+    first = int(days.min())
+    return first, np.bincount(days - first, weights=weights, minlength=today_n - first + 1)
+
+
+def streaks(daily):
+    """(current, longest) runs of days with any focus; the current run may end yesterday"""
+    import numpy as np
+    edges = np.diff(np.concatenate(([0], (daily > 0).astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if not starts.size:
+        return 0, 0
+    lengths = ends - starts
+    current = int(lengths[-1]) if ends[-1] >= len(daily) - 1 else 0
+    return current, int(lengths.max())
+
+
+def rolling_average(daily, k):
+    """Mean focus minutes per day over the `k` days ending on each day (days before the history count as 0)"""
+    import numpy as np
+    sums = np.cumsum(np.concatenate((np.zeros(k), daily)))
+    return (sums[k:] - sums[:-k]) / k
+
+
+def hour_weekday(ts, minutes, codes, utc_offset=0):
+    """7 x 24 focus minutes by weekday (Monday first) and hour the session started"""
+    import numpy as np
+    focus = codes == FOCUS
+    mins = minutes[focus].astype(np.int64)
+    start = ts[focus] + utc_offset - mins * 60
+    weekday = (start // DAY + 3) % 7  # 1970-01-01 was a Thursday
+    hour = start % DAY // 3600
+    return np.bincount(weekday * 24 + hour, weights=mins, minlength=7 * 24).reshape(7, 24)
+
+
+def ratios(ts, minutes, codes, since=None):
+    """Focus and break totals and their ratios, optionally from epoch `since` on"""
+    if since is not None:
+        keep = ts >= since
+        minutes, codes = minutes[keep], codes[keep]
+    focus, brk = codes == FOCUS, codes == BREAK
+    focus_minutes, break_minutes = int(minutes[focus].sum()), int(minutes[brk].sum())
+    focus_sessions, break_sessions = int(focus.sum()), int(brk.sum())
+    return {
+        'focus_minutes': focus_minutes,
+        'break_minutes': break_minutes,
+        'focus_sessions': focus_sessions,
+        'break_sessions': break_sessions,
+        'minute_ratio': round(focus_minutes / break_minutes, 2) if break_minutes else None,
+        'session_ratio': round(focus_sessions / break_sessions, 2) if break_sessions else None,
+    }
+
+
+def report(ts, minutes, codes, today=None, utc_offset=0):
+    """Every metric for the loaded arrays, as plain Python values"""
+    today = today or (datetime.datetime.now(datetime.timezone.utc)
+                      + datetime.timedelta(seconds=utc_offset)).date()
+    first, daily = daily_focus(ts, minutes, codes, today, utc_offset)
+    current, longest = streaks(daily)
+    avg7, avg30 = rolling_average(daily, 7), rolling_average(daily, 30)
+    month_start = (today - datetime.date(1970, 1, 1)).days - 29
+    return {
+        'today': today.isoformat(),
+        'sessions': int(len(ts)),
+        'first_day': (datetime.date(1970, 1, 1) + datetime.timedelta(days=first)).isoformat(),
+        'current_streak': current,
+        'longest_streak': longest,
+        'avg_7d': round(float(avg7[-1]), 1),
+        'avg_30d': round(float(avg30[-1]), 1),
+        'best_avg_7d': round(float(avg7.max()), 1),
+        'best_avg_30d': round(float(avg30.max()), 1),
+        'ratios': ratios(ts, minutes, codes),
+        'ratios_30d': ratios(ts, minutes, codes, month_start * DAY - utc_offset),
+        'hour_weekday': hour_weekday(ts, minutes, codes, utc_offset).astype(int).tolist(),
+    }
+
+
+def store_report(store, today=None, utc_offset=0):
+    return report(*load_arrays(store), today=today, utc_offset=utc_offset)
+
+
+def open_store(path):
+    if path.endswith('.db'):
+        from sqlite_history import SQLiteHistoryStore
+        return SQLiteHistoryStore(path)
+    return HistoryStore(path)
+
+
+def format_minutes(minutes):
+    minutes = int(round(minutes))
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+def format_report(r):
+    lines = [f"{r['sessions']:,} sessions since {r['first_day']} (to {r['today']})",
+             f"Streak: {r['current_streak']} days (longest {r['longest_streak']})",
+             f"Focus per day: 7-day avg {format_minutes(r['avg_7d'])}, 30-day avg {format_minutes(r['avg_30d'])} "
+             f"(best {format_minutes(r['best_avg_7d'])} / {format_minutes(r['best_avg_30d'])})"]
+    for label, ratio in (('all time', r['ratios']), ('last 30 days', r['ratios_30d'])):
+        minute_ratio = f"{ratio['minute_ratio']}:1" if ratio['minute_ratio'] is not None else 'n/a'
+        lines.append(f"Focus:break {label}: {minute_ratio} by minutes "
+                     f"({format_minutes(ratio['focus_minutes'])} / {format_minutes(ratio['break_minutes'])}, "
+                     f"{ratio['focus_sessions']} / {ratio['break_sessions']} sessions)")
+    matrix = r['hour_weekday']
+    peak = max(max(row) for row in matrix) or 1
+    shades = ' .:-=+*#%@'
+    lines.append('Focus by start hour  ' + ''.join(f'{h:<3}' if h % 3 == 0 else '' for h in range(24)))
+    for name, row in zip(WEEKDAYS, matrix):
+        lines.append(f"  {name:<19}" + ''.join(shades[min(9, v * 10 // (peak + 1))] for v in row))
+    return '\n'.join(lines)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Focus analytics for Pomodoro history files')
+    parser.add_argument('paths', nargs='*', help='history journals (.jsonl) or SQLite databases (.db); '
+                        'default: pomodoro_history.jsonl next to this script')
+    parser.add_argument('--json', action='store_true', help='print one JSON report per line')
+    parser.add_argument('--utc-offset', type=float, default=0.0, help='hours to add to UTC for day boundaries')
+    parser.add_argument('--today', type=datetime.date.fromisoformat, help='report as of this date (YYYY-MM-DD)')
+    args = parser.parse_args(argv)
+    paths = args.paths or [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pomodoro_history.jsonl')]
+    offset = int(args.utc_offset * 3600)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("analytics.py needs NumPy: pip install numpy")
+        return 2
+    status = 0
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"{path}: not found")
+            status = 1
+            continue
+        store = open_store(path)
+        try:
+            r = store_report(store, args.today, offset)
+        finally:
+            if hasattr(store, 'close'):
+                store.close()
+        if args.json:
+            print(json.dumps({'path': path, **r}))
+        else:
+            print(f"== {path}")
+            print(format_report(r))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
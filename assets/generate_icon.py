@@ -1,20 +1,29 @@
-from PIL import Image, ImageDraw
+"""Write assets/pomodro.ico from the app's shared icon drawing (icons.py).
+
+Every size from 16 to 256 px is rendered separately, and the renders land
+in the same per-user cache the running app reads.
+
+    python assets/generate_icon.py [--theme dark|light] [--out path.ico]
+"""
+
+import argparse
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import icons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--theme', choices=sorted(icons.THEMES), default='dark')
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pomodro.ico'))
+    args = parser.parse_args()
+    icons.warm_cache()
+    icons.write_ico(args.out, args.theme)
+    print('Icon written to', args.out)
+
 
-size = 256
-img = Image.new('RGBA', (size, size), (0,0,0,0))
-d = ImageDraw.Draw(img)
-# background circle
-accent = (31, 111, 235, 255)  # #1f6feb
-white = (255, 255, 255, 255)
-# outer
-d.ellipse((8,8,size-8,size-8), fill=accent)
-# timer slot
-d.rectangle((size*0.47, size*0.28, size*0.53, size*0.60), fill=white)
-# subtle inner ring effect
-for r in range(0,6):
-    d.ellipse((16+r,16+r,size-16-r,size-16-r), outline=(255,255,255,20), width=1)
-
-out_path = os.path.join(os.path.dirname(__file__), 'pomodro.ico')
-img.save(out_path, format='ICO', sizes=[(16,16),(32,32),(48,48),(64,64),(128,128),(256,256)])
-print('Icon written to', out_path)
+if __name__ == '__main__':
+    main()
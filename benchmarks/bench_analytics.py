@@ -0,0 +1,80 @@
+"""Benchmark: analytics.py metrics on a large history.
+
+Writes a synthetic binary sidecar (the file HistoryStore keeps beside the
+journal), then times loading it into arrays and each metric, as well as the
+full report. Sessions alternate focus/break, roughly 30 minutes apart.
+
+    python benchmarks/bench_analytics.py [--entries 1000000] [--dir DIR]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import analytics
+from history_store import BinaryHistory
+
+
+def write_index(path, n, end):
+    rng = np.random.default_rng(1)
+    records = np.zeros(n, dtype=analytics.record_dtype())
+    records['ts'] = end - np.cumsum(rng.integers(600, 3000, n))[::-1]
+    records['code'] = np.where(np.arange(n) % 2 == 0, analytics.FOCUS, analytics.BREAK)
+    records['minutes'] = np.where(records['code'] == analytics.FOCUS, rng.integers(15, 60, n), 5)
+    with open(path, 'wb') as f:
+        f.write(BinaryHistory._pack_header(None))
+        records.tofile(f)
+
+
+def timed(fn, repeat=5):
+    """(result, best wall time in ms)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--dir', help='where to write the scratch sidecar (default: system temp)')
+    args = parser.parse_args()
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    end = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, 'history.bin')
+        write_index(path, args.entries, end)
+        (ts, minutes, codes), load_ms = timed(lambda: analytics.read_index(path))
+
+    (first, daily), daily_ms = timed(lambda: analytics.daily_focus(ts, minutes, codes, today))
+    rows = [
+        ('load sidecar', load_ms),
+        ('daily focus', daily_ms),
+        ('streaks', timed(lambda: analytics.streaks(daily))[1]),
+        ('rolling 7/30 days', timed(lambda: (analytics.rolling_average(daily, 7),
+                                             analytics.rolling_average(daily, 30)))[1]),
+        ('hour x weekday', timed(lambda: analytics.hour_weekday(ts, minutes, codes))[1]),
+        ('focus/break ratios', timed(lambda: analytics.ratios(ts, minutes, codes))[1]),
+    ]
+    r, report_ms = timed(lambda: analytics.report(ts, minutes, codes, today))
+    rows.append(('full report', report_ms))
+
+    print(f"{args.entries:,} sessions over {len(daily):,} days")
+    for name, ms in rows:
+        print(f"  {name:<20}{ms:>9.1f} ms")
+    print(f"  streak {r['current_streak']} (longest {r['longest_streak']}), 7-day avg {r['avg_7d']} min/day")
+
+
+if __name__ == '__main__':
+    main()
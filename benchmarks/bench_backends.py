@@ -0,0 +1,75 @@
+"""Benchmark: JSON journal vs. SQLite history backend.
+
+For each history size, times a single-session insert and the aggregates
+the stats dialog needs (per-day totals and a this-month summary).
+
+    python benchmarks/bench_backends.py [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+from sqlite_history import SQLiteHistoryStore
+
+INSERTS = 50
+
+
+def synthetic_entries(n):
+    start = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=30 * n)
+    for i in range(n):
+        yield {'type': 'focus', 'minutes': 25, 'ts': (start + datetime.timedelta(minutes=30 * i)).isoformat()}
+
+
+def timed(fn, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def bench(store, month_epoch):
+    entry = {'type': 'focus', 'minutes': 25, 'ts': datetime.datetime.now(datetime.timezone.utc).isoformat()}
+    store.daily_totals()  # warm any derived index before timing
+    store.summarize(month_epoch)
+    return {
+        'insert': timed(lambda: store.append(entry), INSERTS),
+        'daily': timed(store.daily_totals, 5),
+        'month': timed(lambda: store.summarize(month_epoch), 5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    today = datetime.datetime.now(datetime.timezone.utc)
+    month_epoch = int(today.replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp())
+
+    print(f"{'sessions':>10}  {'backend':>7}  {'insert ms':>10}  {'daily ms':>10}  {'month ms':>10}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, 'h.jsonl')
+            with open(journal, 'w') as f:
+                f.writelines(json.dumps(e) + '\n' for e in synthetic_entries(n))
+            db = SQLiteHistoryStore(os.path.join(tmp, 'h.db'))
+            db.import_entries(synthetic_entries(n))
+            for name, store in (('json', HistoryStore(journal)), ('sqlite', db)):
+                r = bench(store, month_epoch)
+                print(f"{n:>10}  {name:>7}  {r['insert']:>10.3f}  {r['daily']:>10.3f}  {r['month']:>10.3f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: binary history sidecar vs. the JSON list of dicts at 1M sessions.
+
+Compares load time and Python heap use of json.load() on the legacy array
+with the mmap-backed binary file, and times a this-week range query on each.
+
+    python benchmarks/bench_binary_history.py [--entries 1000000]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore, file_signature
+
+
+def synthetic_entries(n):
+    start = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=30 * n)
+    for i in range(n):
+        ts = start + datetime.timedelta(minutes=30 * i)
+        yield {'type': 'focus', 'minutes': 25, 'ts': ts.isoformat()}
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    week_start = (now - datetime.timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    week_epoch = int(week_start.timestamp())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'history.json')
+        with open(legacy, 'w') as f:
+            json.dump(list(synthetic_entries(args.entries)), f)
+        store = HistoryStore(os.path.join(tmp, 'history.jsonl'), legacy)  # migrates the array
+
+        def load_json():
+            with open(legacy + '.bak') as f:
+                return json.load(f)
+        hist, json_s, json_peak = measure(load_json)
+
+        def json_week():
+            total = 0
+            for entry in hist:
+                if datetime.datetime.fromisoformat(entry['ts']) >= week_start:
+                    total += entry['minutes']
+            return total
+        _, json_query_s, _ = measure(json_week)
+        del hist
+
+        start = time.perf_counter()
+        store.binary.rebuild(store.iter_entries(), file_signature(store.path))
+        rebuild_s = time.perf_counter() - start
+        size_mb = os.path.getsize(store.binary.path) / 1e6
+
+        _, bin_query_s, bin_peak = measure(lambda: store.summarize(week_epoch))
+        rows, bin_range_s, _ = measure(lambda: store.range(week_epoch))
+
+        print(f"{args.entries:,} sessions")
+        print(f"JSON list   load {json_s * 1000:9.1f} ms  heap {json_peak / 1e6:8.1f} MB  "
+              f"this-week scan {json_query_s * 1000:8.1f} ms")
+        print(f"binary      mmap per query      heap {bin_peak / 1e6:8.3f} MB  "
+              f"this-week sum  {bin_query_s * 1000:8.3f} ms  ({len(rows)} rows via range() in {bin_range_s * 1000:.3f} ms)")
+        print(f"binary file {size_mb:.1f} MB, one-off rebuild from journal {rebuild_s:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: History dialog chart render time vs. history length.
+
+Renders the focus-hours chart off-screen (Agg) for each visible window and
+history span, timing binning, the draw and PNG encoding, as the History
+dialog's worker does. The "unbinned" column is the old one-bar-per-day chart
+with a label per bar and tight_layout().
+
+    python benchmarks/bench_chart.py [--days 30 365 1825 3650] [--repeat 5]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import history_chart
+
+PALETTE = {'accent': '#1f6feb', 'accent2': '#8957e5', 'break_accent': '#2ea043',
+           'ring_bg': '#30363d', 'card': '#161b22', 'fg': '#e6edf3', 'subtle': '#30363d'}
+
+
+def synthetic_daily(days, today):
+    rng = random.Random(days)
+    return {today - datetime.timedelta(days=i): rng.choice((0, 25, 50, 100, 150, 250))
+            for i in range(days)}
+
+
+def new_figure():
+    fig = Figure(figsize=(6.2, 3.2))
+    fig.subplots_adjust(left=0.09, right=0.98, top=0.88, bottom=0.26)
+    return fig, fig.add_subplot(), FigureCanvasAgg(fig)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def render_binned(daily, today, window):
+    history_chart.render_png(daily, today, PALETTE, window)
+
+
+def render_unbinned(daily, today):
+    fig, ax, canvas = new_figure()
+    days = sorted(daily)
+    bars = ax.bar([d.strftime('%m/%d') for d in days], [daily[d] / 60 for d in days], width=0.65)
+    for bar in bars:
+        if bar.get_height() > 0.2:
+            ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + 0.1,
+                    f'{bar.get_height():.1f}h', ha='center', va='bottom', fontsize=8)
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    canvas.draw()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 365, 1825, 3650])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    windows = list(history_chart.WINDOWS.items())
+    render_binned({}, today, None)  # warm font caches
+
+    header = ''.join(f'{name:>16}' for name, _ in windows)
+    print(f"{'days':>6}{header}{'unbinned':>12}   (ms, bars)")
+    for days in args.days:
+        daily = synthetic_daily(days, today)
+        cells = []
+        for _, window in windows:
+            ms = timed(lambda: render_binned(daily, today, window), args.repeat)
+            _, bins = history_chart.bin_daily(daily, today, window)
+            cells.append(f'{ms:>10.1f} ({len(bins):>3})')
+        unbinned = timed(lambda: render_unbinned(daily, today), 1)
+        print(f'{days:>6}' + ''.join(cells) + f'{unbinned:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
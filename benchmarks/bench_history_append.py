@@ -0,0 +1,70 @@
+"""Benchmark: cost of recording one session as the history grows.
+
+Compares the journal append against the old read-modify-write of a JSON
+array. The journal cost should stay flat from 10 to 1,000,000 entries.
+
+    python benchmarks/bench_history_append.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+
+SIZES = [10, 1_000, 100_000, 1_000_000]
+APPENDS = 200
+LEGACY_MAX = 100_000  # the legacy path is too slow to be worth timing beyond this
+
+ENTRY = {'type': 'focus', 'minutes': 25, 'ts': '2025-08-29T05:51:13.728452+00:00'}
+
+
+def seed_journal(path, n):
+    line = json.dumps(ENTRY) + '\n'
+    with open(path, 'w') as f:
+        for _ in range(n):
+            f.write(line)
+
+
+def legacy_append(path, entry):
+    history = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            history = json.load(f)
+    history.append(entry)
+    with open(path, 'w') as f:
+        json.dump(history, f)
+
+
+def time_per_call(fn, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'entries':>10}  {'journal (us)':>14}  {'legacy (us)':>14}")
+        for n in SIZES:
+            journal = os.path.join(tmp, f'h{n}.jsonl')
+            seed_journal(journal, n)
+            store = HistoryStore(journal)
+            journal_us = time_per_call(lambda: store.append(ENTRY), APPENDS) * 1e6
+
+            legacy_us = float('nan')
+            if n <= LEGACY_MAX:
+                legacy = os.path.join(tmp, f'h{n}.json')
+                with open(legacy, 'w') as f:
+                    json.dump([ENTRY] * n, f)
+                count = max(3, min(APPENDS, 1_000_000 // max(n, 1)))
+                legacy_us = time_per_call(lambda: legacy_append(legacy, ENTRY), count) * 1e6
+            print(f"{n:>10}  {journal_us:>14.1f}  {legacy_us:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark: latency of the first History table page as the journal grows.
+
+The table reads its newest rows backwards from the end of the journal, so
+the first page should cost the same at 1,000 and 1,000,000 entries.
+
+    python benchmarks/bench_history_page.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+
+SIZES = [1_000, 100_000, 1_000_000]
+PAGE = 100
+REPEAT = 50
+
+ENTRY = {'type': 'focus', 'minutes': 25, 'ts': '2025-08-29T05:51:13.728452+00:00'}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'entries':>10}  {'first page (ms)':>16}  {'10th page (ms)':>15}")
+        for n in SIZES:
+            path = os.path.join(tmp, f'h{n}.jsonl')
+            line = json.dumps(ENTRY) + '\n'
+            with open(path, 'w') as f:
+                f.writelines(line for _ in range(n))
+            store = HistoryStore(path)
+
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                store.read_page_reverse(None, PAGE)
+            first_ms = (time.perf_counter() - start) / REPEAT * 1000
+
+            cursor = None
+            for _ in range(9):
+                _, cursor = store.read_page_reverse(cursor, PAGE)
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                store.read_page_reverse(cursor, PAGE)
+            tenth_ms = (time.perf_counter() - start) / REPEAT * 1000
+            print(f"{n:>10}  {first_ms:>16.3f}  {tenth_ms:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
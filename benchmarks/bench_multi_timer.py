@@ -0,0 +1,75 @@
+"""Benchmark: many concurrent timers, one heap scheduler vs. a loop per timer.
+
+Runs N timers with mixed durations for a simulated span on a VirtualClock.
+One timer is watched (on screen, polled every second); the rest wake only at
+their deadlines. The "per-timer loops" column polls every timer every
+second, which is what N independent one-second loops would do.
+
+    python benchmarks/bench_multi_timer.py [--timers 10 100 1000] [--hours 1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timer_core import TimerCore, VirtualClock
+from timer_engine import TimerEngine
+
+
+def durations(i):
+    return 60 * (5 + i % 45), 60 * (1 + i % 10)
+
+
+def run_engine(n, seconds):
+    clock = VirtualClock()
+    engine = TimerEngine(clock=clock)
+    sessions = [0]
+    engine.subscribe('session_complete', lambda name, kind, minutes, drift: sessions.__setitem__(0, sessions[0] + 1))
+    for i in range(n):
+        engine.add(f'timer{i}', *durations(i))
+        engine.start(f'timer{i}')
+    engine.watch('timer0')
+    start = time.perf_counter()
+    delay = engine.poll()
+    while clock.now < seconds:
+        clock.advance(delay)
+        delay = engine.poll()
+    return time.perf_counter() - start, engine.polls, sessions[0]
+
+
+def run_loops(n, seconds):
+    clock = VirtualClock()
+    cores = [TimerCore(*durations(i), clock=clock) for i in range(n)]
+    sessions = [0]
+    for core in cores:
+        core.subscribe('session_complete', lambda kind, minutes, drift: sessions.__setitem__(0, sessions[0] + 1))
+        core.start()
+    polls = 0
+    start = time.perf_counter()
+    for _ in range(int(seconds)):
+        clock.advance(1.0)
+        for core in cores:
+            core.poll()
+        polls += n
+    return time.perf_counter() - start, polls, sessions[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--timers', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--hours', type=float, default=1.0)
+    args = parser.parse_args()
+    seconds = args.hours * 3600
+
+    print(f"{'timers':>7}  {'engine ms':>10}  {'polls':>9}  {'sessions':>8}  {'loops ms':>10}  {'polls':>10}  {'sessions':>8}")
+    for n in args.timers:
+        e_s, e_polls, e_sessions = run_engine(n, seconds)
+        l_s, l_polls, l_sessions = run_loops(n, seconds)
+        print(f"{n:>7}  {e_s * 1000:>10.1f}  {e_polls:>9}  {e_sessions:>8}  {l_s * 1000:>10.1f}  {l_polls:>10}  {l_sessions:>8}")
+
+
+if __name__ == '__main__':
+    main()
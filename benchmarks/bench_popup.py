@@ -0,0 +1,115 @@
+"""Benchmark: stretch popup animation cost and callback leaks.
+
+Opens the popup several times, closing each one early, then checks that no
+after() callbacks are left behind. It also counts Tcl calls per animation
+frame, compared with the old redraw-everything frame (delete('all') plus
+recreating every figure item). The app runs on a scratch history, config and
+control socket, so the checkout and any running instance are left alone.
+
+Needs a display (use xvfb-run on headless Linux).
+
+    python benchmarks/bench_popup.py [--popups 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pomodoro
+
+
+class CountingTk:
+    """Wraps a tkapp and counts call() invocations"""
+
+    def __init__(self, tkapp):
+        self._tkapp = tkapp
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tkapp.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+
+def pump(app, seconds):
+    # Call 'update' on the raw tkapp so event pumping is not counted
+    tkapp = getattr(app.tk, '_tkapp', app.tk)
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        tkapp.call('update')
+        time.sleep(0.005)
+
+
+def pending_afters(app):
+    return len(app.tk.splitlist(app.tk.call('after', 'info')))
+
+
+def legacy_frame_calls(app, counter):
+    """Tcl calls made by one frame of the old delete-and-redraw animation"""
+    import tkinter as tk
+    canvas = tk.Canvas(app)
+    before = counter.calls
+    canvas.delete('all')
+    for g in range(8, 0, -2):
+        canvas.create_oval(0, 0, g, g)
+    canvas.create_oval(0, 0, 1, 1)
+    for _ in range(5):
+        canvas.create_line(0, 0, 1, 1)
+    calls = counter.calls - before
+    canvas.destroy()
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--popups', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        for name in ('HISTORY_FILE', 'LEGACY_HISTORY_FILE', 'HISTORY_DB_FILE', 'CONFIG_FILE'):
+            setattr(pomodoro, name, os.path.join(scratch, os.path.basename(getattr(pomodoro, name))))
+        os.environ['POMODORO_SOCKET'] = os.path.join(scratch, 'control')
+        run(args)
+
+
+def run(args):
+    app = pomodoro.PomodoroApp()
+    counter = CountingTk(app.tk)
+    app.tk = counter  # widgets created from here on inherit the counting wrapper
+    pump(app, 0.5)
+    baseline = pending_afters(app)
+
+    for _ in range(args.popups):
+        popup = app.show_stretch_popup()
+        pump(app, 0.3)
+        popup.destroy()
+    pump(app, 0.5)
+    leaked = pending_afters(app) - baseline
+    print(f"after() callbacks left behind by {args.popups} popups: {leaked}")
+
+    popup = app.show_stretch_popup()
+    pump(app, 0.2)
+    start_calls, start = counter.calls, time.monotonic()
+    pump(app, 3.0)
+    frames = (time.monotonic() - start) / 0.1
+    per_frame = (counter.calls - start_calls) / frames
+    popup.destroy()
+    print(f"Tcl calls per frame: {per_frame:.1f}")
+    print(f"Tcl calls per frame, old redraw: {legacy_frame_calls(app, counter)}")
+    print(f"frame scheduler: {app.frames.stats()}")
+    app.destroy()
+    # Shut down like pomodoro.main() before the scratch directory goes
+    if app.control is not None:
+        app.control.stop()
+    app.writer.close()
+    app.notifier.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: cold start of the Tk app.
+
+Launches a fresh interpreter per run, builds PomodoroApp and measures the
+wall time until the main window is first mapped (time-to-first-frame) plus
+the peak RSS of that process. Runs twice: with whatever optional packages
+are installed, and with PIL/pystray/plyer/matplotlib hidden. Each run gets
+a scratch directory for its history, config and control socket, so nothing
+is written to the checkout and a running app is left alone.
+
+Needs a display (use xvfb-run on headless Linux).
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPTIONAL = ['PIL', 'pystray', 'plyer', 'matplotlib']
+
+CHILD = r'''
+import json, os, sys, time
+sys.path.insert(0, {repo!r})
+for name in {blocked!r}:
+    sys.modules[name] = None  # makes "import name" fail as if not installed
+import pomodoro
+for name in ('HISTORY_FILE', 'LEGACY_HISTORY_FILE', 'HISTORY_DB_FILE', 'CONFIG_FILE'):
+    setattr(pomodoro, name, os.path.join({scratch!r}, os.path.basename(getattr(pomodoro, name))))
+app = pomodoro.PomodoroApp()
+while not app.winfo_ismapped():
+    app.update()
+first_frame = time.time()
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_kb = rss // 1024 if sys.platform == 'darwin' else rss
+except ImportError:
+    rss_kb = None
+modules = sorted(m for m in {optional!r} if sys.modules.get(m) is not None)
+app.destroy()
+print(json.dumps({{'first_frame': first_frame, 'rss_kb': rss_kb, 'loaded': modules}}))
+'''
+
+
+def run_once(blocked):
+    with tempfile.TemporaryDirectory() as scratch:
+        code = CHILD.format(repo=REPO_DIR, blocked=blocked, optional=OPTIONAL, scratch=scratch)
+        env = dict(os.environ, POMODORO_SOCKET=os.path.join(scratch, 'control'))
+        start = time.time()
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=scratch, env=env)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else 'child failed')
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result['ttff_ms'] = (result['first_frame'] - start) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    for label, blocked in (('with optional packages', []), ('without optional packages', OPTIONAL)):
+        try:
+            results = [run_once(blocked) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{label}: failed ({e})")
+            continue
+        ttff = [r['ttff_ms'] for r in results]
+        rss = [r['rss_kb'] for r in results if r['rss_kb'] is not None]
+        print(f"{label}:")
+        print(f"  time to first frame  median {statistics.median(ttff):7.1f} ms  (min {min(ttff):.1f})")
+        if rss:
+            print(f"  peak RSS             median {statistics.median(rss) / 1024:7.1f} MB")
+        print(f"  optional modules loaded at first frame: {', '.join(results[-1]['loaded']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
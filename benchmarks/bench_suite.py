@@ -0,0 +1,279 @@
+"""Benchmark suite: persistence, stats and rendering hot paths, saved as JSON.
+
+For each history size, a synthetic journal is generated in which every tenth
+record uses the legacy naive 'timestamp' key. The suite then times:
+
+- append_history: a durable store append, and the enqueue that the Tk
+  thread pays.
+- load_history.
+- The History dialog aggregation (dashboard_stats), both cold (sidecars
+  rebuilt) and warm.
+- export_history, as JSONL and as gzipped CSV.
+- The ring drawing methods (draw_ring_base / update_progress_ring plus a
+  frame flush). These run on a real Tk canvas when a display is available
+  (e.g. under xvfb-run), otherwise on a call-counting dummy canvas.
+
+Results are written as JSON. Pass --compare with an earlier results file to
+list metrics that got slower than --threshold; the exit status is 1 if any
+did.
+
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000 1000000] [--out results.json]
+                                     [--backend json|sqlite] [--compare baseline.json]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import history_export
+from frame_scheduler import FrameScheduler
+from history_store import HistoryStore, dashboard_stats
+from persistence import WriteBehind
+from sqlite_history import SQLiteHistoryStore
+
+APPENDS = 100
+RING_FRAMES = 2000
+
+
+def synthetic_lines(n, end):
+    """JSONL records ending at `end`, ~30 minutes apart; every tenth uses the legacy naive 'timestamp' key"""
+    start = end - datetime.timedelta(minutes=30 * n)
+    for i in range(n):
+        ts = start + datetime.timedelta(minutes=30 * i)
+        kind, minutes = ('focus', 25) if i % 2 == 0 else ('break', 5)
+        if i % 10 == 9:
+            entry = {'type': kind, 'minutes': minutes, 'timestamp': ts.replace(tzinfo=None).isoformat()}
+        else:
+            entry = {'type': kind, 'minutes': minutes, 'ts': ts.isoformat()}
+        yield json.dumps(entry) + '\n'
+
+
+def timed(fn, repeat=1):
+    """Median wall time of `fn` in ms"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def per_call_us(fn, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def open_store(backend, tmp, journal):
+    if backend == 'sqlite':
+        store = SQLiteHistoryStore(os.path.join(tmp, 'history.db'))
+        store.import_entries(HistoryStore(journal).iter_entries())
+        return store
+    return HistoryStore(journal)
+
+
+def drop_sidecars(journal):
+    base = os.path.splitext(journal)[0]
+    for path in (base + '.rollup.json', base + '.bin'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def bench_history(n, backend, tmp, now):
+    journal = os.path.join(tmp, 'history.jsonl')
+    with open(journal, 'w') as f:
+        f.writelines(synthetic_lines(n, now))
+    store = open_store(backend, tmp, journal)
+    today = now.date()
+    r = {}
+    drop_sidecars(journal)  # JSON: first stats call rebuilds the rollup and binary index
+    r['stats_cold_ms'] = timed(lambda: dashboard_stats(store, today))
+    r['stats_warm_ms'] = timed(lambda: dashboard_stats(store, today), 5)
+    r['load_ms'] = timed(store.load)
+    for name, suffix in (('export_jsonl_ms', '.jsonl'), ('export_csv_gz_ms', '.csv.gz')):
+        out = os.path.join(tmp, 'export' + suffix)
+        r[name] = timed(lambda: history_export.export_entries(store.iter_entries(), out))
+        os.remove(out)
+
+    entry = {'type': 'focus', 'minutes': 25, 'ts': now.isoformat()}
+    r['append_us'] = per_call_us(lambda: store.append(entry), APPENDS)
+    writer = WriteBehind()
+    r['append_enqueue_us'] = per_call_us(lambda: writer.append('history', entry, store.append_many), APPENDS)
+    writer.close()
+    if backend == 'sqlite':
+        store.close()
+    return r
+
+
+class DummyRoot:
+    """after()/after_idle() that never fire; frames are flushed by hand"""
+
+    def __init__(self):
+        self.jobs = 0
+
+    def after(self, ms, fn=None, *args):
+        self.jobs += 1
+        return f'after#{self.jobs}'
+
+    def after_idle(self, fn, *args):
+        return self.after(0, fn)
+
+    def after_cancel(self, job):
+        pass
+
+
+class DummyCanvas:
+    """Counts canvas calls instead of drawing"""
+
+    def __init__(self):
+        self.calls = 0
+        self._next = 0
+
+    def _create(self, *args, **kw):
+        self.calls += 1
+        self._next += 1
+        return self._next
+
+    create_oval = create_arc = _create
+
+    def itemconfig(self, item, **kw):
+        self.calls += 1
+
+    def coords(self, item, *args):
+        self.calls += 1
+
+    def delete(self, *items):
+        self.calls += 1
+
+
+class RingHarness:
+    """Just enough of PomodoroApp to run its ring drawing methods unchanged"""
+
+    def __init__(self, app_cls, root, canvas):
+        for name in ('palette', 'ring_bbox', 'draw_ring_base', 'current_accent',
+                     'update_progress_ring', 'start_pulse', 'stop_pulse'):
+            setattr(self, name, getattr(app_cls, name).__get__(self))
+        self.canvas_size = 260
+        self.ring_thickness = 14
+        self.dark_mode = type('Var', (), {'get': lambda self: True})()
+        self.is_focus = True
+        self.is_running = False
+        self.frames = FrameScheduler(root)
+        self.ring_canvas = canvas
+        self.ring_ids = {'bg': None, 'fg': None}
+
+
+def bench_ring():
+    import pomodoro
+    root = None
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        canvas = tk.Canvas(root, width=260, height=260)
+        canvas.pack()
+        renderer = 'tk'
+    except Exception:
+        root, canvas, renderer = DummyRoot(), DummyCanvas(), 'dummy'
+    ring = RingHarness(pomodoro.PomodoroApp, root, canvas)
+    ring.draw_ring_base()
+
+    r = {'ring_renderer': renderer}
+    start = time.perf_counter()
+    for i in range(RING_FRAMES):
+        ring.update_progress_ring(i / RING_FRAMES)
+        ring.frames.flush()
+    r['ring_frame_us'] = (time.perf_counter() - start) / RING_FRAMES * 1e6
+    r['ring_base_us'] = per_call_us(ring.draw_ring_base, 200)
+    if renderer == 'dummy':
+        r['ring_canvas_calls'] = canvas.calls
+    else:
+        root.destroy()
+    return r
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print metrics slower than `threshold` x the baseline; returns how many"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {(r['size'], k): v for r in baseline.get('history', []) for k, v in r.items()}
+    old.update({(None, k): v for k, v in baseline.get('ring', {}).items()})
+    new = {(r['size'], k): v for r in results['history'] for k, v in r.items()}
+    new.update({(None, k): v for k, v in results['ring'].items()})
+    regressions = 0
+    print(f"\nvs. {baseline_path} ({baseline.get('revision')}):")
+    if baseline.get('backend') != results['backend']:
+        print(f"  note: baseline used the {baseline.get('backend')} backend, this run {results['backend']}")
+    for key, value in sorted(new.items(), key=lambda kv: (kv[0][0] or 0, kv[0][1])):
+        size, metric = key
+        before = old.get(key)
+        if not metric.endswith(('_ms', '_us')) or not isinstance(before, (int, float)) or before <= 0:
+            continue
+        ratio = value / before
+        flag = 'SLOWER' if ratio > threshold else ''
+        regressions += bool(flag)
+        print(f"  {size or '':>9} {metric:<20} {before:>12.3f} -> {value:>12.3f}  x{ratio:5.2f} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--backend', choices=('json', 'sqlite'), default='json')
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    parser.add_argument('--dir', help='where to create the scratch histories (default: system temp)')
+    args = parser.parse_args()
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    results = {
+        'revision': git_revision(),
+        'created': now.isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': args.backend,
+        'history': [],
+    }
+    print(f"{'entries':>9} {'append us':>10} {'enqueue us':>10} {'load ms':>9} {'stats cold':>10} "
+          f"{'stats warm':>10} {'jsonl ms':>9} {'csv.gz ms':>9}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            r = bench_history(n, args.backend, tmp, now)
+        results['history'].append({'size': n, **r})
+        print(f"{n:>9} {r['append_us']:>10.1f} {r['append_enqueue_us']:>10.2f} {r['load_ms']:>9.1f} "
+              f"{r['stats_cold_ms']:>10.1f} {r['stats_warm_ms']:>10.2f} {r['export_jsonl_ms']:>9.1f} "
+              f"{r['export_csv_gz_ms']:>9.1f}")
+
+    results['ring'] = bench_ring()
+    ring = results['ring']
+    print(f"ring ({ring['ring_renderer']}): {ring['ring_frame_us']:.1f} us/frame, "
+          f"draw_ring_base {ring['ring_base_us']:.1f} us")
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: headless TimerCore on a virtual clock.
+
+1. Raw state-machine throughput (focus+break cycles per second), jumping
+   straight to deadlines and polling every displayed second.
+2. A load test of the history pipeline: simulate a long stretch of daily
+   use into a temporary journal, then time the stats rollup and a full load.
+
+    python benchmarks/bench_timer_sim.py [--cycles 20000] [--days 365] [--dir PATH]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+from timer_core import TimerCore, VirtualClock, simulate
+
+SESSIONS_PER_DAY = 8
+
+
+def bench_core(cycles, per_second):
+    clock = VirtualClock()
+    core = TimerCore(clock=clock)
+    start = time.perf_counter()
+    simulate(core, clock, cycles, per_second=per_second)
+    return cycles / (time.perf_counter() - start)
+
+
+def load_test(days, path):
+    """Simulate `days` of use, SESSIONS_PER_DAY focus cycles per day, into a journal"""
+    clock = VirtualClock()
+    core = TimerCore(clock=clock)
+    store = HistoryStore(path)
+    epoch = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+
+    def record(kind, minutes, drift):
+        if kind == 'focus':
+            day, slot = divmod(record.count, SESSIONS_PER_DAY)
+            ts = epoch + datetime.timedelta(days=day, hours=9, seconds=clock.now % (SESSIONS_PER_DAY * 1800))
+            store.append({'type': 'focus', 'minutes': minutes, 'ts': ts.isoformat()})
+            record.count += 1
+    record.count = 0
+
+    core.subscribe('session_complete', record)
+    start = time.perf_counter()
+    simulate(core, clock, days * SESSIONS_PER_DAY)
+    simulate_s = time.perf_counter() - start
+    return store, record.count, simulate_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--dir', default=None, help='where to put the temporary journal')
+    args = parser.parse_args()
+
+    print(f"core, jump to deadline : {bench_core(args.cycles, False):>12,.0f} cycles/s")
+    print(f"core, poll every second: {bench_core(max(1, args.cycles // 100), True):>12,.0f} cycles/s")
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        store, sessions, simulate_s = load_test(args.days, os.path.join(tmp, 'history.jsonl'))
+        print(f"simulated {args.days} days / {sessions:,} sessions with history writes in {simulate_s:.2f} s")
+
+        start = time.perf_counter()
+        store.rollup.reset()
+        days = store.daily_totals()
+        print(f"rollup rebuild          : {(time.perf_counter() - start) * 1000:10.1f} ms ({len(days)} days)")
+
+        start = time.perf_counter()
+        store.daily_totals()
+        print(f"rollup read (current)   : {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+        start = time.perf_counter()
+        entries = store.load()
+        print(f"full load               : {(time.perf_counter() - start) * 1000:10.1f} ms ({len(entries):,} entries)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+"""Local control API: drive the running app from scripts and status bars.
+
+The app listens on a per-user Unix domain socket. Windows asyncio has no
+Unix socket server, so there it listens on 127.0.0.1 instead. The port and a
+random token go in a per-user endpoint file, and requests must carry the
+token. The protocol is one JSON object per line in each direction:
+
+    {"cmd": "status"}
+    {"cmd": "start", "timer": "Pomodoro"}     also "pause", "toggle", "reset"
+    {"cmd": "show"}                            bring the window back from the tray
+    {"cmd": "history", "limit": 20, "from": "2025-01-01", "to": "2025-01-31"}
+
+Every response has "ok" and either the result or an "error". The asyncio
+server runs on its own thread and never touches Tk. Commands go through a
+CommandQueue that the Tk mainloop drains; on Unix a self-pipe wakes Tk
+through a file handler, so nothing polls; where Tk has no file handlers (Windows)
+the Tk thread polls the queue instead. Other threads never call into Tk. "status" is answered directly from a snapshot the Tk
+thread publishes, and "history" runs on a worker thread, so neither costs
+anything on the UI thread.
+
+Command-line client:
+
+    python control_api.py status | start [timer] | pause [timer] | toggle [timer] | reset [timer] | show
+    python control_api.py history [--limit 20] [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+
+import argparse
+import json
+import math
+import os
+import queue
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+COMMANDS = ('start', 'pause', 'toggle', 'reset', 'show', 'history')
+REQUEST_TIMEOUT = 5.0
+MAX_LINE = 64 * 1024
+
+
+USE_UNIX_SOCKET = hasattr(socket, 'AF_UNIX') and sys.platform != 'win32'
+
+
+def runtime_dir():
+    """Per-user directory for the socket, endpoint and lock files"""
+    if sys.platform == 'win32':
+        return os.environ.get('LOCALAPPDATA') or tempfile.gettempdir()
+    return os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+
+
+def endpoint_path():
+    """The Unix socket, or on Windows the file holding the TCP port and token; POMODORO_SOCKET overrides it"""
+    path = os.environ.get('POMODORO_SOCKET')
+    if path:
+        return path
+    if USE_UNIX_SOCKET:
+        return os.path.join(runtime_dir(), f'pomodoro-{os.getuid()}.sock')
+    return os.path.join(runtime_dir(), 'pomodoro-control.json')
+
+
+class CommandQueue:
+    """Requests from any thread, executed on the Tk thread.
+
+    submit() returns a concurrent Future that the Tk thread resolves.
+    attach() hooks draining into the Tk mainloop.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._rfd = self._wfd = None
+
+    def submit(self, request):
+        import concurrent.futures  # server side only; keeps the client import light
+        future = concurrent.futures.Future()
+        self._queue.put((request, future))
+        if self._wfd is not None:
+            try:
+                os.write(self._wfd, b'\0')
+            except (BlockingIOError, OSError):
+                pass  # pipe full: a wakeup is already pending
+        return future
+
+    def attach(self, widget, handler, poll_ms=100):
+        """Drain on the Tk thread: via a self-pipe file handler where Tk has one, else
+        by an `after` loop that runs on the Tk thread"""
+        self._handler = handler
+        try:
+            import tkinter
+            rfd, wfd = os.pipe()
+            os.set_blocking(rfd, False)
+            os.set_blocking(wfd, False)
+            widget.tk.createfilehandler(rfd, tkinter.READABLE, lambda fd, mask: self._wake())
+            self._rfd, self._wfd = rfd, wfd
+        except Exception:
+            def poll():
+                self.drain()
+                widget.after(poll_ms, poll)
+            widget.after(0, poll)
+
+    def _wake(self):
+        try:
+            while os.read(self._rfd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        self.drain()
+
+    def drain(self):
+        while True:
+            try:
+                request, future = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._handler(request))
+            except Exception as e:
+                future.set_exception(e)
+
+
+def status_view(snapshot):
+    """Turn a published snapshot into a response, computing live remaining times"""
+    now = time.monotonic()
+    timers = []
+    for timer in snapshot.get('timers', ()):
+        timer = dict(timer)
+        deadline = timer.pop('deadline', None)
+        if timer['running'] and deadline is not None:
+            timer['remaining'] = max(0, math.ceil(deadline - now))
+        timers.append(timer)
+    return {'ok': True, 'current': snapshot.get('current'), 'in_tray': snapshot.get('in_tray', False), 'timers': timers}
+
+
+class ControlServer:
+    """asyncio Unix socket server on a daemon thread.
+
+    `commands` is a CommandQueue; `status` returns the latest snapshot dict.
+    `offload` maps commands that must not wait for Tk (read-only queries) to
+    functions run on a worker thread instead.
+    """
+
+    def __init__(self, commands, status, path=None, offload=None):
+        self.commands = commands
+        self.status = status
+        self.offload = offload or {}
+        self.path = path or endpoint_path()
+        self.token = None  # TCP only
+        self.clients = 0
+        self.requests = 0
+        self._loop = None
+        self._stop = None
+        self._thread = None
+        self.ready = threading.Event()
+        self.error = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name='ControlServer')
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(timeout)
+
+    def _run(self):
+        import asyncio
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self.error = e
+            print(f"Control API unavailable: {e}")
+        finally:
+            self.ready.set()
+
+    def _clear_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)  # left behind by a crashed instance
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"another instance is listening on {self.path}")
+
+    async def _serve(self):
+        import asyncio
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if USE_UNIX_SOCKET:
+            self._clear_stale_socket()
+            old_umask = os.umask(0o177)  # socket is created owner-only
+            try:
+                server = await asyncio.start_unix_server(self._client, path=self.path, limit=MAX_LINE)
+            finally:
+                os.umask(old_umask)
+        else:
+            server = await asyncio.start_server(self._client, host='127.0.0.1', port=0, limit=MAX_LINE)
+            import secrets
+            self.token = secrets.token_hex(16)
+            from persistence import atomic_write_json
+            atomic_write_json(self.path, {'port': server.sockets[0].getsockname()[1], 'token': self.token,
+                                          'pid': os.getpid()}, fsync=False)
+        self.ready.set()
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _client(self, reader, writer):
+        import asyncio
+        self.clients += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    break  # line longer than MAX_LINE
+                if not line:
+                    break
+                response = await self._dispatch(line)
+                writer.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def _dispatch(self, line):
+        import asyncio
+        self.requests += 1
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'ok': False, 'error': 'invalid JSON'}
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'request must be a JSON object'}
+        if self.token is not None and request.pop('token', None) != self.token:
+            return {'ok': False, 'error': 'bad token'}
+        cmd = request.get('cmd')
+        if cmd == 'status':
+            return status_view(self.status())
+        if cmd not in COMMANDS:
+            return {'ok': False, 'error': f'unknown command {cmd!r}'}
+        if cmd in self.offload:
+            pending = self._loop.run_in_executor(None, self.offload[cmd], request)
+        else:
+            pending = asyncio.wrap_future(self.commands.submit(request))
+        try:
+            result = await asyncio.wait_for(pending, REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            return {'ok': False, 'error': 'timed out waiting for the app'}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+        return {'ok': True, **result}
+
+
+def _connect(path, timeout):
+    if USE_UNIX_SOCKET:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            raise
+        return sock, None
+    with open(path, 'r') as f:
+        endpoint = json.load(f)
+    sock = socket.create_connection(('127.0.0.1', endpoint['port']), timeout)
+    return sock, endpoint['token']
+
+
+def send(request, path=None, timeout=REQUEST_TIMEOUT):
+    """Send one request to the running app and return its response.
+
+    Raises OSError (or ValueError for an unreadable endpoint file) when no
+    instance is listening.
+    """
+    sock, token = _connect(path or endpoint_path(), timeout)
+    if token is not None:
+        request = dict(request, token=token)
+    with sock:
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Control a running Pomodoro app')
+    parser.add_argument('cmd', choices=('status',) + COMMANDS)
+    parser.add_argument('timer', nargs='?', help='timer name (default: the one on screen)')
+    parser.add_argument('--limit', type=int, default=20, help='history: number of sessions')
+    parser.add_argument('--from', dest='start', help='history: summary start date (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end', help='history: summary end date (YYYY-MM-DD, inclusive)')
+    args = parser.parse_args(argv)
+    request = {'cmd': args.cmd}
+    if args.timer:
+        request['timer'] = args.timer
+    if args.cmd == 'history':
+        request.update({'limit': args.limit, 'from': args.start, 'to': args.end})
+    try:
+        response = send(request)
+    except (OSError, ValueError) as e:
+        print(f"Pomodoro is not running ({e})")
+        return 2
+    print(json.dumps(response, indent=2))
+    return 0 if response.get('ok') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
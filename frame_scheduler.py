@@ -0,0 +1,223 @@
+"""Single frame loop for all visual updates in the Tk app.
+
+Widgets and canvas items are never configured directly from timer or
+animation code. Callers stage the properties they want through
+FrameScheduler.config/itemconfig/coords. The scheduler flushes them in one
+batch (on idle, or at the end of an animation frame) and only issues a Tk
+call for properties whose value actually changed since the last flush.
+
+While suspended (e.g. the window is hidden in the tray) nothing is flushed
+and no animation runs; staged values are kept and applied on resume(). The
+exception is an animation registered with an `owner` Toplevel, such as a
+popup that stays on screen: it keeps running, and only its owner's widgets
+are flushed.
+
+Animations register a callback and a period. One after() job wakes at the
+next due animation, never on a fixed tick. When a frame overruns its budget,
+the following frames are pushed back instead of bunching up.
+"""
+
+import math
+import time
+import tkinter as tk
+
+_MISSING = object()
+
+
+class FrameScheduler:
+    def __init__(self, root, budget_ms=12):
+        self.root = root
+        self.budget = budget_ms / 1000
+        self._pending = {}   # (widget, item, kind) -> staged options
+        self._applied = {}   # (widget, item, kind) -> options last sent to Tk
+        self._animations = {}  # name -> [period_s, next_due, callback, owner]
+        self._frame_job = None
+        self._flush_job = None
+        self.suspended = False
+
+        self.tk_calls = 0
+        self.frames = 0
+        self.over_budget = 0
+        self._started = time.monotonic()
+        self._second = int(self._started)
+        self._calls_this_second = 0
+        self.calls_last_second = 0
+
+    # --- Staging ---
+    def config(self, widget, **opts):
+        self._stage((widget, None, 'config'), opts)
+
+    def itemconfig(self, canvas, item, **opts):
+        self._stage((canvas, item, 'itemconfig'), opts)
+
+    def coords(self, canvas, item, *coords):
+        self._stage((canvas, item, 'coords'), {'coords': tuple(coords)})
+
+    def _stage(self, key, opts):
+        self._pending.setdefault(key, {}).update(opts)
+        if self._flush_job is None and not self.suspended:
+            self._flush_job = self.root.after_idle(self._flush_idle)
+
+    def invalidate(self, widget, item=None):
+        """Forget cached state for an item/widget that was changed outside the scheduler"""
+        for key in [k for k in self._applied if k[0] is widget and (item is None or k[1] == item)]:
+            del self._applied[key]
+
+    def forget(self, widget):
+        """Drop staged and cached state for a destroyed widget and its children"""
+        name = str(widget)
+        for table in (self._pending, self._applied):
+            for key in [k for k in table if str(k[0]) == name or str(k[0]).startswith(name + '.')]:
+                del table[key]
+
+    def suspend(self):
+        self.suspended = True
+        for job in (self._frame_job, self._flush_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._frame_job = self._flush_job = None
+        self._schedule_frame()  # animations owned by a visible Toplevel carry on
+
+    def resume(self):
+        if not self.suspended:
+            return
+        self.suspended = False
+        now = time.monotonic()
+        for anim in self._animations.values():
+            anim[1] = max(anim[1], now)
+        self._schedule_frame()
+        if self._pending and self._flush_job is None:
+            self._flush_job = self.root.after_idle(self._flush_idle)
+
+    # --- Flushing ---
+    def _flush_idle(self):
+        self._flush_job = None
+        self.flush()
+
+    def flush(self, owners=None):
+        """Apply staged changes; with `owners`, only those for widgets inside them"""
+        if owners is None:
+            pending, self._pending = self._pending, {}
+        else:
+            prefixes = tuple(str(owner) + '.' for owner in owners)
+            pending = {key: opts for key, opts in self._pending.items()
+                       if str(key[0]).startswith(prefixes) or key[0] in owners}
+            for key in pending:
+                del self._pending[key]
+        for key, opts in pending.items():
+            widget, item, kind = key
+            applied = self._applied.setdefault(key, {})
+            changed = {k: v for k, v in opts.items() if applied.get(k, _MISSING) != v}
+            if not changed:
+                continue
+            try:
+                if kind == 'itemconfig':
+                    widget.itemconfig(item, **changed)
+                elif kind == 'coords':
+                    widget.coords(item, *changed['coords'])
+                else:
+                    widget.configure(**changed)
+            except tk.TclError:
+                self._applied.pop(key, None)  # widget is gone
+                continue
+            applied.update(changed)
+            self._count_call()
+
+    def _roll_second(self):
+        second = int(time.monotonic())
+        if second != self._second:
+            self.calls_last_second = self._calls_this_second if second == self._second + 1 else 0
+            self._second = second
+            self._calls_this_second = 0
+
+    def _count_call(self):
+        self.tk_calls += 1
+        self._roll_second()
+        self._calls_this_second += 1
+
+    # --- Animations ---
+    def add_animation(self, name, period_ms, callback, owner=None):
+        """Call `callback` every `period_ms` from the frame loop until it returns False.
+
+        An `owner` Toplevel keeps the animation running while the scheduler is suspended.
+        """
+        period = period_ms / 1000
+        self._animations[name] = [period, time.monotonic() + period, callback, owner]
+        self._schedule_frame()
+
+    def remove_animation(self, name):
+        if self._animations.pop(name, None) is not None:
+            self._schedule_frame()
+
+    def has_animation(self, name):
+        return name in self._animations
+
+    def _live_owners(self):
+        owners = []
+        for anim in self._animations.values():
+            owner = anim[3]
+            try:
+                if owner is not None and owner not in owners and owner.winfo_exists():
+                    owners.append(owner)
+            except tk.TclError:
+                pass
+        return owners
+
+    def _runnable(self):
+        """Animations that may run now: all of them, or while suspended only those with a live owner"""
+        if not self.suspended:
+            return dict(self._animations)
+        owners = self._live_owners()
+        return {name: anim for name, anim in self._animations.items() if anim[3] in owners}
+
+    def _schedule_frame(self):
+        if self._frame_job is not None:
+            self.root.after_cancel(self._frame_job)
+            self._frame_job = None
+        runnable = self._runnable()
+        if not runnable:
+            if self._pending and self._flush_job is None and not self.suspended:
+                self._flush_job = self.root.after_idle(self._flush_idle)
+            return
+        delay = min(a[1] for a in runnable.values()) - time.monotonic()
+        self._frame_job = self.root.after(max(1, math.ceil(delay * 1000)), self._run_frame)
+
+    def _run_frame(self):
+        self._frame_job = None
+        start = time.monotonic()
+        self.frames += 1
+        for name, anim in list(self._runnable().items()):
+            if anim[1] > start or self._animations.get(name) is not anim:
+                continue
+            try:
+                keep = anim[2]()
+            except Exception as e:
+                print(f"Animation {name} failed: {e}")
+                keep = False
+            if keep is False:
+                self._animations.pop(name, None)
+            else:
+                # Skip missed frames instead of replaying them
+                anim[1] = start + anim[0]
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+            self._flush_job = None
+        self.flush(self._live_owners() if self.suspended else None)
+        elapsed = time.monotonic() - start
+        if elapsed > self.budget:
+            self.over_budget += 1
+            for anim in self._animations.values():
+                anim[1] = max(anim[1], start + 2 * elapsed)
+        self._schedule_frame()
+
+    def stats(self):
+        self._roll_second()
+        uptime = max(1e-9, time.monotonic() - self._started)
+        return {
+            'tk_calls': self.tk_calls,
+            'tk_calls_last_second': self.calls_last_second,
+            'tk_calls_per_second_avg': self.tk_calls / uptime,
+            'frames': self.frames,
+            'over_budget': self.over_budget,
+            'animations': sorted(self._animations),
+        }
@@ -0,0 +1,151 @@
+"""Focus-hours chart for the History dialog.
+
+Per-day totals are grouped into day, week, month or year bins, whichever
+keeps the visible window at MAX_BARS bars or fewer. Value labels and x tick
+labels are culled so the amount of drawing work stays fixed however long the
+history is. render_png() rasterizes the chart with Agg so the History
+dialog can build it on a worker thread; the binning itself needs no
+matplotlib at all.
+"""
+
+import io
+import math
+import threading
+from datetime import timedelta
+
+MAX_BARS = 60
+MAX_LABELLED_BARS = 20  # value labels above each bar only up to this many bars
+MAX_TICKS = 12
+
+# Visible window choices for the dialog: label -> days (None for all history)
+WINDOWS = {
+    'Last 30 days': 30,
+    'Last 90 days': 90,
+    'Last 12 months': 365,
+    'All time': None,
+}
+DEFAULT_WINDOW = 'Last 90 days'
+
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30.44, 'year': 365.25}
+TITLES = {'day': 'Daily Focus Hours', 'week': 'Weekly Focus Hours',
+          'month': 'Monthly Focus Hours', 'year': 'Yearly Focus Hours'}
+TICK_FORMATS = {'day': '%m/%d', 'week': '%m/%d', 'month': '%b %y', 'year': '%Y'}
+CHART_STYLE = 'seaborn-v0_8-darkgrid'
+
+_render_lock = threading.Lock()  # matplotlib is not thread-safe; one render at a time
+
+
+def bin_start(day, unit):
+    """First day of the `unit` bin containing `day` (weeks start on Monday)"""
+    if unit == 'week':
+        return day - timedelta(days=day.weekday())
+    if unit == 'month':
+        return day.replace(day=1)
+    if unit == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def choose_unit(first, last):
+    """Smallest bin size that fits first..last in MAX_BARS bars"""
+    span = (last - first).days + 1
+    for unit in ('day', 'week', 'month'):
+        if span / UNIT_DAYS[unit] <= MAX_BARS:
+            return unit
+    return 'year'
+
+
+def bin_daily(daily, today, window_days=None):
+    """Group {date: minutes} into bins for the window ending today.
+
+    Returns (unit, [(bin_start, minutes), ...]) in date order. Only bins with
+    focus time are returned, matching the one-bar-per-active-day chart.
+    """
+    if window_days:
+        first = today - timedelta(days=window_days - 1)
+        last = today
+    else:
+        first = min(daily, default=today)
+        last = max(today, max(daily, default=today))
+    unit = choose_unit(first, last)
+    bins = {}
+    for day, minutes in daily.items():
+        if first <= day <= last and minutes:
+            key = bin_start(day, unit)
+            bins[key] = bins.get(key, 0) + minutes
+    return unit, sorted(bins.items())
+
+
+def bar_color(hours_per_day, p):
+    """Bar colour from the average focus hours per day in the bin"""
+    if hours_per_day < 2:
+        return p['accent'] if hours_per_day > 0 else p['ring_bg']
+    if hours_per_day < 4:
+        return p['break_accent']
+    return p['accent2']
+
+
+def draw_focus_chart(ax, daily, today, p, window_days=None):
+    """Draw the binned focus-hours bar chart on `ax` (cleared first)"""
+    unit, bins = bin_daily(daily, today, window_days)
+    ax.clear()
+    x = list(range(len(bins)))
+    values = [minutes / 60 for _, minutes in bins]
+    colors = [bar_color(v / UNIT_DAYS[unit], p) for v in values]
+    bars = ax.bar(x, values, color=colors, width=0.65, alpha=0.85,
+                  edgecolor=p['card'], linewidth=1.5)
+
+    # Value labels only while the bars are wide enough to read them
+    if len(bars) <= MAX_LABELLED_BARS:
+        for bar in bars:
+            height = bar.get_height()
+            if height > 0.2:
+                ax.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
+                        f'{height:.1f}h', ha='center', va='bottom',
+                        color=p['fg'], fontsize=8)
+
+    # At most MAX_TICKS tick labels, evenly spaced and ending on the newest bar
+    step = max(1, math.ceil(len(bins) / MAX_TICKS))
+    ticks = x[::-1][::step][::-1]
+    ax.set_xticks(ticks)
+    ax.set_xticklabels([bins[i][0].strftime(TICK_FORMATS[unit]) for i in ticks])
+    if not bins:
+        ax.set_xlim(-0.5, 0.5)
+
+    ax.set_title(TITLES[unit], fontsize=13, color=p['fg'], pad=10)
+    ax.set_ylabel("Hours", color=p['fg'])
+    ax.set_xlabel("Date" if unit == 'day' else f"{unit.capitalize()} starting", color=p['fg'])
+    ax.tick_params(axis='x', colors=p['fg'], rotation=45)
+    ax.tick_params(axis='y', colors=p['fg'])
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['bottom'].set_color(p['subtle'])
+    ax.spines['left'].set_color(p['subtle'])
+
+    # Highlight the bin holding today
+    current = bin_start(today, unit)
+    for i, (start, _) in enumerate(bins):
+        if start == current:
+            bars[i].set_edgecolor(p['accent'])
+            bars[i].set_linewidth(2)
+    return unit, len(bins)
+
+
+def render_png(daily, today, p, window_days=None, facecolor='#f8f9fa', size=(6.2, 3.2), dpi=100):
+    """Render the chart off-screen with Agg and return PNG bytes.
+
+    Uses no Tk, so it is safe to call from a worker thread. The style is
+    applied with a context manager to leave global rcParams alone.
+    """
+    import matplotlib.style
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    with _render_lock, matplotlib.style.context(CHART_STYLE):
+        # Fixed margins instead of tight_layout, which re-measures every label
+        fig = Figure(figsize=size, dpi=dpi)
+        fig.patch.set_facecolor(facecolor)
+        fig.subplots_adjust(left=0.09, right=0.98, top=0.88, bottom=0.26)
+        draw_focus_chart(fig.add_subplot(), daily, today, p, window_days)
+        buf = io.BytesIO()
+        FigureCanvasAgg(fig).print_png(buf)
+    return buf.getvalue()
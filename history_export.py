@@ -0,0 +1,95 @@
+"""Streaming history export.
+
+Records are written one at a time as they are read from the history store,
+so exporting never holds the whole history in memory. The format follows the
+file name: .jsonl (JSON Lines), .csv or .json (a JSON array). Add .gz to
+any of them for gzip compression.
+"""
+
+import csv
+import gzip
+import json
+import os
+
+from history_store import entry_day
+
+CSV_FIELDS = ['ts', 'type', 'minutes', 'timer']
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def detect_format(path):
+    """Return (format, compressed) for an export path"""
+    name = path.lower()
+    compressed = name.endswith('.gz')
+    if compressed:
+        name = name[:-3]
+    for fmt in ('jsonl', 'csv', 'json'):
+        if name.endswith('.' + fmt):
+            return fmt, compressed
+    return 'jsonl', compressed
+
+
+def _matches(entry, start, end, kinds):
+    if kinds and entry.get('type') not in kinds:
+        return False
+    if start is None and end is None:
+        return True
+    day = entry_day(entry)
+    if day is None:
+        return False
+    return (start is None or day >= start) and (end is None or day <= end)
+
+
+def export_entries(entries, path, start=None, end=None, kinds=None, progress=None, cancel=None, every=1000):
+    """Stream `entries` to `path`, keeping those dated start..end (inclusive) of the given kinds.
+
+    `start`/`end` are datetime.date or None; `kinds` is a set of session types
+    or None for all. `progress(scanned, written)` is called every `every`
+    records. Setting the `cancel` event stops the export, removes the partial
+    file and raises ExportCancelled. Returns the number of records written.
+    """
+    fmt, compressed = detect_format(path)
+    start = start.isoformat() if start else None
+    end = end.isoformat() if end else None
+    tmp = path + '.part'
+    opener = gzip.open if compressed else open
+    scanned = written = 0
+    try:
+        with opener(tmp, 'wt', newline='', encoding='utf-8') as f:
+            writer = None
+            if fmt == 'csv':
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+            elif fmt == 'json':
+                f.write('[\n')
+            for entry in entries:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                scanned += 1
+                if _matches(entry, start, end, kinds):
+                    if writer is not None:
+                        row = dict(entry)
+                        row.setdefault('ts', entry.get('timestamp'))
+                        writer.writerow(row)
+                    elif fmt == 'json':
+                        f.write((',\n  ' if written else '  ') + json.dumps(entry))
+                    else:
+                        f.write(json.dumps(entry) + '\n')
+                    written += 1
+                if progress is not None and scanned % every == 0:
+                    progress(scanned, written)
+            if fmt == 'json':
+                f.write('\n]\n')
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if progress is not None:
+        progress(scanned, written)
+    return written
@@ -0,0 +1,464 @@
+"""History persistence for the Pomodoro app.
+
+Sessions are kept in an append-only JSON Lines journal (one record per line),
+so recording a finished session costs a single small write no matter how long
+the history is. Older installs stored a JSON array; it is migrated once.
+
+Every finished session is recorded, focus and break alike; the stats below
+count focus sessions only.
+
+A small per-day rollup (focus minutes and session count per date) is persisted
+beside the journal and updated on every append, so the stats dialog costs
+O(days) instead of O(sessions). It is rebuilt whenever it no longer matches
+the journal's size/mtime.
+
+A fixed-width binary sidecar (epoch seconds, minutes, type code per record,
+sorted by time) is maintained the same way and read through mmap, so
+time-range queries are a binary search plus a scan of just that range.
+
+Appends are fsynced and a torn last line left by a crash is fenced off with a
+newline; unreadable lines are skipped on read, so damage never costs more
+than the record being written.
+"""
+
+import bisect
+import contextlib
+import datetime
+import json
+import mmap
+import os
+import struct
+import threading
+
+from persistence import append_lines, atomic_write, atomic_write_json, salvage_json_records, load_json_file
+
+
+def entry_day(entry):
+    """Return the ISO date of a history record, or None if it has no usable timestamp"""
+    ts = entry.get('ts') or entry.get('timestamp')
+    if not ts:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(ts).date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def entry_datetime(entry):
+    """Return a record's timestamp as an aware datetime (naive timestamps count as UTC), or None"""
+    ts = entry.get('ts') or entry.get('timestamp')
+    if not ts:
+        return None
+    try:
+        dt = datetime.datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt
+
+
+def entry_epoch(entry):
+    """Return a record's timestamp as UTC epoch seconds (naive timestamps count as UTC)"""
+    dt = entry_datetime(entry)
+    return None if dt is None else int(dt.timestamp())
+
+
+def day_epoch(day):
+    """UTC midnight of a date as epoch seconds"""
+    return int(datetime.datetime(day.year, day.month, day.day, tzinfo=datetime.timezone.utc).timestamp())
+
+
+def dashboard_stats(store, today):
+    """The History dialog's numbers for any history backend.
+
+    Stat cards are range queries on the time index (binary search plus a scan
+    of just that range); the chart uses the per-day totals.
+    """
+    week_start = today - datetime.timedelta(days=today.weekday())
+    return {
+        'today': store.summarize(day_epoch(today), day_epoch(today + datetime.timedelta(days=1)))[0],
+        'week': store.summarize(day_epoch(week_start))[0],
+        'month': store.summarize(day_epoch(today.replace(day=1)))[0],
+        'sessions': store.session_count(),
+        'daily': {d: minutes for d, (minutes, sessions) in store.daily_totals().items()},
+    }
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class DailyRollup:
+    """Per-day [minutes, sessions] totals for one journal, persisted as JSON"""
+
+    def __init__(self, path, journal_path):
+        self.path = path
+        self.journal_path = journal_path
+        self.days = None
+        self.source = None
+
+    def _load(self):
+        self.days, self.source = {}, None
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.days = {d: list(v) for d, v in data.get('days', {}).items()}
+            self.source = data.get('source')
+        except Exception:
+            pass
+
+    def _save(self):
+        try:
+            # Derived data: atomic so it is never half-written, but no fsync
+            # since a lost update just makes it stale and it gets rebuilt.
+            atomic_write_json(self.path, {'source': self.source, 'days': self.days}, fsync=False)
+        except Exception as e:
+            print(f"Failed to save history rollup: {e}")
+
+    def _add(self, entry):
+        day = entry_day(entry)
+        if day is None or entry.get('type') != 'focus':
+            return
+        totals = self.days.setdefault(day, [0, 0])
+        totals[0] += entry.get('minutes', 0) or 0
+        totals[1] += 1
+
+    def rebuild(self, entries, signature):
+        """Recount from `entries`; `signature` is the journal's, taken before reading it"""
+        self.days = {}
+        for entry in entries:
+            self._add(entry)
+        self.source = signature
+        self._save()
+
+    def record(self, entries, journal_before):
+        """Fold appended entries in, if the rollup was current before the append"""
+        if self.days is None:
+            self._load()
+        if self.source != journal_before:
+            return  # stale already; the next read rebuilds it
+        for entry in entries:
+            self._add(entry)
+        self.source = file_signature(self.journal_path)
+        self._save()
+
+    def is_current(self):
+        if self.days is None:
+            self._load()
+        return self.source == file_signature(self.journal_path)
+
+    def reset(self):
+        self.days, self.source = None, None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Binary sidecar layout: a 32-byte header holding the journal signature it was
+# built from, then 16-byte records of (epoch seconds, minutes, type code).
+BIN_MAGIC = b'POMOBIN1'
+BIN_HEADER = struct.Struct('<8sqq8x')
+BIN_RECORD = struct.Struct('<qHB5x')
+TYPE_CODES = {'focus': 1, 'break': 2}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+
+class BinaryHistory:
+    """Time-sorted fixed-width copy of the journal for range queries"""
+
+    def __init__(self, path, journal_path):
+        self.path = path
+        self.journal_path = journal_path
+
+    def _read_header(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, size, mtime = BIN_HEADER.unpack(f.read(BIN_HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return [size, mtime] if magic == BIN_MAGIC else None
+
+    @staticmethod
+    def _pack_header(signature):
+        size, mtime = signature or (-1, -1)
+        return BIN_HEADER.pack(BIN_MAGIC, size, mtime)
+
+    @staticmethod
+    def _pack(entry):
+        epoch = entry_epoch(entry)
+        if epoch is None:
+            return None
+        minutes = max(0, min(0xFFFF, int(entry.get('minutes', 0) or 0)))
+        return epoch, BIN_RECORD.pack(epoch, minutes, TYPE_CODES.get(entry.get('type'), 0))
+
+    def is_current(self):
+        return self._read_header() == file_signature(self.journal_path)
+
+    def rebuild(self, entries, signature):
+        """Rewrite from `entries`; `signature` is the journal's, taken before reading it"""
+        packed = [rec for rec in map(self._pack, entries) if rec is not None]
+        packed.sort(key=lambda rec: rec[0])
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self._pack_header(signature))
+            for _, data in packed:
+                f.write(data)
+        os.replace(tmp, self.path)
+
+    def record(self, entries, journal_before):
+        """Append records if the sidecar was current and they keep it sorted"""
+        recs = [self._pack(entry) for entry in entries]
+        if not recs or None in recs or self._read_header() != journal_before:
+            return
+        if any(a[0] > b[0] for a, b in zip(recs, recs[1:])):
+            return
+        try:
+            if journal_before is None and not os.path.exists(self.path):
+                with open(self.path, 'wb') as f:  # first record of a new journal
+                    f.write(self._pack_header(None))
+            with open(self.path, 'r+b') as f:
+                end = f.seek(0, os.SEEK_END)
+                if end > BIN_HEADER.size:
+                    f.seek(end - BIN_RECORD.size)
+                    if BIN_RECORD.unpack(f.read(BIN_RECORD.size))[0] > recs[0][0]:
+                        return  # out of order; leave it stale so the next read re-sorts
+                f.seek(end)
+                f.write(b''.join(data for _, data in recs))
+                f.seek(0)
+                f.write(self._pack_header(file_signature(self.journal_path)))
+        except OSError as e:
+            print(f"Failed to update binary history: {e}")
+
+    @contextlib.contextmanager
+    def _views(self):
+        """Yield (timestamps, minutes, type codes) as strided memoryviews over the mapped file"""
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= BIN_HEADER.size:
+                yield (), (), ()
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw = memoryview(mm)[BIN_HEADER.size:]
+                raw = raw[:len(raw) - len(raw) % BIN_RECORD.size]
+                q, h, b = raw.cast('q'), raw.cast('H'), raw.cast('B')
+                views = (q[::2], h[4::8], b[10::16])
+                try:
+                    yield views
+                finally:
+                    for v in views + (q, h, b, raw):
+                        v.release()
+
+    def count(self):
+        try:
+            return max(0, (os.path.getsize(self.path) - BIN_HEADER.size) // BIN_RECORD.size)
+        except OSError:
+            return 0
+
+    def _bounds(self, ts, start, end):
+        lo = 0 if start is None else bisect.bisect_left(ts, start)
+        hi = len(ts) if end is None else bisect.bisect_left(ts, end, lo)
+        return lo, hi
+
+    def range(self, start=None, end=None):
+        """Records with start <= epoch < end as (epoch, type, minutes) tuples"""
+        with self._views() as (ts, minutes, codes):
+            lo, hi = self._bounds(ts, start, end)
+            return [(ts[i], TYPE_NAMES.get(codes[i], ''), minutes[i]) for i in range(lo, hi)]
+
+    def summarize(self, start=None, end=None, code=None):
+        """(total minutes, record count) for start <= epoch < end, optionally of one type code"""
+        with self._views() as (ts, minutes, codes):
+            lo, hi = self._bounds(ts, start, end)
+            if code is None:
+                return sum(minutes[lo:hi]), hi - lo
+            picked = [m for m, c in zip(minutes[lo:hi], codes[lo:hi]) if c == code]
+            return sum(picked), len(picked)
+
+    def reset(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class HistoryStore:
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.rollup = DailyRollup(os.path.splitext(path)[0] + '.rollup.json', path)
+        self.binary = BinaryHistory(os.path.splitext(path)[0] + '.bin', path)
+        # Appends come from the write-behind thread while stats, export and
+        # analytics workers read; sidecar rebuilds, updates and reads all
+        # hold this lock so none of them sees the others half done.
+        self._lock = threading.RLock()
+        self.migrate_legacy()
+
+    def migrate_legacy(self):
+        """Convert a legacy JSON-array history file into the journal (one-time)"""
+        legacy = self.legacy_path
+        if not legacy or not os.path.exists(legacy) or os.path.exists(self.path):
+            return False
+        # A damaged array (e.g. cut off by a crash mid-write) is salvaged
+        # record by record rather than dropped.
+        entries = load_json_file(legacy, salvage=salvage_json_records)
+        if entries is None:
+            print(f"Could not read legacy history: {legacy}")
+            return False
+        if not isinstance(entries, list):
+            entries = []
+        try:
+            atomic_write(self.path, ''.join(json.dumps(e) + '\n' for e in entries if isinstance(e, dict)))
+            if os.path.exists(legacy):
+                os.replace(legacy, legacy + '.bak')
+        except Exception as e:
+            print(f"History migration failed: {e}")
+            return False
+        print(f"Migrated {len(entries)} history entries to {self.path}")
+        return True
+
+    def append(self, entry):
+        self.append_many([entry])
+
+    def append_many(self, entries):
+        """Append records with one fsynced write, then update the rollup and sidecar"""
+        lines = [json.dumps(entry) + '\n' for entry in entries]
+        with self._lock:
+            before = file_signature(self.path)
+            append_lines(self.path, lines)
+            self.rollup.record(entries, before)
+            self.binary.record(entries, before)
+
+    def iter_entries(self):
+        """Yield history records oldest-first, skipping unreadable lines"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+    def read_page_reverse(self, cursor=None, count=100, block_size=64 * 1024):
+        """Read up to `count` records, newest first, ending before byte offset `cursor`.
+
+        Reads backwards from the end of the journal, so the cost depends only
+        on the page size. Pass cursor=None to start at the newest record and
+        the returned cursor to continue; a returned cursor of 0 means the
+        oldest record has been reached.
+        """
+        entries = []
+        if not os.path.exists(self.path):
+            return entries, 0
+        with open(self.path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END) if cursor is None else cursor
+            while end > 0:
+                start = max(0, end - block_size)
+                f.seek(start)
+                data = f.read(end - start)
+                if start > 0:
+                    nl = data.find(b'\n')
+                    if nl == -1 or start + nl + 1 >= end:
+                        block_size *= 2  # no complete line in this block yet
+                        continue
+                    data = data[nl + 1:]
+                    data_start = start + nl + 1
+                else:
+                    data_start = 0
+                line_end = end
+                for line in reversed(data.split(b'\n')):
+                    line_start = line_end - len(line)
+                    line_end = line_start - 1
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict):
+                        entries.append(entry)
+                        if len(entries) >= count:
+                            return entries, line_start
+                end = data_start
+        return entries, 0
+
+    def load(self):
+        try:
+            return list(self.iter_entries())
+        except Exception:
+            return []
+
+    def daily_totals(self):
+        """Return {date: (minutes, sessions)}, rebuilding the rollup if it is stale"""
+        with self._lock:
+            if not self.rollup.is_current():
+                try:
+                    self.rollup.rebuild(self.iter_entries(), file_signature(self.path))
+                except Exception as e:
+                    print(f"Failed to rebuild history rollup: {e}")
+                    return {}
+            return {datetime.date.fromisoformat(d): (m, n) for d, (m, n) in self.rollup.days.items()}
+
+    def _current_binary(self):
+        # Callers hold self._lock
+        if not self.binary.is_current():
+            self.binary.rebuild(self.iter_entries(), file_signature(self.path))
+        return self.binary
+
+    def index_bytes(self):
+        """The binary sidecar's records (after the header), rebuilt first if stale"""
+        with self._lock:
+            with open(self._current_binary().path, 'rb') as f:
+                f.seek(BIN_HEADER.size)
+                data = f.read()
+        return data[:len(data) - len(data) % BIN_RECORD.size]
+
+    def range(self, start=None, end=None):
+        """Sessions with start <= epoch seconds < end as (epoch, type, minutes), oldest first"""
+        try:
+            with self._lock:
+                return self._current_binary().range(start, end)
+        except Exception as e:
+            print(f"History range query failed: {e}")
+            return []
+
+    def summarize(self, start=None, end=None):
+        """(minutes, sessions) of focus recorded with start <= epoch seconds < end"""
+        try:
+            with self._lock:
+                return self._current_binary().summarize(start, end, TYPE_CODES['focus'])
+        except Exception as e:
+            print(f"History range query failed: {e}")
+            return 0, 0
+
+    def session_count(self):
+        """Focus sessions with a timestamp, matching summarize() and daily_totals()"""
+        return self.summarize()[1]
+
+    def record_count(self):
+        """Every timestamped record, breaks included (sizes export progress)"""
+        try:
+            with self._lock:
+                return self._current_binary().count()
+        except Exception:
+            return 0
+
+    def is_empty(self):
+        try:
+            return os.path.getsize(self.path) == 0
+        except OSError:
+            return True
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.rollup.reset()
+            self.binary.reset()
@@ -0,0 +1,177 @@
+"""Icon rendering with PIL, shared by the tray, the window icon and the build script.
+
+The app icon is drawn once per size and theme and cached on disk as PNG, so
+later runs (and the window icon, which goes through tk.PhotoImage) never
+need PIL for it. Bump ICON_VERSION when the drawing changes to invalidate
+old caches.
+
+PIL is imported inside the functions so this module is free to import on
+the startup path; anything that has to draw runs on a worker thread.
+
+    python assets/generate_icon.py      # writes assets/pomodro.ico from the same drawing
+"""
+
+import io
+import os
+import sys
+import threading
+
+ICON_VERSION = 2
+ICON_SIZES = (16, 24, 32, 48, 64, 128, 256)
+WINDOW_ICON_SIZES = (16, 32, 48, 64)
+THEMES = {
+    'dark': {'accent': '#1f6feb', 'slot': '#ffffff'},
+    'light': {'accent': '#2563eb', 'slot': '#ffffff'},
+}
+SUPERSAMPLE = 4  # draw large and downscale for smooth edges
+
+_memory = {}
+_cache_lock = threading.Lock()
+
+
+def cache_dir():
+    """Per-user icon cache; POMODORO_ICON_CACHE overrides it"""
+    path = os.environ.get('POMODORO_ICON_CACHE')
+    if path:
+        return path
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pomodoro', 'icons')
+
+
+def cache_path(size, theme):
+    return os.path.join(cache_dir(), f'app-{theme}-{size}-v{ICON_VERSION}.png')
+
+
+def render_app_icon(size=64, theme='dark'):
+    """The app icon: accent disc with a white timer slot, drawn at `size` px"""
+    from PIL import Image, ImageDraw
+    colors = THEMES[theme]
+    big = size * SUPERSAMPLE
+    img = Image.new('RGBA', (big, big), (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    # Small sizes get a wider disc so the icon stays legible at 16 px
+    margin = big * (0.03125 if size <= 32 else 0.0625)
+    d.ellipse((margin, margin, big - margin, big - margin), fill=colors['accent'])
+    d.rectangle((big * 0.40625, big * 0.28125, big * 0.59375, big * 0.6875), fill=colors['slot'])
+    return img.resize((size, size), Image.LANCZOS)
+
+
+def app_icon_png(size=64, theme='dark'):
+    """PNG bytes of the app icon, from the disk cache when present; None without PIL and cache"""
+    key = (size, theme)
+    data = _memory.get(key)
+    if data is not None:
+        return data
+    path = cache_path(size, theme)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        data = None
+    if not data:
+        try:
+            buf = io.BytesIO()
+            render_app_icon(size, theme).save(buf, format='PNG')
+        except ImportError:
+            return None
+        data = buf.getvalue()
+        with _cache_lock:
+            try:
+                from persistence import atomic_write
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                atomic_write(path, data, fsync=False)
+            except Exception as e:
+                print(f"Could not cache icon {path}: {e}")
+    _memory[key] = data
+    return data
+
+
+def app_icon(size=64, theme='dark'):
+    """The app icon as a PIL image (for pystray), rendered at most once per disk cache"""
+    from PIL import Image
+    data = app_icon_png(size, theme)
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img
+
+
+def cached_window_icons(theme='dark'):
+    """PNG bytes for the window icon sizes, or None unless every size is already on disk"""
+    if not all(os.path.exists(cache_path(size, theme)) for size in WINDOW_ICON_SIZES):
+        return None
+    return [app_icon_png(size, theme) for size in WINDOW_ICON_SIZES]
+
+
+def warm_cache(themes=tuple(THEMES), sizes=ICON_SIZES):
+    """Render every missing size and theme into the disk cache"""
+    for theme in themes:
+        for size in sizes:
+            app_icon_png(size, theme)
+
+
+def write_ico(path, theme='dark'):
+    """Multi-size .ico built from the per-size renders"""
+    images = [app_icon(size, theme) for size in ICON_SIZES]
+    images[-1].save(path, format='ICO', sizes=[(s, s) for s in ICON_SIZES], append_images=images[:-1])
+
+
+def render_progress_icon(size, ratio, color, track):
+    """A ring filled clockwise from 12 o'clock to `ratio` (0..1) of a full turn"""
+    from PIL import Image, ImageDraw
+    big = size * SUPERSAMPLE
+    img = Image.new('RGBA', (big, big), (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    width = big // 6
+    box = (width // 2, width // 2, big - width // 2, big - width // 2)
+    d.ellipse(box, outline=track, width=width)
+    if ratio > 0:
+        d.arc(box, start=-90, end=-90 + 360 * min(1.0, ratio), fill=color, width=width)
+    inner = big * 0.3
+    d.ellipse((inner, inner, big - inner, big - inner), fill=color)
+    return img.resize((size, size), Image.LANCZOS)
+
+
+class ProgressIconCache:
+    """Pre-rendered progress frames, built once per (size, colours).
+
+    `steps` frames cover a session, so the tray image only changes when the
+    visible step does and nothing is drawn while the timer runs. prepare()
+    renders on a worker thread; frame() only looks frames up, so the Tk
+    thread never draws.
+    """
+
+    def __init__(self, size=64, steps=60):
+        self.size = size
+        self.steps = steps
+        self._frames = {}
+        self._rendering = set()
+        self._lock = threading.Lock()  # guards the two above, never held while drawing
+
+    def step_for(self, ratio):
+        return max(0, min(self.steps, int(ratio * self.steps)))
+
+    def prepare(self, color, track):
+        """Render and store the frames for (color, track); False if another thread has or is doing so"""
+        key = (color, track)
+        with self._lock:
+            if key in self._frames or key in self._rendering:
+                return False
+            self._rendering.add(key)
+        try:
+            frames = [render_progress_icon(self.size, i / self.steps, color, track)
+                      for i in range(self.steps + 1)]
+            with self._lock:
+                self._frames[key] = frames
+            return True
+        finally:
+            with self._lock:
+                self._rendering.discard(key)
+
+    def frame(self, step, color, track):
+        """The stored frame, or None until prepare() has finished (color, track)"""
+        with self._lock:
+            frames = self._frames.get((color, track))
+        return None if frames is None else frames[step]
@@ -0,0 +1,144 @@
+"""Opt-in latency instrumentation.
+
+Off by default and free when off: nothing is wrapped unless the app is
+started with --profile (or POMODORO_PROFILE=1). When on, selected callbacks
+are wrapped to record their duration in fixed-size ring buffers, and timer
+wakeups are binned by how late they fired against the ideal one-second
+cadence. A summary is printed on exit. --profile-out FILE (or
+POMODORO_PROFILE_OUT) also runs cProfile for the whole session and writes
+its stats to FILE, with the summary beside it in FILE.txt.
+
+    python pomodoro.py --profile [--profile-out session.prof]
+    python -m pstats session.prof
+"""
+
+import array
+import bisect
+import functools
+import re
+import time
+
+RING_SIZE = 4096
+JITTER_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+
+class LatencyRing:
+    """The last `size` samples (ms) in a preallocated array, plus running totals"""
+
+    __slots__ = ('samples', 'size', 'count', 'total', 'worst')
+
+    def __init__(self, size=RING_SIZE):
+        self.samples = array.array('d', bytes(8 * size))
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, ms):
+        self.samples[self.count % self.size] = ms
+        self.count += 1
+        self.total += ms
+        if ms > self.worst:
+            self.worst = ms
+
+    def recent(self):
+        """Retained samples, sorted"""
+        return sorted(self.samples[:min(self.count, self.size)])
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Instrumentation:
+    def __init__(self, profile_path=None, ring_size=RING_SIZE):
+        self.ring_size = ring_size
+        self.rings = {}
+        self.jitter = [0] * (len(JITTER_BUCKETS_MS) + 1)
+        self.jitter_ring = LatencyRing(ring_size)
+        self.profile_path = profile_path
+        self.profiler = None
+        self.started = time.perf_counter()
+
+    def ring(self, name):
+        ring = self.rings.get(name)
+        if ring is None:
+            ring = self.rings[name] = LatencyRing(self.ring_size)
+        return ring
+
+    def timed(self, name, fn):
+        """Return `fn` wrapped to record each call's duration under `name`"""
+        ring = self.ring(name)
+        clock = time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                ring.add((clock() - start) * 1000)
+        return wrapper
+
+    def wrap(self, obj, attr, name=None):
+        """Replace obj.attr (a method on an instance, or a module function) with a timed version"""
+        setattr(obj, attr, self.timed(name or attr, getattr(obj, attr)))
+
+    def wrap_animations(self, frames):
+        """Time every FrameScheduler animation step, grouped by name ('pulse', 'stretch', ...)"""
+        add = frames.add_animation
+
+        def add_animation(name, period_ms, cb, owner=None):
+            label = re.match(r'[A-Za-z_]*', name).group() or name
+            return add(name, period_ms, self.timed(f'{label} step', cb), owner)
+        frames.add_animation = add_animation
+
+    def record_wakeup(self, late):
+        """TimerCore 'wakeup' listener: `late` is seconds past the ideal wakeup time"""
+        ms = late * 1000
+        self.jitter[bisect.bisect_right(JITTER_BUCKETS_MS, ms)] += 1
+        self.jitter_ring.add(ms)
+
+    def start_profiler(self):
+        if self.profile_path and self.profiler is None:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def summary(self):
+        lines = [f"Instrumentation summary ({time.perf_counter() - self.started:.0f} s session)",
+                 f"{'callback':<22}{'calls':>8}{'mean ms':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for name, ring in sorted(self.rings.items()):
+            if not ring.count:
+                continue
+            recent = ring.recent()
+            lines.append(f"{name:<22}{ring.count:>8}{ring.total / ring.count:>10.3f}"
+                         f"{percentile(recent, 0.5):>9.3f}{percentile(recent, 0.95):>9.3f}"
+                         f"{percentile(recent, 0.99):>9.3f}{ring.worst:>9.3f}")
+        wakeups = self.jitter_ring.count
+        lines.append(f"Tick jitter vs. ideal 1 s cadence ({wakeups} wakeups, "
+                     f"p95 {percentile(self.jitter_ring.recent(), 0.95):.1f} ms, max {self.jitter_ring.worst:.1f} ms)")
+        lower = 0
+        for bound, count in zip(JITTER_BUCKETS_MS + (None,), self.jitter):
+            label = f"{lower}-{bound} ms" if bound is not None else f">= {lower} ms"
+            share = count / wakeups if wakeups else 0.0
+            lines.append(f"  {label:>12} {count:>7}  {'#' * round(share * 40)}")
+            lower = bound
+        return '\n'.join(lines)
+
+    def finish(self):
+        """Stop profiling, print the summary and write the profile files"""
+        if self.profiler is not None:
+            self.profiler.disable()
+        text = self.summary()
+        print(text)
+        if self.profiler is not None:
+            try:
+                self.profiler.dump_stats(self.profile_path)
+                with open(self.profile_path + '.txt', 'w') as f:
+                    f.write(text + '\n')
+                print(f"cProfile stats written to {self.profile_path}")
+            except Exception as e:
+                print(f"Failed to write profile: {e}")
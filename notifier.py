@@ -0,0 +1,146 @@
+"""Sounds and desktop notifications, dispatched off the Tk thread.
+
+winsound.Beep blocks for the length of the beep and plyer can take a while
+to raise a notification, so both run on worker threads, one per channel.
+Each worker is fed by a small bounded queue. Callers on the Tk thread only
+enqueue: when a queue is full the request is dropped, never waited for.
+
+Bursts are folded together. A repeat of the same sound or notification
+within `dedup_window` seconds is skipped. Notifications that arrive within
+`gather` seconds of each other (several timers finishing on the same
+second, say) are shown as one. When plyer is missing or fails, `fallback`
+gets the notification instead. It is called on the notification worker, so
+it must hand over to the Tk thread itself.
+"""
+
+import importlib.util
+import queue
+import threading
+import time
+
+QUEUE_SIZE = 16
+DEDUP_WINDOW = 2.0
+GATHER = 0.25
+MAX_LINES = 4
+
+
+def play_sound():
+    try:
+        import winsound
+        winsound.Beep(1000, 700)
+    except Exception:
+        try:
+            print('\a', end='', flush=True)
+        except Exception:
+            pass
+
+
+def combine(notes):
+    """One (title, message) for a batch of notifications, duplicates removed"""
+    notes = list(dict.fromkeys(notes))
+    if len(notes) == 1:
+        return notes[0]
+    lines = [f'{title}: {message}' for title, message in notes[:MAX_LINES]]
+    if len(notes) > MAX_LINES:
+        lines.append(f'…and {len(notes) - MAX_LINES} more')
+    return f'{len(notes)} sessions finished', '\n'.join(lines)
+
+
+class Notifier:
+    def __init__(self, fallback=None, dedup_window=DEDUP_WINDOW, gather=GATHER, maxsize=QUEUE_SIZE):
+        self.fallback = fallback
+        self.dedup_window = dedup_window
+        self.gather = gather
+        self.sent = 0
+        self.dropped = 0
+        self.deduped = 0
+        self._last = {}
+        try:
+            self._desktop = importlib.util.find_spec('plyer') is not None
+        except Exception:
+            self._desktop = False
+        self._sounds = queue.Queue(maxsize)
+        self._notes = queue.Queue(maxsize)
+        self._threads = [
+            threading.Thread(target=self._run_sounds, daemon=True, name='Notifier-sound'),
+            threading.Thread(target=self._run_notes, daemon=True, name='Notifier-notify'),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # --- Producer side (any thread; never blocks) ---
+    def sound(self):
+        self._submit(self._sounds, ('sound',))
+
+    def notify(self, title, message):
+        self._submit(self._notes, (title, message))
+
+    def _submit(self, q, job):
+        now = time.monotonic()
+        last = self._last.get(job)
+        if last is not None and now - last < self.dedup_window:
+            self.deduped += 1
+            return
+        if len(self._last) > 64:
+            self._last = {k: t for k, t in self._last.items() if now - t < self.dedup_window}
+        self._last[job] = now
+        try:
+            q.put_nowait(job)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=1.0):
+        """Let queued work finish for up to `timeout` seconds; the workers are daemons either way"""
+        for q in (self._sounds, self._notes):
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    # --- Workers ---
+    def _run_sounds(self):
+        while True:
+            job = self._sounds.get()
+            if job is None:
+                return
+            play_sound()
+
+    def _run_notes(self):
+        while True:
+            note = self._notes.get()
+            if note is None:
+                return
+            batch = [note]
+            deadline = time.monotonic() + self.gather
+            stop = False
+            while True:
+                try:
+                    note = self._notes.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if note is None:
+                    stop = True
+                    break
+                batch.append(note)
+            self._show(*combine(batch))
+            if stop:
+                return
+
+    def _show(self, title, message):
+        self.sent += 1
+        if self._desktop:
+            try:
+                from plyer import notification
+                notification.notify(title=title, message=message, timeout=5)
+                return
+            except Exception as e:
+                print(f"Desktop notifications unavailable, using in-app toasts: {e}")
+                self._desktop = False
+        if self.fallback is not None:
+            try:
+                self.fallback(title, message)
+            except Exception as e:
+                print(f"Notification fallback failed: {e}")
@@ -0,0 +1,210 @@
+"""Crash-safe file writes and a write-behind queue.
+
+Whole-file writes go to a temp file that is flushed, fsynced and renamed over
+the target, so a crash leaves either the old or the new contents, never a
+truncated file. WriteBehind moves those writes (and history appends) onto a
+background thread and coalesces them, so the Tk mainloop never waits on disk.
+
+The salvage helpers recover what they can from files that were damaged
+before this existed (for example a history array cut off mid-record).
+"""
+
+import json
+import os
+import re
+import threading
+
+
+def fsync_dir(path):
+    """Flush a directory entry so a rename survives power loss (no-op where unsupported)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data, fsync=True):
+    """Replace `path` with `data` (str or bytes) via temp file + rename"""
+    tmp = path + '.tmp'
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    try:
+        with open(tmp, mode) as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        fsync_dir(path)
+
+
+def atomic_write_json(path, obj, fsync=True):
+    atomic_write(path, json.dumps(obj), fsync)
+
+
+def append_lines(path, lines, fsync=True):
+    """Append text lines durably.
+
+    If a previous crash left a torn last line with no newline, a newline is
+    written first so the new records don't get glued onto it.
+    """
+    data = ''.join(lines).encode('utf-8')
+    with open(path, 'a+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b'\n':
+                data = b'\n' + data
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def salvage_json_records(text):
+    """Return every complete JSON object found in damaged JSON text.
+
+    Scans for '{' and decodes from there, so a truncated or partly garbled
+    array still yields all the records before and after the damage.
+    """
+    decoder = json.JSONDecoder()
+    records = []
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except ValueError:
+            pos = text.find('{', pos + 1)
+            continue
+        if isinstance(obj, dict):
+            records.append(obj)
+        pos = text.find('{', end)
+    return records
+
+
+_PAIR = re.compile(r'"(\w+)"\s*:\s*(true|false|null|-?\d+(?:\.\d+)?|"(?:[^"\\]|\\.)*")')
+
+
+def salvage_json_pairs(text):
+    """Recover the top-level "key": scalar pairs of a damaged JSON object"""
+    data = {}
+    for key, value in _PAIR.findall(text):
+        try:
+            data[key] = json.loads(value)
+        except ValueError:
+            pass
+    return data
+
+
+def load_json_file(path, default=None, salvage=None):
+    """Read JSON from `path`; on a parse error, use `salvage(text)` and keep the damaged file as .corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return default
+    try:
+        return json.loads(text)
+    except ValueError:
+        if salvage is None:
+            return default
+    recovered = salvage(text)
+    try:
+        os.replace(path, path + '.corrupt')
+    except OSError:
+        pass
+    print(f"Recovered {len(recovered)} item(s) from damaged {path} (original kept as {path}.corrupt)")
+    return recovered
+
+
+class WriteBehind:
+    """Background writer with per-key coalescing.
+
+    `replace(key, fn)` schedules a whole-file write; if another one for the
+    same key is still pending, only the newest runs. `append(key, item,
+    write_many)` queues an item; everything queued for the key is handed to
+    one `write_many(items)` call. Jobs for different keys run in the order
+    they were first queued. Call flush() before reading back what was
+    written, and close() at exit.
+    """
+
+    def __init__(self, name='WriteBehind'):
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending = {}  # key -> ('replace', fn) | ('append', write_many, [items]); insertion ordered
+        self._busy = False
+        self._closed = False
+        self._thread = None
+        self.writes = 0
+        self.coalesced = 0
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+            self._thread.start()
+
+    def replace(self, key, fn):
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = ('replace', fn)
+            self._start()
+            self._cond.notify_all()
+
+    def append(self, key, item, write_many):
+        with self._cond:
+            job = self._pending.get(key)
+            if job is not None and job[0] == 'append':
+                job[2].append(item)
+                self.coalesced += 1
+            else:
+                self._pending[key] = ('append', write_many, [item])
+            self._start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                job = self._pending.pop(key)
+                self._busy = True
+            try:
+                if job[0] == 'replace':
+                    job[1]()
+                else:
+                    job[1](job[2])
+                self.writes += 1
+            except Exception as e:
+                print(f"Background write for {key} failed: {e}")
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is on disk; returns False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout=5.0):
+        """Flush and stop the writer thread"""
+        done = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return done
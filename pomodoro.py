@@ -1,52 +1,77 @@
 # See original source in parent folder. This copy is self-contained for the new repo.
 # The code below mirrors the modernized UI, theme, ring, tray, and packaging fixes.
 
+import sys
+
+# A second launch hands its request to the running instance and exits
+# before paying for Tk (see single_instance.py).
+if __name__ == '__main__':
+    import single_instance
+    _instance_lock = single_instance.acquire_or_forward(sys.argv[1:])
+
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import argparse
 import threading
-import json
+import base64
 import os
-import sys
+import time
+import importlib.util
 import datetime
 
-try:
-    import winsound
-    def play_sound():
-        winsound.Beep(1000, 700)
-except Exception:
-    def play_sound():
-        try:
-            print('\a', end='')
-        except Exception:
-            pass
+import analytics
+import control_api
+import history_chart
+import history_export
+import notifier
+import single_instance
+from history_store import HistoryStore, dashboard_stats, day_epoch
+from persistence import WriteBehind, atomic_write_json, load_json_file, salvage_json_pairs
+from timer_engine import TimerEngine
+from frame_scheduler import FrameScheduler
+from icons import ProgressIconCache, app_icon, app_icon_png, cached_window_icons, warm_cache
+
+# Optional backends (winsound, plyer, PIL, pystray) are imported on first use
+# so none of them sit on the startup path; sound and notifications go through
+# notifier.py's worker threads.
+def _has_module(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except Exception:
+        return False
+
+
+# Cheap availability probes; the real import happens in load_tray_backend()
+HAS_PIL = _has_module('PIL')
+HAS_TRAY = HAS_PIL and _has_module('pystray')
+HAS_NUMPY = _has_module('numpy')  # optional: streaks and averages in the History dialog
+Image = ImageDraw = pystray = None
+_backend_lock = threading.Lock()
+
 
-try:
-    from plyer import notification
-    def notify(title, message):
+def load_tray_backend():
+    """Import PIL and pystray once; returns True when the tray can be used"""
+    global Image, ImageDraw, pystray, HAS_PIL, HAS_TRAY
+    with _backend_lock:
+        if pystray is not None:
+            return True
+        if not HAS_TRAY:
+            return False
         try:
-            notification.notify(title=title, message=message, timeout=5)
-        except Exception:
-            messagebox.showinfo(title, message)
-except Exception:
-    def notify(title, message):
-        messagebox.showinfo(title, message)
-
-HAS_TRAY = False
-HAS_PIL = False
-try:
-    from PIL import Image, ImageDraw
-    HAS_PIL = True
-    try:
-        import pystray
-        HAS_TRAY = True
+            from PIL import Image as _Image, ImageDraw as _ImageDraw
+        except Exception as e:
+            print(f"PIL not available: {e}")
+            HAS_PIL = HAS_TRAY = False
+            return False
+        try:
+            import pystray as _pystray
+        except Exception as e:
+            print(f"System tray not available: {e}")
+            HAS_TRAY = False
+            return False
+        Image, ImageDraw, pystray = _Image, _ImageDraw, _pystray
         print("System tray support is enabled")
-    except Exception as e:
-        print(f"System tray not available: {e}")
-        HAS_TRAY = False
-except Exception as e:
-    print(f"PIL not available: {e}")
-    HAS_PIL = False
-    HAS_TRAY = False
+        return True
 
 # Resolve app directory for both script and PyInstaller bundle
 if getattr(sys, 'frozen', False):
@@ -54,11 +79,17 @@ if getattr(sys, 'frozen', False):
 else:
     APP_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = os.path.join(APP_DIR, 'pomodoro_config.json')
-HISTORY_FILE = os.path.join(APP_DIR, 'pomodoro_history.json')
+HISTORY_FILE = os.path.join(APP_DIR, 'pomodoro_history.jsonl')
+# Pre-journal installs kept history as a single JSON array; migrated on startup
+LEGACY_HISTORY_FILE = os.path.join(APP_DIR, 'pomodoro_history.json')
+HISTORY_DB_FILE = os.path.join(APP_DIR, 'pomodoro_history.db')
+HISTORY_PAGE_SIZE = 100  # rows fetched per scroll step in the History table
+TRAY_PROGRESS_STEPS = 60  # pre-rendered tray frames per session
+DEFAULT_TIMER = 'Pomodoro'
 
 
 class PomodoroApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, instrumentation=None):
         super().__init__()
         self.title('Pomodoro — Focus Timer')
         self.geometry('460x520')
@@ -71,29 +102,68 @@ class PomodoroApp(tk.Tk):
         except Exception:
             pass
 
-        self.is_running = False
-        self.is_focus = True
-        self.remaining = 0
-        self.session_total_seconds = 0
+        # Named timers share one deadline heap (TimerEngine); self.timer is the
+        # one on screen and the only one polled every second.
+        self.engine = TimerEngine()
+        self.timer_name = DEFAULT_TIMER
+        self.timer = self.engine.add(DEFAULT_TIMER)
+        self.engine.watch(DEFAULT_TIMER)
+        self.engine.subscribe('tick', self.on_timer_tick)
+        self.engine.subscribe('session_complete', self.on_session_complete)
+        self.engine.subscribe('phase_change', self.on_phase_change)
+        self.engine.subscribe('cycle_complete', self.on_cycle_complete)
         self._timer_job = None
-        self._pulse_job = None
+        # All ring/label/animation updates go through one batched, change-only frame loop
+        self.frames = FrameScheduler(self)
+        self.history_backend = 'json'
+        self._export = None
+        self.writer = WriteBehind()  # history and config writes happen off the Tk thread
+        # One queue carries every call from other threads to the Tk thread:
+        # control API commands and, without plyer, notifications shown as toasts.
+        self._toasts = []
+        self.commands = control_api.CommandQueue()
+        self.commands.attach(self, self.handle_control)
+        # Beeps and desktop notifications run on worker threads
+        self.notifier = notifier.Notifier(fallback=lambda title, message: self.commands.submit(
+            {'cmd': 'toast', 'title': title, 'message': message}))
 
         self.focus_minutes = tk.IntVar(value=25)
         self.break_minutes = tk.IntVar(value=5)
         self.auto_repeat = tk.BooleanVar(value=True)
         self.dark_mode = tk.BooleanVar(value=True)
+        self._loading_timer = False
+        for var in (self.focus_minutes, self.break_minutes, self.auto_repeat):
+            var.trace_add('write', lambda *args: self.sync_timer_settings())
 
         self.load_settings()
+        self.sync_timer_settings()
+        self.history = self.open_history()
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            self.enable_instrumentation(instrumentation)  # before widgets capture bound methods
         self.setup_theme()
         self.create_widgets()
+        self.set_window_icon()
         self.update_display(0)
         self.update_progress_ring(0.0)
         self.in_tray = False
+        self._low_power_since = None
+        self._low_power_wakeups = 0
         
-        # Initialize system tray support if available
+        # Tray support is set up off the startup path, once the window is mapped
         self.tray_icon = None
+        self._tray_started = False
+        self.tray_frames = ProgressIconCache(64, TRAY_PROGRESS_STEPS)
+        self._tray_frame_key = None
         if HAS_TRAY:
-            self.create_tray_icon()
+            self.bind('<Map>', self._on_first_map, add='+')
+
+        # Local control API (control_api.py); its server thread only reads
+        # status_snapshot and queues commands for the Tk thread.
+        self.control = None
+        self.status_snapshot = {}
+        self.publish_status()
+        self.start_control_api()
             
         # Set up window close handler
         self.protocol('WM_DELETE_WINDOW', self.on_closing)
@@ -138,6 +208,34 @@ class PomodoroApp(tk.Tk):
         self.restyle_widgets()
         self.draw_ring_base()
         self.update_progress_ring(self.current_progress_ratio())
+        self.set_window_icon()
+        if self.tray_icon is not None:
+            # Build the new theme's tray frames off the Tk thread
+            threading.Thread(target=self._prepare_tray_frames, args=(self.tray_colors(),), daemon=True, name="TrayFrames").start()
+
+    def icon_theme(self):
+        return 'dark' if self.dark_mode.get() else 'light'
+
+    def set_window_icon(self):
+        """Window and taskbar icon from the cached PNGs (icons.py); the first run renders them on a worker"""
+        theme = self.icon_theme()
+        pngs = cached_window_icons(theme)
+        if pngs is not None:
+            self._apply_window_icon(pngs)
+        elif HAS_PIL:
+            def done(pngs, error):
+                if error is not None:
+                    print(f"Failed to render window icon: {error}")
+                elif pngs is not None and theme == self.icon_theme():
+                    self._apply_window_icon(pngs)
+            self.run_background('WindowIcon', lambda: warm_cache() or cached_window_icons(theme), done)
+
+    def _apply_window_icon(self, pngs):
+        try:
+            self._window_icons = [tk.PhotoImage(master=self, data=base64.b64encode(png)) for png in pngs]
+            self.iconphoto(True, *self._window_icons)
+        except Exception as e:
+            print(f"Failed to set window icon: {e}")
 
     def create_widgets(self):
         pad = 12
@@ -151,6 +249,11 @@ class PomodoroApp(tk.Tk):
         ttk.Label(header, text='Pomodoro', style='H1.TLabel').pack(side='left')
         self.theme_btn = ttk.Button(header, text='🌓 Theme', command=self.toggle_theme)
         self.theme_btn.pack(side='right', padx=(8, 0))
+        ttk.Button(header, text='＋', width=3, command=self.add_timer_dialog).pack(side='right', padx=(4, 0))
+        self.timer_var = tk.StringVar(value=self.timer_name)
+        self.timer_box = ttk.Combobox(header, textvariable=self.timer_var, values=self.engine.names(), state='readonly', width=12)
+        self.timer_box.pack(side='right')
+        self.timer_box.bind('<<ComboboxSelected>>', lambda e: self.select_timer(self.timer_var.get()))
 
         card = ttk.Frame(root, padding=16, style='Card.TFrame')
         card.pack(fill='both', expand=True)
@@ -221,117 +324,57 @@ class PomodoroApp(tk.Tk):
         if self.ring_ids['fg'] is None:
             self.ring_ids['fg'] = self.ring_canvas.create_arc(*bbox, start=90, extent=0, style='arc', outline=self.current_accent(), width=self.ring_thickness)
         else:
-            self.ring_canvas.itemconfig(self.ring_ids['fg'], outline=self.current_accent(), width=self.ring_thickness)
+            self.frames.itemconfig(self.ring_canvas, self.ring_ids['fg'], outline=self.current_accent(), width=self.ring_thickness)
 
     def current_accent(self):
         p = self.palette()
         return p['accent'] if self.is_focus else p['break_accent']
 
     def current_progress_ratio(self):
-        if self.session_total_seconds <= 0:
-            return 0.0
-        done = max(0, self.session_total_seconds - max(0, self.remaining))
-        return min(1.0, done / self.session_total_seconds)
+        return self.timer.progress_ratio()
 
     def update_progress_ring(self, ratio: float):
-        try:
-            extent = -360 * ratio
-            self.ring_canvas.itemconfig(self.ring_ids['fg'], extent=extent, outline=self.current_accent())
-        except Exception:
-            pass
+        extent = -360 * ratio
+        self.frames.itemconfig(self.ring_canvas, self.ring_ids['fg'], extent=extent, outline=self.current_accent())
         if self.is_running:
             self.start_pulse()
         else:
             self.stop_pulse()
 
     def start_pulse(self):
-        if self._pulse_job is not None:
+        if self.frames.has_animation('pulse'):
             return
         phase = {'t': 0}
         def step():
             t = phase['t']
             w = self.ring_thickness + (1 if (t % 6) < 3 else 0)
-            try:
-                self.ring_canvas.itemconfig(self.ring_ids['fg'], width=w)
-            except Exception:
-                pass
+            self.frames.itemconfig(self.ring_canvas, self.ring_ids['fg'], width=w)
             phase['t'] += 1
-            self._pulse_job = self.after(180, step)
-        self._pulse_job = self.after(180, step)
+        self.frames.add_animation('pulse', 180, step)
 
     def stop_pulse(self):
-        if self._pulse_job is not None:
-            try:
-                self.after_cancel(self._pulse_job)
-            except Exception:
-                pass
-            self._pulse_job = None
-            try:
-                self.ring_canvas.itemconfig(self.ring_ids['fg'], width=self.ring_thickness)
-            except Exception:
-                pass
+        if self.frames.has_animation('pulse'):
+            self.frames.remove_animation('pulse')
+            self.frames.itemconfig(self.ring_canvas, self.ring_ids['fg'], width=self.ring_thickness)
 
     # History
-    def append_history(self, kind, minutes, ts_iso):
-        entry = {'type': kind, 'minutes': minutes, 'ts': ts_iso}
-        history = []
-        if os.path.exists(HISTORY_FILE):
-            try:
-                with open(HISTORY_FILE, 'r') as f:
-                    history = json.load(f)
-            except Exception:
-                history = []
-        history.append(entry)
-        try:
-            with open(HISTORY_FILE, 'w') as f:
-                json.dump(history, f)
-        except Exception:
-            pass
-
-    def load_history(self):
-        if not os.path.exists(HISTORY_FILE):
-            return []
-        try:
-            with open(HISTORY_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return []
+    def append_history(self, kind, minutes, ts_iso, timer=DEFAULT_TIMER):
+        # Queued for the writer thread; appends that pile up are written together
+        entry = {'type': kind, 'minutes': minutes, 'ts': ts_iso, 'timer': timer}
+        self.writer.append('history', entry, self.history.append_many)
 
     def show_history(self):
-        import matplotlib
-        matplotlib.use('TkAgg')
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        from datetime import datetime, timedelta, timezone
+        from datetime import datetime, timezone
 
-        hist = self.load_history()
         dlg = tk.Toplevel(self)
         dlg.title('Pomodoro History & Stats')
         dlg.geometry('650x600')
         dlg.transient(self)
 
-        # Aggregate stats
+        # The dialog opens with placeholder cards; stats and the chart image
+        # are computed on worker threads and filled in when they arrive.
         today = datetime.now(timezone.utc).date()
-        week_start = today - timedelta(days=today.weekday())
-        month_start = today.replace(day=1)
-        daily = {}
-        weekly = 0
-        monthly = 0
-        today_total = 0
-        total_sessions = 0
-        for entry in hist:
-            ts = entry.get('ts') or entry.get('timestamp')
-            minutes = entry.get('minutes', 0)
-            d = datetime.fromisoformat(ts).date() if ts else None
-            if d:
-                daily[d] = daily.get(d, 0) + minutes
-                if d == today:
-                    today_total += minutes
-                if d >= week_start:
-                    weekly += minutes
-                if d >= month_start:
-                    monthly += minutes
-                total_sessions += 1
+        placeholder = "\u2026"
 
         # Stats frame - styled as cards
         p = self.palette()
@@ -347,101 +390,131 @@ class PomodoroApp(tk.Tk):
         today_frame.grid(row=0, column=0, padx=5, pady=5, sticky='ew')
         tk.Label(today_frame, text="TODAY", bg=p['accent'], fg="white", 
                 font=("Segoe UI", 9, "bold")).pack(anchor="w", padx=10, pady=(8,0))
-        tk.Label(today_frame, text=f"{today_total//60}h {today_total%60}m", 
-                bg=p['accent'], fg="white", font=("Segoe UI", 16, "bold")).pack(anchor="w", padx=10, pady=(0,8))
+        today_value = tk.Label(today_frame, text=placeholder, 
+                bg=p['accent'], fg="white", font=("Segoe UI", 16, "bold"))
+        today_value.pack(anchor="w", padx=10, pady=(0,8))
         
         # Week card
         week_frame = tk.Frame(cards_frame, bg=p['break_accent'], bd=0, highlightthickness=0)
         week_frame.grid(row=0, column=1, padx=5, pady=5, sticky='ew')
         tk.Label(week_frame, text="THIS WEEK", bg=p['break_accent'], fg="white", 
                 font=("Segoe UI", 9, "bold")).pack(anchor="w", padx=10, pady=(8,0))
-        tk.Label(week_frame, text=f"{weekly//60}h {weekly%60}m", 
-                bg=p['break_accent'], fg="white", font=("Segoe UI", 16, "bold")).pack(anchor="w", padx=10, pady=(0,8))
+        week_value = tk.Label(week_frame, text=placeholder, 
+                bg=p['break_accent'], fg="white", font=("Segoe UI", 16, "bold"))
+        week_value.pack(anchor="w", padx=10, pady=(0,8))
         
         # Month card
         month_frame = tk.Frame(cards_frame, bg=p['accent2'], bd=0, highlightthickness=0)
         month_frame.grid(row=0, column=2, padx=5, pady=5, sticky='ew')
         tk.Label(month_frame, text="THIS MONTH", bg=p['accent2'], fg="white", 
                 font=("Segoe UI", 9, "bold")).pack(anchor="w", padx=10, pady=(8,0))
-        tk.Label(month_frame, text=f"{monthly//60}h {monthly%60}m", 
-                bg=p['accent2'], fg="white", font=("Segoe UI", 16, "bold")).pack(anchor="w", padx=10, pady=(0,8))
+        month_value = tk.Label(month_frame, text=placeholder, 
+                bg=p['accent2'], fg="white", font=("Segoe UI", 16, "bold"))
+        month_value.pack(anchor="w", padx=10, pady=(0,8))
         
         # Sessions card
         sessions_frame = tk.Frame(cards_frame, bg=p['card'], bd=0, highlightthickness=1, highlightbackground=p['subtle'])
         sessions_frame.grid(row=0, column=3, padx=5, pady=5, sticky='ew')
         tk.Label(sessions_frame, text="TOTAL SESSIONS", bg=p['card'], fg=p['fg'], 
                 font=("Segoe UI", 9, "bold")).pack(anchor="w", padx=10, pady=(8,0))
-        tk.Label(sessions_frame, text=f"{total_sessions}", 
-                bg=p['card'], fg=p['fg'], font=("Segoe UI", 16, "bold")).pack(anchor="w", padx=10, pady=(0,8))
+        sessions_value = tk.Label(sessions_frame, text=placeholder, 
+                bg=p['card'], fg=p['fg'], font=("Segoe UI", 16, "bold"))
+        sessions_value.pack(anchor="w", padx=10, pady=(0,8))
                 
         # Make columns evenly sized
         for i in range(4):
             cards_frame.grid_columnconfigure(i, weight=1)
 
+        # Streaks, rolling averages and focus/break ratio (analytics.py, needs NumPy)
+        insights_value = ttk.Label(stats_frame, text=placeholder if HAS_NUMPY else '', style='Subtle.TLabel')
+        if HAS_NUMPY:
+            insights_value.pack(anchor='w', padx=5, pady=(4, 0))
+
         # Graph frame
         graph_frame = ttk.Frame(dlg)
         graph_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Create a modern, sleek figure with dark style
-        plt.style.use('seaborn-v0_8-darkgrid')
-        fig, ax = plt.subplots(figsize=(6.2,3.2))
-        fig.patch.set_facecolor('#161b22' if self.dark_mode.get() else '#f8f9fa')
-        
-        # Get palette colors for consistency with app theme
-        p = self.palette()
-        days = sorted(daily.keys())
-        values = [daily[d]/60 for d in days]  # hours
-        date_strs = [d.strftime('%m/%d') for d in days]  # shorter date format
-        
-        # Create gradient color based on values
-        colors = []
-        for val in values:
-            if val < 2:  # Less than 2 hours
-                colors.append(p['accent'] if val > 0 else p['ring_bg'])
-            elif val < 4:  # 2-4 hours
-                colors.append(p['break_accent'])
-            else:  # 4+ hours
-                colors.append(p['accent2'])
-        
-        # Create modern bar chart with rounded corners
-        bars = ax.bar(date_strs, values, color=colors, width=0.65, alpha=0.85, 
-                     edgecolor=p['card'], linewidth=1.5)
-        
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0.2:  # Only label if there's enough space
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                        f'{height:.1f}h', ha='center', va='bottom', 
-                        color=p['fg'], fontsize=8)
-        
-        # Set title and style the chart
-        ax.set_title("Daily Focus Hours", fontsize=13, color=p['fg'], pad=10)
-        ax.set_ylabel("Hours", color=p['fg'])
-        ax.set_xlabel("Date", color=p['fg'])
-        
-        # Style the axes
-        ax.tick_params(axis='x', colors=p['fg'], rotation=45)
-        ax.tick_params(axis='y', colors=p['fg'])
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['bottom'].set_color(p['subtle'])
-        ax.spines['left'].set_color(p['subtle'])
-        
-        # Highlight today
-        if today in daily:
-            today_idx = days.index(today)
-            bars[today_idx].set_edgecolor(p['accent'])
-            bars[today_idx].set_linewidth(2)
-        
-        # Tighten layout and add to canvas
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Chart window selector; the chart re-bins (day/week/month) to fit
+        window_var = tk.StringVar(value=history_chart.DEFAULT_WINDOW)
+        window_row = ttk.Frame(graph_frame)
+        window_row.pack(fill='x')
+        ttk.Label(window_row, text="Show:").pack(side='left')
+        window_box = ttk.Combobox(window_row, textvariable=window_var, state='readonly', width=14,
+                                  values=list(history_chart.WINDOWS))
+        window_box.pack(side='left', padx=(4, 0))
+
+        # The chart is rasterized to PNG with Agg on a worker and shown as an image
+        facecolor = '#161b22' if self.dark_mode.get() else '#f8f9fa'
+        chart_label = tk.Label(graph_frame, text="Loading chart\u2026", bg=facecolor, fg=p['fg'])
+        chart_label.pack(fill="both", expand=True)
+        chart = {'daily': None, 'image': None, 'pending': False, 'stale': False}
+
+        def request_chart(*_):
+            if chart['daily'] is None:
+                return
+            if chart['pending']:
+                chart['stale'] = True  # re-render with the latest window when the current one lands
+                return
+            chart['pending'] = True
+            daily, window = chart['daily'], history_chart.WINDOWS[window_var.get()]
+            self.run_background('HistoryChart', lambda: history_chart.render_png(daily, today, p, window, facecolor),
+                                chart_ready)
+
+        def chart_ready(png, error):
+            chart['pending'] = False
+            if not chart_label.winfo_exists():
+                return
+            if chart['stale']:
+                chart['stale'] = False
+                request_chart()
+                return
+            if error is not None:
+                chart_label.configure(image='', text=f"Chart unavailable: {error}")
+                return
+            chart['image'] = tk.PhotoImage(master=dlg, data=base64.b64encode(png))
+            chart_label.configure(image=chart['image'], text='')
+
+        window_box.bind('<<ComboboxSelected>>', request_chart)
+
+        def load_stats():
+            self.writer.flush()
+            stats = dashboard_stats(self.history, today)
+            if HAS_NUMPY:
+                try:
+                    stats['insights'] = analytics.store_report(self.history, today)
+                except Exception as e:
+                    print(f"History analytics failed: {e}")
+            return stats
+
+        def stats_loaded(stats, error):
+            if not dlg.winfo_exists():
+                return
+            if error is not None:
+                print(f"History stats failed: {error}")
+                for label in (today_value, week_value, month_value, sessions_value, insights_value):
+                    label.configure(text="\u2014")
+                chart_label.configure(text=f"Could not load history: {error}")
+                return
+            for label, minutes in ((today_value, stats['today']), (week_value, stats['week']), (month_value, stats['month'])):
+                label.configure(text=f"{minutes//60}h {minutes%60}m")
+            sessions_value.configure(text=f"{stats['sessions']}")
+            insights = stats.get('insights')
+            if insights is not None:
+                ratio = insights['ratios_30d']['minute_ratio']
+                insights_value.configure(text=(
+                    f"Streak {insights['current_streak']} days (best {insights['longest_streak']})  \u00b7  "
+                    f"7-day avg {analytics.format_minutes(insights['avg_7d'])}/day  \u00b7  "
+                    f"30-day avg {analytics.format_minutes(insights['avg_30d'])}/day  \u00b7  "
+                    f"Focus:break {f'{ratio}:1' if ratio is not None else 'n/a'} (30 days)"))
+            else:
+                insights_value.configure(text='')
+            chart['daily'] = stats['daily']
+            request_chart()
+
+        self.run_background('HistoryStats', load_stats, stats_loaded)
 
         # History table with scrollbar (below graph)
-        ttk.Label(dlg, text="Recent Sessions", font=("Segoe UI", 11, "bold")).pack(anchor="w", padx=15, pady=(5,0))
+        ttk.Label(dlg, text="Sessions (newest first)", font=("Segoe UI", 11, "bold")).pack(anchor="w", padx=15, pady=(5,0))
         
         table_frame = ttk.Frame(dlg)
         table_frame.pack(fill="both", expand=True, padx=10, pady=(2,10))
@@ -463,105 +536,295 @@ class PomodoroApp(tk.Tk):
                         foreground=p['fg'])
         style.map("Treeview", background=[('selected', p['accent'])])
         
-        cols = ("Date", "Time", "Type", "Minutes")
-        tree = ttk.Treeview(table_frame, columns=cols, show="headings", yscrollcommand=scrollbar.set)
+        cols = ("Date", "Time", "Type", "Minutes", "Timer")
+        tree = ttk.Treeview(table_frame, columns=cols, show="headings")
         scrollbar.config(command=tree.yview)
         
         tree.heading("Date", text="Date")
         tree.heading("Time", text="Time")
         tree.heading("Type", text="Type")
         tree.heading("Minutes", text="Minutes")
+        tree.heading("Timer", text="Timer")
         
         tree.column("Date", anchor="center", width=100)
         tree.column("Time", anchor="center", width=80)
         tree.column("Type", anchor="center", width=80)
         tree.column("Minutes", anchor="center", width=80)
+        tree.column("Timer", anchor="center", width=100)
         
-        for entry in hist[-50:][::-1]:
-            ts = entry.get('ts') or entry.get('timestamp')
-            typ = entry.get('type', '')
-            mins = entry.get('minutes', '')
-            if ts:
-                try:
-                    dt = datetime.fromisoformat(ts)
-                    date_str = dt.strftime("%Y-%m-%d")
-                    time_str = dt.strftime("%H:%M:%S")
-                    tree.insert("", "end", values=(date_str, time_str, typ, mins))
-                except:
-                    tree.insert("", "end", values=(ts, "", typ, mins))
-            else:
-                tree.insert("", "end", values=("Unknown", "", typ, mins))
+        # Rows are read backwards from the journal one page at a time and the
+        # next page is fetched only when the user scrolls near the bottom.
+        # Pages are read on a worker: the store's lock may be held by a write
+        # or an import for a while.
+        paging = {'cursor': None, 'done': False, 'pending': True}
+
+        def load_page():
+            cursor = paging['cursor']
+            self.run_background('HistoryPage', lambda: self.history.read_page_reverse(cursor, HISTORY_PAGE_SIZE),
+                                page_loaded)
+
+        def page_loaded(page, error):
+            paging['pending'] = False
+            if not tree.winfo_exists():
+                return
+            if error is not None:
+                print(f"History page failed: {error}")
+                return
+            entries, paging['cursor'] = page
+            paging['done'] = paging['cursor'] == 0
+            for entry in entries:
+                ts = entry.get('ts') or entry.get('timestamp')
+                typ = entry.get('type', '')
+                mins = entry.get('minutes', '')
+                timer = entry.get('timer', '')
+                if ts:
+                    try:
+                        dt = datetime.fromisoformat(ts)
+                        date_str = dt.strftime("%Y-%m-%d")
+                        time_str = dt.strftime("%H:%M:%S")
+                        tree.insert("", "end", values=(date_str, time_str, typ, mins, timer))
+                    except (TypeError, ValueError) as e:
+                        print(f"History row with unreadable timestamp: {e}")
+                        tree.insert("", "end", values=(ts, "", typ, mins, timer))
+                else:
+                    tree.insert("", "end", values=("Unknown", "", typ, mins, timer))
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 0.9 and not paging['done'] and not paging['pending']:
+                paging['pending'] = True
+                load_page()
+
+        tree.configure(yscrollcommand=on_scroll)
+        load_page()
         
         tree.pack(fill="both", expand=True)
 
+        # Export filters (dates are YYYY-MM-DD, inclusive; blank means open-ended)
+        filter_frame = ttk.Frame(dlg)
+        filter_frame.pack(fill='x', padx=10, pady=(0, 2))
+        export_from = tk.StringVar()
+        export_to = tk.StringVar()
+        export_kind = tk.StringVar(value='All')
+        ttk.Label(filter_frame, text='Export from').pack(side='left')
+        ttk.Entry(filter_frame, textvariable=export_from, width=11).pack(side='left', padx=(4, 8))
+        ttk.Label(filter_frame, text='to').pack(side='left')
+        ttk.Entry(filter_frame, textvariable=export_to, width=11).pack(side='left', padx=(4, 8))
+        ttk.Combobox(filter_frame, textvariable=export_kind, values=('All', 'focus', 'break'), width=7, state='readonly').pack(side='left')
+
         # Buttons
         btn_frame = ttk.Frame(dlg)
         btn_frame.pack(fill='x', pady=(6,0))
-        ttk.Button(btn_frame, text='Export', command=self.export_history).pack(side='left', padx=6)
+        export_progress = ttk.Progressbar(btn_frame, length=140, mode='determinate', maximum=1.0)
+        export_cancel = ttk.Button(btn_frame, text='Cancel export', state='disabled')
+        export_btn = ttk.Button(btn_frame, text='Export', command=lambda: self.export_history(
+            export_from.get(), export_to.get(), export_kind.get(), export_progress, export_cancel))
+        export_btn.pack(side='left', padx=6)
         ttk.Button(btn_frame, text='Clear', command=self.clear_history).pack(side='left', padx=6)
+        export_progress.pack(side='left', padx=6)
+        export_cancel.pack(side='left', padx=6)
         ttk.Button(btn_frame, text='Close', command=dlg.destroy).pack(side='right', padx=6)
 
-    def export_history(self):
-        hist = self.load_history()
-        if not hist:
+    def run_background(self, name, work, done, interval=50):
+        """Run work() on a worker thread, then call done(result, error) on the Tk thread.
+
+        The worker only fills in a shared dict; an `after` poll hands the result
+        back, so Tk is never touched off the main thread.
+        """
+        job = {'done': False, 'result': None, 'error': None}
+
+        def run():
+            try:
+                job['result'] = work()
+            except Exception as e:
+                job['error'] = e
+            job['done'] = True
+
+        def poll():
+            if not job['done']:
+                self.after(interval, poll)
+                return
+            done(job['result'], job['error'])
+
+        threading.Thread(target=run, daemon=True, name=name).start()
+        self.after(interval, poll)
+
+    def export_history(self, start='', end='', kind='All', progress_bar=None, cancel_btn=None):
+        """Export history on a worker thread; the Tk side only polls its progress"""
+        if self._export is not None:
+            messagebox.showinfo('Export', 'An export is already running')
+            return
+        if self.history.is_empty():
             messagebox.showinfo('History', 'No history to export')
             return
-        path = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[('JSON files','*.json')])
+        try:
+            start = datetime.date.fromisoformat(start.strip()) if start.strip() else None
+            end = datetime.date.fromisoformat(end.strip()) if end.strip() else None
+        except ValueError:
+            messagebox.showerror('Export', 'Dates must be in YYYY-MM-DD format')
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.jsonl', filetypes=[
+            ('JSON Lines', '*.jsonl'), ('CSV', '*.csv'), ('JSON Lines (gzip)', '*.jsonl.gz'),
+            ('CSV (gzip)', '*.csv.gz'), ('JSON files', '*.json')])
         if not path:
             return
-        try:
-            with open(path, 'w') as f:
-                json.dump(hist, f, indent=2)
-            messagebox.showinfo('Export', 'History exported')
-        except Exception as e:
-            messagebox.showerror('Export', f'Failed to export: {e}')
+        kinds = None if kind in ('', 'All') else {kind}
+        job = {'cancel': threading.Event(), 'scanned': 0, 'total': 0, 'written': 0,
+               'done': False, 'error': None, 'bar': progress_bar, 'button': cancel_btn}
+        self._export = job
+
+        def progress(scanned, written):
+            job['scanned'], job['written'] = scanned, written
+
+        def work():
+            try:
+                self.writer.flush()
+                job['total'] = self.history.record_count()
+                history_export.export_entries(self.history.iter_entries(), path, start, end, kinds,
+                                              progress=progress, cancel=job['cancel'])
+            except Exception as e:
+                job['error'] = e
+            job['done'] = True
+
+        if cancel_btn is not None:
+            cancel_btn.configure(state='normal', command=job['cancel'].set)
+        threading.Thread(target=work, daemon=True, name='HistoryExport').start()
+        self.after(100, self._poll_export)
+
+    def _poll_export(self):
+        job = self._export
+        bar = job['bar']
+        if bar is not None and bar.winfo_exists() and job['total']:
+            bar['value'] = min(1.0, job['scanned'] / job['total'])
+        if not job['done']:
+            self.after(100, self._poll_export)
+            return
+        self._export = None
+        if bar is not None and bar.winfo_exists():
+            bar['value'] = 0
+        if job['button'] is not None and job['button'].winfo_exists():
+            job['button'].configure(state='disabled')
+        if isinstance(job['error'], history_export.ExportCancelled):
+            messagebox.showinfo('Export', 'Export cancelled')
+        elif job['error'] is not None:
+            messagebox.showerror('Export', f"Failed to export: {job['error']}")
+        else:
+            messagebox.showinfo('Export', f"Exported {job['written']} sessions")
 
     def clear_history(self):
         if messagebox.askyesno('Clear History', 'Are you sure you want to clear history?'):
             try:
-                if os.path.exists(HISTORY_FILE):
-                    os.remove(HISTORY_FILE)
+                self.writer.flush()  # don't let queued appends land after the clear
+                self.history.clear()
                 messagebox.showinfo('History', 'Cleared')
             except Exception as e:
                 messagebox.showerror('History', f'Failed to clear: {e}')
 
+    # --- Timer ---
+    @property
+    def is_running(self):
+        return self.timer.is_running
+
+    @property
+    def is_focus(self):
+        return self.timer.is_focus
+
+    @property
+    def remaining(self):
+        return self.timer.remaining
+
+    def sync_timer_settings(self):
+        """Push the spinbox/checkbox values into the timer core"""
+        if self._loading_timer:
+            return  # the inputs are being filled from the timer, not edited
+        try:
+            self.timer.focus_seconds = int(self.focus_minutes.get()) * 60
+            self.timer.break_seconds = int(self.break_minutes.get()) * 60
+            self.timer.auto_repeat = bool(self.auto_repeat.get())
+        except (tk.TclError, ValueError):
+            pass  # spinbox mid-edit; keep the previous values
+
     def start_pause(self):
         if not self.is_running:
-            if self.is_focus:
-                minutes = int(self.focus_minutes.get())
-            else:
-                minutes = int(self.break_minutes.get())
-            self.session_total_seconds = minutes * 60
-            if self.remaining <= 0 or self.remaining > self.session_total_seconds:
-                self.remaining = self.session_total_seconds
-            self.is_running = True
+            self.sync_timer_settings()
+            self.engine.start(self.timer_name)
             self.start_btn.config(text='⏸ Pause')
             self.status_label.config(text='Running — press Space to pause')
-            self.tick()
+            self._reschedule_tick()
         else:
-            self.is_running = False
+            self.engine.pause(self.timer_name)
             self.start_btn.config(text='▶ Start')
             self.status_label.config(text='Paused — press Space to resume')
-            if self._timer_job:
-                self.after_cancel(self._timer_job)
-                self._timer_job = None
+            self._reschedule_tick()  # other timers may still be running
+            self.update_display(self.remaining)
             self.update_progress_ring(self.current_progress_ratio())
+            self.update_tray_progress()
 
     def reset(self):
-        self.is_running = False
-        if self._timer_job:
-            self.after_cancel(self._timer_job)
-            self._timer_job = None
+        self.engine.reset(self.timer_name)
+        self._reschedule_tick()
         self.stop_pulse()
-        self.is_focus = True
-        self.remaining = 0
-        self.session_total_seconds = 0
         self.start_btn.config(text='▶ Start')
-        self.mode_label.config(text='Ready')
+        self.frames.config(self.mode_label, text='Ready')
         self.update_display(0)
         self.draw_ring_base()
         self.update_progress_ring(0.0)
         self.status_label.config(text='Reset')
+        self.update_tray_progress()
+
+    def select_timer(self, name):
+        """Show `name` on the ring; the previous timer keeps running at deadline cadence"""
+        if name == self.timer_name or name not in self.engine:
+            return
+        self.engine.watch(self.timer_name, False)
+        self.timer_name = name
+        self.timer = self.engine.get(name)
+        if not self.in_tray:
+            self.engine.watch(name)
+        self.timer_var.set(name)
+        self.load_timer_settings()
+        self.stop_pulse()
+        self.draw_ring_base()
+        if self.timer.session_total_seconds:
+            self.frames.config(self.mode_label, text='Focus' if self.is_focus else 'Break')
+        else:
+            self.frames.config(self.mode_label, text='Ready')
+        self.start_btn.config(text='⏸ Pause' if self.is_running else '▶ Start')
+        self.status_label.config(text=f'Showing {name}')
+        self.update_display(self.remaining)
+        self.update_progress_ring(self.current_progress_ratio())
+        self._tray_frame_key = None
+        self._reschedule_tick()
+
+    def load_timer_settings(self):
+        """Show the current timer's durations in the inputs"""
+        # Each set() fires the traces; syncing then would copy the inputs not
+        # yet loaded (the previous timer's) into this one.
+        self._loading_timer = True
+        try:
+            self.focus_minutes.set(self.timer.focus_seconds // 60)
+            self.break_minutes.set(self.timer.break_seconds // 60)
+            self.auto_repeat.set(self.timer.auto_repeat)
+        finally:
+            self._loading_timer = False
+
+    def add_timer(self, name, focus_minutes=25, break_minutes=5, auto_repeat=True):
+        self.engine.add(name, int(focus_minutes) * 60, int(break_minutes) * 60, bool(auto_repeat))
+        if hasattr(self, 'timer_box'):
+            self.timer_box.configure(values=self.engine.names())
+            self.publish_status()
+
+    def add_timer_dialog(self):
+        name = simpledialog.askstring('New timer', 'Timer name:', parent=self)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if name in self.engine:
+            messagebox.showinfo('Timers', f'A timer named {name!r} already exists')
+            return
+        # New timers start from the durations currently in the inputs
+        self.add_timer(name, self.focus_minutes.get(), self.break_minutes.get(), self.auto_repeat.get())
+        self.select_timer(name)
 
     def on_closing(self):
         """Handle window close event"""
@@ -586,6 +849,7 @@ class PomodoroApp(tk.Tk):
             self.withdraw()
             self.in_tray = True
             self.status_label.config(text='Minimized to tray')
+            self.enter_low_power()
             print("Successfully minimized to system tray")
         except Exception as e:
             print(f"Error hiding to tray: {e}")
@@ -608,29 +872,86 @@ class PomodoroApp(tk.Tk):
                 self.focus_force()
             except Exception:
                 pass
+        if not self.in_tray:
+            self.exit_low_power()
+
+    def enter_low_power(self):
+        """Suspend the main window's rendering while hidden; the timer then wakes only at its deadline"""
+        if self._low_power_since is not None:
+            return
+        self._low_power_since = time.monotonic()
+        self._low_power_wakeups = 0
+        self.stop_pulse()
+        self.frames.suspend()
+        self.engine.watch(self.timer_name, False)
+        self.after(0, self._reschedule_tick)
+
+    def exit_low_power(self):
+        if self._low_power_since is None:
+            return
+        minutes = (time.monotonic() - self._low_power_since) / 60
+        self._low_power_since = None
+        print(f"Tray mode: {self._low_power_wakeups} wakeups in {minutes:.1f} min "
+              f"({self._low_power_wakeups / max(minutes, 1 / 60):.2f}/min)")
+        self.frames.resume()
+        # Redraw once from the current state, then go back to per-second ticks
+        if self.timer.session_total_seconds:
+            self.frames.config(self.mode_label, text='Focus' if self.is_focus else 'Break')
+        self.update_display(self.remaining)
+        self.update_progress_ring(self.current_progress_ratio())
+        self.engine.watch(self.timer_name)
+        self.after(0, self._reschedule_tick)
+
+    def _reschedule_tick(self):
+        # Drop the pending wakeup and tick now, which polls and schedules the next one
+        if self._timer_job:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+        self.tick()
+
+    def _on_first_map(self, event):
+        if event.widget is not self or self._tray_started:
+            return
+        self._tray_started = True
+        threading.Thread(target=self._load_tray_in_background, args=(self.tray_colors(), self.icon_theme()),
+                         daemon=True, name="TrayLoader").start()
+
+    def _load_tray_in_background(self, colors, theme):
+        # Heavy imports, the app icon and the progress frame cache are built
+        # here; the icon itself is created on the Tk thread
+        if load_tray_backend():
+            app_icon_png(64, theme)
+            self.after(0, self._create_tray_if_missing)
+            self._prepare_tray_frames(colors)
+
+    def _create_tray_if_missing(self):
+        if self.tray_icon is None:
+            self.create_tray_icon()
 
     def create_tray_icon(self):
         """Create a system tray icon for the application"""
-        if not HAS_TRAY or not HAS_PIL:
+        if not load_tray_backend():
             print("System tray support is not available")
             return False
             
         try:
-            # Stop any existing tray icon
-            if hasattr(self, 'tray_icon') and self.tray_icon is not None:
-                try:
-                    self.tray_icon.stop()
-                    # Give it a moment to clean up
-                    import time
-                    time.sleep(0.5)
-                except Exception as e:
-                    print(f"Error stopping existing tray icon: {e}")
-            
-            # Create a simple icon image
-            img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-            d = ImageDraw.Draw(img)
-            d.ellipse((8, 8, 56, 56), fill='#1f6feb')
-            d.rectangle((26, 20, 38, 44), fill='#fff')
+            # An existing icon is stopped on a worker thread; the new one is
+            # created once that returns, so the Tk thread never waits
+            if self.tray_icon is not None:
+                old, self.tray_icon = self.tray_icon, None
+
+                def stop_old():
+                    try:
+                        old.stop()
+                    except Exception as e:
+                        print(f"Error stopping existing tray icon: {e}")
+                    self.after(0, self._create_tray_if_missing)
+                threading.Thread(target=stop_old, daemon=True, name="TrayStop").start()
+                return True
+
+            # The app icon comes from the shared on-disk cache (icons.py)
+            img = app_icon(64, self.icon_theme())
+            self._tray_frame_key = None
             
             # Define callback functions
             def on_show_window(icon, item):
@@ -682,63 +1003,166 @@ class PomodoroApp(tk.Tk):
             return False
 
     def tick(self):
-        self.mode_label.config(text='Focus' if self.is_focus else 'Break')
-        if not self.is_running:
+        self._timer_job = None
+        if self.in_tray:
+            self._low_power_wakeups += 1
+        # One wakeup for every timer: the engine polls whichever are due
+        delay = self.engine.poll()
+        if delay is not None:
+            if self.in_tray and self.tray_icon is not None and self.is_running:
+                delay = min(delay, self._seconds_to_next_tray_step())
+            self._timer_job = self.after(max(1, int(delay * 1000) + 1), self.tick)
+        self.update_tray_progress()
+        self.publish_status()
+
+    # --- Tray progress ---
+    def update_tray_progress(self):
+        """Swap the tray image when the visible progress step or phase changes"""
+        if self.tray_icon is None:
             return
-        if self.remaining <= 0:
-            play_sound()
-            if self.is_focus:
-                try:
-                    self.append_history('focus', int(self.focus_minutes.get()), datetime.datetime.now(datetime.timezone.utc).isoformat())
-                except Exception:
-                    pass
-                if self.in_tray:
-                    self.restore_from_tray()
-                    self.show_stretch_popup()
-                    self.after(25000, lambda: self.hide_to_tray())
-                else:
-                    self.show_stretch_popup()
-            title = 'Focus session complete' if self.is_focus else 'Break finished'
-            message = 'Time for a break!' if self.is_focus else 'Back to focus!'
-            notify(title, message)
-            self.is_focus = not self.is_focus
-            self.draw_ring_base()
-            if self.is_focus:
-                minutes = int(self.focus_minutes.get())
+        if self.timer.session_total_seconds <= 0:
+            key = ('idle', self.icon_theme())
+        else:
+            step = self.tray_frames.step_for(self.timer.elapsed() / self.timer.session_total_seconds)
+            p = self.palette()
+            key = (self.current_accent(), p['ring_bg'], step)
+        if key == self._tray_frame_key:
+            return
+        try:
+            image = None if key[0] == 'idle' else self.tray_frames.frame(key[2], key[0], key[1])
+            if image is None and key[0] != 'idle':
+                # Frames for these colours are not rendered yet: show the app icon
+                # and render them on a worker, which calls back here when done
+                threading.Thread(target=self._prepare_tray_frames, args=([key[:2]],), daemon=True,
+                                 name="TrayFrames").start()
+                key = ('idle', self.icon_theme())
+                if key == self._tray_frame_key:
+                    return
+            self.tray_icon.icon = image if image is not None else app_icon(64, key[1])
+            self._tray_frame_key = key
+        except Exception as e:
+            print(f"Failed to update tray icon: {e}")
+
+    def tray_colors(self):
+        """(fill, track) colour pairs for focus and break frames in the current theme"""
+        p = self.palette()
+        return [(p['accent'], p['ring_bg']), (p['break_accent'], p['ring_bg'])]
+
+    def _prepare_tray_frames(self, colors):
+        # Runs on a worker thread; palette colours are read on the Tk thread beforehand.
+        # Only the thread that rendered calls back, so a duplicate request cannot loop.
+        rendered = [self.tray_frames.prepare(color, track) for color, track in colors]
+        if any(rendered):
+            self.after(0, self.update_tray_progress)
+
+    def _seconds_to_next_tray_step(self):
+        total = self.timer.session_total_seconds
+        if total <= 0:
+            return 1.0
+        step_len = total / self.tray_frames.steps
+        elapsed = self.timer.elapsed()
+        return max(0.05, step_len - (elapsed % step_len))
+
+    def on_timer_tick(self, name, remaining):
+        if self.in_tray or name != self.timer_name:
+            return
+        self.frames.config(self.mode_label, text='Focus' if self.is_focus else 'Break')
+        self.update_display(remaining)
+        self.update_progress_ring(self.current_progress_ratio())
+
+    def on_session_complete(self, name, kind, minutes, drift):
+        avg = drift['late_total'] / drift['wakeups'] if drift['wakeups'] else 0.0
+        print(f"[{name}] {kind.capitalize()} session drift: ended {drift['end_late'] * 1000:.0f} ms "
+              f"after deadline; {drift['wakeups']} wakeups, avg late {avg * 1000:.1f} ms, "
+              f"max {drift['late_max'] * 1000:.1f} ms, cumulative {drift['late_total'] * 1000:.0f} ms")
+        self.notifier.sound()
+        try:
+            # Breaks are recorded too, for the focus:break ratios; the stats count focus only
+            self.append_history(kind, minutes, datetime.datetime.now(datetime.timezone.utc).isoformat(), name)
+        except Exception:
+            pass
+        if kind == 'focus' and name == self.timer_name:
+            # Only the timer on screen gets the stretch popup; others just notify
+            if self.in_tray:
+                self.restore_from_tray()
+                self.show_stretch_popup()
+                self.after(25000, lambda: self.hide_to_tray())
             else:
-                minutes = int(self.break_minutes.get())
-            self.session_total_seconds = minutes * 60
-            self.remaining = self.session_total_seconds
-            if not self.auto_repeat.get() and not self.is_focus:
-                self.is_running = False
-                self.start_btn.config(text='▶ Start')
-                self.status_label.config(text='Cycle complete')
-                self.update_display(self.remaining)
-                self.update_progress_ring(0.0)
-                return
+                self.show_stretch_popup()
+        title = 'Focus session complete' if kind == 'focus' else 'Break finished'
+        message = 'Time for a break!' if kind == 'focus' else 'Back to focus!'
+        if len(self.engine) > 1:
+            title = f'{name}: {title}'
+        self.notifier.notify(title, message)
+
+    def on_phase_change(self, name, is_focus):
+        if name == self.timer_name:
+            self.draw_ring_base()
 
+    def on_cycle_complete(self, name):
+        if name != self.timer_name:
+            self.status_label.config(text=f'{name}: cycle complete')
+            return
+        self.frames.config(self.mode_label, text='Break')
+        self.start_btn.config(text='▶ Start')
+        self.status_label.config(text='Cycle complete')
         self.update_display(self.remaining)
-        self.update_progress_ring(self.current_progress_ratio())
-        self.remaining -= 1
-        self._timer_job = self.after(1000, self.tick)
+        self.update_progress_ring(0.0)
 
     def update_display(self, seconds):
         mins, secs = divmod(int(seconds), 60)
-        self.time_label.config(text=f'{mins:02d}:{secs:02d}', foreground=self.current_accent())
+        self.frames.config(self.time_label, text=f'{mins:02d}:{secs:02d}', foreground=self.current_accent())
 
     def save_settings(self):
+        self.sync_timer_settings()
+        # The top-level durations are the default timer's, whichever is on screen
+        default = self.engine.get(DEFAULT_TIMER)
         data = {
-            'focus_minutes': int(self.focus_minutes.get()),
-            'break_minutes': int(self.break_minutes.get()),
-            'auto_repeat': bool(self.auto_repeat.get())
+            'focus_minutes': default.focus_seconds // 60,
+            'break_minutes': default.break_seconds // 60,
+            'auto_repeat': default.auto_repeat,
+            'history_backend': self.history_backend,
+            'timers': [{'name': name, 'focus_minutes': core.focus_seconds // 60,
+                        'break_minutes': core.break_seconds // 60, 'auto_repeat': core.auto_repeat}
+                       for name, core in self.engine.timers.items() if name != DEFAULT_TIMER],
         }
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(data, f)
+            self.writer.replace('config', lambda: atomic_write_json(CONFIG_FILE, data))
             self.status_label.config(text='Settings saved')
         except Exception as e:
             self.status_label.config(text=f'Error saving settings: {e}')
 
+    def show_toast(self, title, message, duration_ms=6000):
+        """Non-modal notification in the bottom-right corner of the screen; click to dismiss"""
+        try:
+            p = self.palette()
+            toast = tk.Toplevel(self)
+            toast.overrideredirect(True)
+            toast.attributes('-topmost', True)
+            toast.configure(bg=p['card'], highlightthickness=1, highlightbackground=p['accent'])
+            tk.Label(toast, text=title, font=('Segoe UI', 11, 'bold'), fg=p['accent'], bg=p['card'],
+                     anchor='w').pack(fill='x', padx=14, pady=(10, 0))
+            tk.Label(toast, text=message, font=('Segoe UI', 10), fg=p['fg'], bg=p['card'], anchor='w',
+                     justify='left', wraplength=300).pack(fill='x', padx=14, pady=(2, 10))
+
+            def dismiss(event=None):
+                if toast in self._toasts:
+                    self._toasts.remove(toast)
+                    toast.destroy()
+
+            for widget in (toast, *toast.winfo_children()):
+                widget.bind('<Button-1>', dismiss)
+            self.after(duration_ms, dismiss)
+
+            # Stack above any toasts already showing
+            toast.update_idletasks()
+            y = self.winfo_screenheight() - 60 - sum(t.winfo_height() + 8 for t in self._toasts)
+            toast.geometry(f'+{self.winfo_screenwidth() - toast.winfo_reqwidth() - 24}+{y - toast.winfo_reqheight()}')
+            self._toasts.append(toast)
+            return toast
+        except Exception as e:
+            print(f"Error showing notification: {e}")
+
     def show_stretch_popup(self):
         try:
             popup = tk.Toplevel(self)
@@ -752,72 +1176,64 @@ class PomodoroApp(tk.Tk):
             popup.configure(bg=p['card'])
 
             # Futuristic animated header
-            header_var = tk.StringVar(value='Break Time — Recharge!')
-            header = tk.Label(popup, textvariable=header_var, font=('Segoe UI', 15, 'bold'), fg=p['accent'], bg=p['card'])
+            header = tk.Label(popup, text='Break Time — Recharge!', font=('Segoe UI', 15, 'bold'), fg=p['accent'], bg=p['card'])
             header.pack(pady=(12, 2))
 
-            # Neon/gradient stick figure animation
+            # Neon/gradient stick figure animation. Items are created once and
+            # only the arms move, via coords(), on each frame.
             canvas = tk.Canvas(popup, width=340, height=140, bg=p['card'], highlightthickness=0)
             canvas.pack(pady=4)
             cx, cy = 170, 50
             # Neon colors
             neon = p['accent']
             neon2 = p['break_accent']
-            # Draw stick figure with glow
-            def draw_figure(offset=0, glow=8):
-                # Glow effect: draw multiple lines/ovals with increasing alpha
-                for g in range(glow, 0, -2):
-                    alpha = int(30 + 20 * g)
-                    color = neon if g % 2 == 0 else neon2
-                    # Head
-                    canvas.create_oval(cx-14-g, cy-14-g, cx+14+g, cy+14+g, outline=color, width=2)
-                # Main figure
-                canvas.create_oval(cx-12, cy-12, cx+12, cy+12, fill='#ffe0b2', outline=neon, width=3)
-                canvas.create_line(cx, cy+12, cx, cy+48, width=5, fill=neon)
-                canvas.create_line(cx, cy+6, cx-30, cy+20-offset, width=5, fill=neon2)
-                canvas.create_line(cx, cy+6, cx+30, cy+20-offset, width=5, fill=neon2)
-                canvas.create_line(cx, cy+48, cx-20, cy+86, width=5, fill=neon)
-                canvas.create_line(cx, cy+48, cx+20, cy+86, width=5, fill=neon)
+            # Glow effect: concentric head outlines
+            for g in range(8, 0, -2):
+                color = neon if g % 2 == 0 else neon2
+                canvas.create_oval(cx-14-g, cy-14-g, cx+14+g, cy+14+g, outline=color, width=2)
+            # Main figure
+            canvas.create_oval(cx-12, cy-12, cx+12, cy+12, fill='#ffe0b2', outline=neon, width=3)
+            canvas.create_line(cx, cy+12, cx, cy+48, width=5, fill=neon)
+            left_arm = canvas.create_line(cx, cy+6, cx-30, cy+20, width=5, fill=neon2)
+            right_arm = canvas.create_line(cx, cy+6, cx+30, cy+20, width=5, fill=neon2)
+            canvas.create_line(cx, cy+48, cx-20, cy+86, width=5, fill=neon)
+            canvas.create_line(cx, cy+48, cx+20, cy+86, width=5, fill=neon)
 
             # Countdown and progress
-            countdown_var = tk.IntVar(value=20)
             countdown_lbl = tk.Label(popup, text='20s', font=('Segoe UI', 13, 'bold'), fg=p['accent2'], bg=p['card'])
             countdown_lbl.pack()
             progress = ttk.Progressbar(popup, length=320, mode='determinate', maximum=20)
             progress.pack(pady=(6, 8))
 
-            # Animate header text (futuristic pulse)
-            def animate_header():
-                t = countdown_var.get()
-                dots = '.' * ((20-t)%4)
-                header_var.set(f'Break Time — Recharge{dots}')
-                popup.after(350, animate_header)
-
-            # Animate stick figure
-            anim_state = {'t': 0}
-            def animate_frame():
-                t = anim_state['t']
-                frac = (t % 12) / 12
-                swing = 30
-                offset = int((1 - abs(2*frac-1)) * swing)
-                canvas.delete('all')
-                draw_figure(offset=offset, glow=8)
-                anim_state['t'] += 1
-                popup.after(100, animate_frame)
-
-            def countdown_step():
-                s = countdown_var.get()
-                countdown_lbl.config(text=f'{s}s')
-                progress['value'] = 20 - s
-                if s <= 0:
-                    popup.destroy()
-                    return
-                countdown_var.set(s-1)
-                popup.after(1000, countdown_step)
-
-            animate_header()
-            animate_frame()
-            countdown_step()
+            # One 100 ms animation on the shared frame scheduler drives the arms,
+            # the header dots and the countdown; it is removed when the popup goes.
+            anim_name = f'stretch{popup}'
+            state = {'frame': 0}
+
+            def step():
+                frame = state['frame']
+                frac = (frame % 12) / 12
+                offset = int((1 - abs(2*frac-1)) * 30)
+                self.frames.coords(canvas, left_arm, cx, cy+6, cx-30, cy+20-offset)
+                self.frames.coords(canvas, right_arm, cx, cy+6, cx+30, cy+20-offset)
+                if frame % 10 == 0:
+                    s = 20 - frame // 10
+                    self.frames.config(countdown_lbl, text=f'{s}s')
+                    self.frames.config(progress, value=20 - s)
+                    if s <= 0:
+                        popup.destroy()
+                        return False
+                    self.frames.config(header, text=f"Break Time — Recharge{'.' * ((20-s) % 4)}")
+                state['frame'] += 1
+
+            def on_destroy(event):
+                if event.widget is popup:
+                    self.frames.remove_animation(anim_name)
+                    self.frames.forget(popup)
+
+            popup.bind('<Destroy>', on_destroy)
+            step()
+            self.frames.add_animation(anim_name, 100, step, owner=popup)  # runs on while the app is in the tray
 
             # Center popup over main window
             try:
@@ -826,25 +1242,165 @@ class PomodoroApp(tk.Tk):
                 popup.geometry(f'+{self_center_x-200}+{self_center_y-130}')
             except Exception:
                 pass
+            return popup
         except Exception:
-            pass
+            return None
 
     def load_settings(self):
         if not os.path.exists(CONFIG_FILE):
             return
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                data = json.load(f)
+            data = load_json_file(CONFIG_FILE, default={}, salvage=salvage_json_pairs)
             self.focus_minutes.set(data.get('focus_minutes', self.focus_minutes.get()))
             self.break_minutes.set(data.get('break_minutes', self.break_minutes.get()))
             self.auto_repeat.set(data.get('auto_repeat', self.auto_repeat.get()))
+            self.history_backend = data.get('history_backend', self.history_backend)
+            for timer in data.get('timers', []):
+                if timer.get('name') and timer['name'] not in self.engine:
+                    self.add_timer(timer['name'], timer.get('focus_minutes', 25),
+                                   timer.get('break_minutes', 5), timer.get('auto_repeat', True))
         except Exception:
             pass
 
+    # --- Control API ---
+    def start_control_api(self):
+        self.control = control_api.ControlServer(self.commands, lambda: self.status_snapshot,
+                                                 offload={'history': self.query_history})
+        self.control.start()
+
+    def publish_status(self):
+        """Snapshot timer state for the control API; replaced whole, so other threads can read it"""
+        timers = []
+        for name, core in self.engine.timers.items():
+            timers.append({
+                'name': name,
+                'running': core.is_running,
+                'phase': ('focus' if core.is_focus else 'break') if core.session_total_seconds else 'idle',
+                'remaining': core.remaining,
+                'deadline': core.deadline,
+                'focus_minutes': core.focus_seconds // 60,
+                'break_minutes': core.break_seconds // 60,
+                'auto_repeat': core.auto_repeat,
+            })
+        self.status_snapshot = {'current': self.timer_name, 'in_tray': self.in_tray, 'timers': timers}
+
+    def handle_control(self, request):
+        """Run one queued command on the Tk thread; returns the response fields"""
+        cmd = request.get('cmd')
+        if cmd == 'toast':
+            self.show_toast(request['title'], request['message'])
+            return {}
+        if cmd == 'show':
+            self.restore_from_tray()
+            return {}
+        name = request.get('timer') or self.timer_name
+        if name not in self.engine:
+            raise ValueError(f'no timer named {name!r}')
+        running = self.engine.get(name).is_running
+        if cmd == 'reset':
+            if name == self.timer_name:
+                self.reset()
+            else:
+                self.engine.reset(name)
+                self._reschedule_tick()
+        elif cmd == 'toggle' or (cmd == 'start' and not running) or (cmd == 'pause' and running):
+            if name == self.timer_name:
+                self.start_pause()
+            elif running:
+                self.engine.pause(name)
+                self._reschedule_tick()
+            else:
+                self.engine.start(name)
+                self._reschedule_tick()
+        self.publish_status()
+        return {'timer': name, 'running': self.engine.get(name).is_running}
+
+    def query_history(self, request):
+        """Newest sessions plus a focus minutes/sessions summary for an optional date range.
+
+        Runs on a control API worker thread, never on Tk: it only reads the store.
+        """
+        limit = max(1, min(int(request.get('limit') or 20), 1000))
+        start = datetime.date.fromisoformat(request['from']) if request.get('from') else None
+        end = datetime.date.fromisoformat(request['to']) if request.get('to') else None
+        self.writer.flush(timeout=1.0)
+        entries, _ = self.history.read_page_reverse(None, limit)
+        minutes, sessions = self.history.summarize(
+            day_epoch(start) if start else None,
+            day_epoch(end + datetime.timedelta(days=1)) if end else None)
+        return {'entries': entries, 'minutes': minutes, 'sessions': sessions}
+
+    def enable_instrumentation(self, instr):
+        """Time the hot callbacks and record tick jitter (see instrumentation.py)"""
+        for name in ('tick', 'update_progress_ring', 'append_history', 'show_history'):
+            instr.wrap(self, name)
+        instr.wrap(self.history, 'append_many', 'history write')
+        instr.wrap(history_chart, 'render_png', 'chart render')
+        instr.wrap_animations(self.frames)
+        self.engine.subscribe('wakeup', lambda name, late: instr.record_wakeup(late))
+
+    def open_history(self):
+        """Open the configured history backend: the JSON journal (default) or SQLite"""
+        if self.history_backend == 'sqlite':
+            try:
+                from sqlite_history import SQLiteHistoryStore, read_json_history
+                store = SQLiteHistoryStore(HISTORY_DB_FILE)
+                if store.created:
+                    # First switch to SQLite: bring the existing history along. If
+                    # that fails, drop the new db so the next start imports again.
+                    source = HISTORY_FILE if os.path.exists(HISTORY_FILE) else LEGACY_HISTORY_FILE
+                    if os.path.exists(source):
+                        try:
+                            count = store.import_entries(read_json_history(source))
+                        except Exception:
+                            store.remove()
+                            raise
+                        print(f"Imported {count} sessions from {source}")
+                return store
+            except Exception as e:
+                print(f"SQLite history unavailable, using JSON: {e}")
+        return HistoryStore(HISTORY_FILE, LEGACY_HISTORY_FILE)
+
+
+def env_flag(name):
+    """True when environment variable `name` is set to 1/true/yes/on (any case)"""
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Pomodoro focus timer')
+    parser.add_argument('--profile', action='store_true', default=env_flag('POMODORO_PROFILE'),
+                        help='record callback latency and tick jitter; print a summary on exit')
+    parser.add_argument('--profile-out', metavar='FILE', default=os.environ.get('POMODORO_PROFILE_OUT'),
+                        help='also write cProfile stats for the session to FILE (implies --profile)')
+    single_instance.add_launch_arguments(parser)
+    args, _ = parser.parse_known_args(argv)
+    return args
+
 
 def main():
-    app = PomodoroApp()
+    args = parse_args(sys.argv[1:])
+    instr = None
+    if args.profile or args.profile_out:
+        from instrumentation import Instrumentation
+        instr = Instrumentation(args.profile_out)
+        instr.start_profiler()
+    app = PomodoroApp(instrumentation=instr)
+    request = single_instance.launch_request(args)
+    if request['cmd'] != 'show':
+        def run_launch_request():
+            try:
+                app.handle_control(request)
+            except Exception as e:
+                print(f"Ignoring --{request['cmd']}: {e}")
+        app.after_idle(run_launch_request)
     app.mainloop()
+    if app.control is not None:
+        app.control.stop()
+    app.writer.close()
+    app.notifier.close()
+    if instr is not None:
+        instr.finish()
 
 
 if __name__ == '__main__':
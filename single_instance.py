@@ -0,0 +1,93 @@
+"""One app instance per user; later launches hand their request to it.
+
+pomodoro.py calls acquire_or_forward() before importing Tk. The first launch
+takes an exclusive lock on a per-user lock file and carries on starting up.
+A later launch fails to take the lock, so it sends its request ("show" by
+default, or --start/--pause/--toggle/--reset) over the control API
+(control_api.py) and exits. It imports only the standard library, so the
+hand-off takes milliseconds. The OS drops the lock when the first instance
+exits, including after a crash, so a stale lock file never blocks a launch.
+
+    python pomodoro.py                  # starts, or brings the running window back
+    python pomodoro.py --start --timer Reading
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import control_api
+
+FORWARD_WAIT = 3.0  # the first instance may still be starting its server
+
+
+def add_launch_arguments(parser):
+    group = parser.add_mutually_exclusive_group()
+    for cmd in ('start', 'pause', 'toggle', 'reset', 'show'):
+        group.add_argument(f'--{cmd}', dest='action', action='store_const', const=cmd,
+                           help=f'{cmd} a timer (forwarded to the running instance)' if cmd != 'show'
+                           else 'bring the running instance back from the tray (the default)')
+    parser.add_argument('--timer', metavar='NAME', help='timer for --start/--pause/--toggle/--reset')
+
+
+def launch_request(args):
+    request = {'cmd': args.action or 'show'}
+    if args.timer and request['cmd'] != 'show':
+        request['timer'] = args.timer
+    return request
+
+
+def lock_path():
+    return control_api.endpoint_path() + '.lock'
+
+
+def acquire(path=None):
+    """Take the instance lock; returns its file descriptor, or None if another instance holds it"""
+    fd = os.open(path or lock_path(), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if sys.platform == 'win32':
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def forward(request, wait=FORWARD_WAIT):
+    """Send `request` to the running instance, retrying while its server comes up"""
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            return control_api.send(request)
+        except (OSError, ValueError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+def acquire_or_forward(argv):
+    """Return the lock for the first instance; forward the launch request and exit otherwise"""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_launch_arguments(parser)
+    args, _ = parser.parse_known_args(argv)
+    try:
+        lock = acquire()
+    except OSError as e:
+        print(f"Single-instance check skipped: {e}")
+        return None
+    if lock is not None:
+        return lock
+    try:
+        response = forward(launch_request(args))
+    except (OSError, ValueError) as e:
+        print(f"Pomodoro is already running but did not answer ({e})")
+        sys.exit(1)
+    if not response.get('ok'):
+        print(f"Pomodoro: {response.get('error')}")
+        sys.exit(1)
+    sys.exit(0)
@@ -0,0 +1,205 @@
+"""SQLite history backend.
+
+An alternative to the JSON journal for installs with many years of
+sessions. It has the same interface as history_store.HistoryStore. Aggregates
+for the stats dialog are computed in SQL (GROUP BY date, indexed timestamp
+range scans). Enable it with "history_backend": "sqlite" in
+pomodoro_config.json.
+
+Import an existing history (legacy JSON array or JSONL journal):
+
+    python sqlite_history.py pomodoro_history.json pomodoro_history.db
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from history_store import entry_epoch
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER,
+    type TEXT NOT NULL,
+    minutes INTEGER NOT NULL,
+    ts_iso TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_ts ON sessions(ts);
+"""
+CORE_KEYS = ('type', 'minutes', 'ts', 'timestamp')
+
+
+def _row(entry):
+    extra = {k: v for k, v in entry.items() if k not in CORE_KEYS}
+    return (entry_epoch(entry), entry.get('type', ''), entry.get('minutes', 0) or 0,
+            entry.get('ts') or entry.get('timestamp'), json.dumps(extra) if extra else None)
+
+
+def _entry(type_, minutes, ts_iso, extra):
+    entry = {'type': type_, 'minutes': minutes, 'ts': ts_iso}
+    if extra:
+        entry.update(json.loads(extra))
+    return entry
+
+
+def read_json_history(path):
+    """Yield records from a legacy JSON array or a JSONL journal"""
+    with open(path, 'r') as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == '[':
+            entries = json.load(f)
+            yield from (e for e in entries if isinstance(e, dict))
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                yield entry
+
+
+class SQLiteHistoryStore:
+    def __init__(self, path):
+        self.path = path
+        self.created = not os.path.exists(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def append(self, entry):
+        with self._lock, self._db:
+            self._db.execute('INSERT INTO sessions (ts, type, minutes, ts_iso, extra) VALUES (?, ?, ?, ?, ?)', _row(entry))
+
+    def append_many(self, entries):
+        self._insert_many([_row(entry) for entry in entries])
+
+    def import_entries(self, entries, batch=10_000):
+        """Bulk-insert records in one transaction, so a failure imports none; returns how many were imported"""
+        count = 0
+        chunk = []
+        with self._lock, self._db:
+            for entry in entries:
+                chunk.append(_row(entry))
+                if len(chunk) >= batch:
+                    self._db.executemany('INSERT INTO sessions (ts, type, minutes, ts_iso, extra) VALUES (?, ?, ?, ?, ?)', chunk)
+                    count += len(chunk)
+                    chunk = []
+            if chunk:
+                self._db.executemany('INSERT INTO sessions (ts, type, minutes, ts_iso, extra) VALUES (?, ?, ?, ?, ?)', chunk)
+                count += len(chunk)
+        return count
+
+    def remove(self):
+        """Close and delete the database files"""
+        self.close()
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.remove(self.path + suffix)
+            except OSError:
+                pass
+
+    def _insert_many(self, rows):
+        with self._lock, self._db:
+            self._db.executemany('INSERT INTO sessions (ts, type, minutes, ts_iso, extra) VALUES (?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def iter_entries(self, chunk=5000):
+        last = 0
+        while True:
+            rows = self._query('SELECT id, type, minutes, ts_iso, extra FROM sessions WHERE id > ? ORDER BY id LIMIT ?', (last, chunk))
+            for row in rows:
+                yield _entry(*row[1:])
+            if len(rows) < chunk:
+                return
+            last = rows[-1][0]
+
+    def load(self):
+        try:
+            return list(self.iter_entries())
+        except Exception:
+            return []
+
+    def read_page_reverse(self, cursor=None, count=100):
+        """Newest-first page of records with id below `cursor`; same contract as HistoryStore"""
+        if cursor is None:
+            rows = self._query('SELECT id, type, minutes, ts_iso, extra FROM sessions ORDER BY id DESC LIMIT ?', (count,))
+        else:
+            rows = self._query('SELECT id, type, minutes, ts_iso, extra FROM sessions WHERE id < ? ORDER BY id DESC LIMIT ?', (cursor, count))
+        next_cursor = rows[-1][0] if len(rows) == count else 0
+        return [_entry(*row[1:]) for row in rows], next_cursor
+
+    def daily_totals(self):
+        rows = self._query("SELECT date(ts, 'unixepoch') AS day, SUM(minutes), COUNT(*) FROM sessions "
+                           "WHERE ts IS NOT NULL AND type = 'focus' GROUP BY day")
+        return {datetime.date.fromisoformat(day): (minutes, sessions) for day, minutes, sessions in rows}
+
+    def _where(self, start, end):
+        clauses, params = ['ts IS NOT NULL'], []
+        if start is not None:
+            clauses.append('ts >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('ts < ?')
+            params.append(end)
+        return ' AND '.join(clauses), params
+
+    def range(self, start=None, end=None):
+        where, params = self._where(start, end)
+        return [tuple(row) for row in self._query(f'SELECT ts, type, minutes FROM sessions WHERE {where} ORDER BY ts', params)]
+
+    def summarize(self, start=None, end=None):
+        where, params = self._where(start, end)
+        minutes, sessions = self._query(f"SELECT COALESCE(SUM(minutes), 0), COUNT(*) FROM sessions "
+                                        f"WHERE {where} AND type = 'focus'", params)[0]
+        return minutes, sessions
+
+    def session_count(self):
+        return self._query("SELECT COUNT(*) FROM sessions WHERE ts IS NOT NULL AND type = 'focus'")[0][0]
+
+    def record_count(self):
+        return self._query('SELECT COUNT(*) FROM sessions')[0][0]
+
+    def is_empty(self):
+        return not self._query('SELECT 1 FROM sessions LIMIT 1')
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM sessions')
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    source, target = argv
+    store = SQLiteHistoryStore(target)
+    count = store.import_entries(read_json_history(source))
+    store.close()
+    print(f"Imported {count} sessions from {source} into {target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,87 @@
+"""NumPy analytics: streaks, rolling averages, ratios and the weekday x hour profile."""
+
+import datetime
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+from history_store import HistoryStore
+from sqlite_history import SQLiteHistoryStore
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+TODAY = datetime.date(2026, 3, 10)  # a Tuesday
+
+
+def ended(day, hour, minute, kind='focus', minutes=25):
+    """A record written when a session ended at 2026-03-<day> hour:minute UTC"""
+    ts = datetime.datetime(2026, 3, day, hour, minute, tzinfo=datetime.timezone.utc)
+    return {'type': kind, 'minutes': minutes, 'ts': ts.isoformat()}
+
+
+# Focus per day from 03-03 to 03-10: 25, 50, 25, 0, 0, 25, 25, 0
+ENTRIES = [ended(3, 9, 25), ended(4, 10, 50, minutes=50), ended(4, 10, 55, 'break', 5), ended(5, 9, 25),
+           ended(8, 9, 25), ended(9, 9, 25), ended(11, 9, 25)]  # the last is after TODAY
+
+
+@unittest.skipUnless(HAS_NUMPY, 'NumPy is not installed')
+class ReportTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def check_report(self, store):
+        store.append_many(ENTRIES)
+        r = analytics.store_report(store, TODAY)
+        self.assertEqual(r['first_day'], '2026-03-03')
+        self.assertEqual((r['current_streak'], r['longest_streak']), (2, 3))
+        self.assertEqual((r['avg_7d'], r['avg_30d']), (round(125 / 7, 1), round(150 / 30, 1)))
+        self.assertEqual(r['best_avg_7d'], round(150 / 7, 1))
+        ratio = r['ratios']
+        self.assertEqual((ratio['focus_minutes'], ratio['break_minutes']), (175, 5))
+        self.assertEqual((ratio['minute_ratio'], ratio['session_ratio']), (35.0, 6.0))
+        matrix = r['hour_weekday']
+        nonzero = {(day, hour): v for day, row in enumerate(matrix) for hour, v in enumerate(row) if v}
+        # Keyed by (weekday, start hour); the profile and ratios include the session after TODAY
+        self.assertEqual(nonzero, {(1, 9): 25, (2, 10): 50, (2, 9): 25, (3, 9): 25, (6, 9): 25, (0, 9): 25})
+
+    def test_json_journal(self):
+        self.check_report(HistoryStore(os.path.join(self.dir, 'history.jsonl')))
+
+    def test_sqlite(self):
+        store = SQLiteHistoryStore(os.path.join(self.dir, 'history.db'))
+        self.addCleanup(store.close)
+        self.check_report(store)
+
+
+@unittest.skipUnless(HAS_NUMPY, 'NumPy is not installed')
+class MetricTest(unittest.TestCase):
+    def test_streaks(self):
+        import numpy as np
+        self.assertEqual(analytics.streaks(np.array([1, 1, 0, 1, 1, 1, 0, 0])), (0, 3))
+        self.assertEqual(analytics.streaks(np.array([1, 0, 1, 1, 0])), (2, 2))  # may end yesterday
+        self.assertEqual(analytics.streaks(np.zeros(4)), (0, 0))
+
+    def test_utc_offset_moves_day_boundaries(self):
+        import numpy as np
+        ts = np.array([int(datetime.datetime(2026, 3, 9, 23, 30, tzinfo=datetime.timezone.utc).timestamp())])
+        first, daily = analytics.daily_focus(ts, np.array([25]), np.array([analytics.FOCUS]), TODAY, 3600)
+        self.assertEqual((datetime.date(1970, 1, 1) + datetime.timedelta(days=first), list(daily)),
+                         (TODAY, [25]))
+
+    def test_empty_history(self):
+        import numpy as np
+        empty = np.array([], dtype=np.int64)
+        r = analytics.report(empty, empty, empty.astype(np.uint8), TODAY)
+        self.assertEqual((r['sessions'], r['current_streak'], r['avg_7d']), (0, 0, 0.0))
+        self.assertIsNone(r['ratios']['minute_ratio'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""PomodoroApp's named timers and the settings inputs, without opening a window."""
+
+import os
+import sys
+import tkinter as tk
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pomodoro
+from timer_engine import TimerEngine
+
+
+class AppHarness:
+    """The app's real timer and settings methods over Tcl variables; every widget is a Mock"""
+
+    sync_timer_settings = pomodoro.PomodoroApp.sync_timer_settings
+    load_timer_settings = pomodoro.PomodoroApp.load_timer_settings
+    select_timer = pomodoro.PomodoroApp.select_timer
+    add_timer = pomodoro.PomodoroApp.add_timer
+    save_settings = pomodoro.PomodoroApp.save_settings
+
+    def __init__(self):
+        self.interp = tk.Tcl()
+        self.engine = TimerEngine()
+        self.timer_name = pomodoro.DEFAULT_TIMER
+        self.timer = self.engine.add(pomodoro.DEFAULT_TIMER)
+        self.in_tray = False
+        self.history_backend = 'json'
+        self.writer = mock.Mock(replace=lambda key, write: write())
+        self.focus_minutes = tk.IntVar(self.interp, value=25)
+        self.break_minutes = tk.IntVar(self.interp, value=5)
+        self.auto_repeat = tk.BooleanVar(self.interp, value=True)
+        self._loading_timer = False
+        for var in (self.focus_minutes, self.break_minutes, self.auto_repeat):
+            var.trace_add('write', lambda *args: self.sync_timer_settings())
+
+    def __getattr__(self, name):
+        return mock.Mock()
+
+
+class SelectTimerTest(unittest.TestCase):
+    def setUp(self):
+        self.app = AppHarness()
+        self.app.add_timer('Meeting', 50, 10, False)
+
+    def settings(self, name):
+        core = self.app.engine.get(name)
+        return core.focus_seconds // 60, core.break_seconds // 60, core.auto_repeat
+
+    def inputs(self):
+        return self.app.focus_minutes.get(), self.app.break_minutes.get(), self.app.auto_repeat.get()
+
+    def test_switching_keeps_each_timers_settings(self):
+        for _ in range(2):
+            self.app.select_timer('Meeting')
+            self.assertEqual(self.inputs(), (50, 10, False))
+            self.app.select_timer(pomodoro.DEFAULT_TIMER)
+            self.assertEqual(self.inputs(), (25, 5, True))
+        self.assertEqual(self.settings('Meeting'), (50, 10, False))
+        self.assertEqual(self.settings(pomodoro.DEFAULT_TIMER), (25, 5, True))
+
+    def test_edits_go_to_the_timer_on_screen(self):
+        self.app.select_timer('Meeting')
+        self.app.break_minutes.set(15)
+        self.app.select_timer(pomodoro.DEFAULT_TIMER)
+        self.assertEqual(self.settings('Meeting'), (50, 15, False))
+        self.assertEqual(self.settings(pomodoro.DEFAULT_TIMER), (25, 5, True))
+
+    def test_save_keeps_the_default_timer_at_the_top_level(self):
+        self.app.select_timer('Meeting')
+        with mock.patch.object(pomodoro, 'atomic_write_json') as write:
+            self.app.save_settings()
+        [(path, data)] = [c.args for c in write.call_args_list]
+        self.assertEqual((data['focus_minutes'], data['break_minutes'], data['auto_repeat']), (25, 5, True))
+        self.assertEqual(data['timers'], [{'name': 'Meeting', 'focus_minutes': 50,
+                                           'break_minutes': 10, 'auto_repeat': False}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Binary sidecar: time-sorted fixed-width records behind HistoryStore.range()."""
+
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore, entry_epoch
+
+START = datetime.datetime(2026, 3, 1, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def session(i, kind='focus', minutes=25, **extra):
+    return dict({'type': kind, 'minutes': minutes, 'ts': (START + datetime.timedelta(hours=i)).isoformat()}, **extra)
+
+
+class TempDirTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+
+class BinaryHistoryTest(TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.store = HistoryStore(self.path('history.jsonl'))
+
+    def test_range_round_trip_is_time_sorted(self):
+        entries = [session(5), session(1, 'break', 5), session(3), session(0)]
+        self.store.append_many(entries)
+        self.assertFalse(self.store.binary.is_current())  # out of order: re-sorted on the next read
+        rows = self.store.range()
+        self.assertEqual(rows, sorted((entry_epoch(e), e['type'], e['minutes']) for e in entries))
+        self.assertTrue(self.store.binary.is_current())
+        self.assertEqual(self.store.session_count(), 3)  # the break is not a session
+
+    def test_in_order_appends_keep_the_sidecar_current(self):
+        for i in range(3):
+            self.store.append_many([session(i)])
+            self.assertTrue(self.store.binary.is_current())
+        self.assertEqual(len(self.store.range()), 3)
+
+    def test_range_bounds_are_half_open(self):
+        self.store.append_many([session(i) for i in range(10)])
+        start, end = entry_epoch(session(2)), entry_epoch(session(5))
+        self.assertEqual([row[0] for row in self.store.range(start, end)],
+                         [entry_epoch(session(i)) for i in (2, 3, 4)])
+        self.assertEqual(self.store.range(end, start), [])
+
+    def test_rebuilds_after_the_journal_changes_behind_its_back(self):
+        self.store.append_many([session(0)])
+        with open(self.store.path, 'a') as f:
+            f.write(json.dumps(session(1)) + '\n')
+        self.assertFalse(self.store.binary.is_current())
+        self.assertEqual(len(self.store.range()), 2)
+        self.assertTrue(self.store.binary.is_current())
+        self.assertEqual(self.store.daily_totals(), {START.date(): (50, 2)})
+
+    def test_records_without_timestamp_are_left_out(self):
+        self.store.append_many([session(0), {'type': 'focus', 'minutes': 25}, session(1, ts='not a date')])
+        self.assertEqual(self.store.session_count(), 1)
+
+    def test_index_bytes_is_whole_records(self):
+        self.store.append_many([session(i) for i in range(3)])
+        self.assertEqual(len(self.store.index_bytes()), 3 * 16)
+
+    def test_rebuilds_racing_appends_miss_nothing(self):
+        def write():
+            for i in range(50):
+                self.store.append_many([session(i)])
+        writer = threading.Thread(target=write)
+        writer.start()
+        while writer.is_alive():
+            with self.store._lock:  # drop both sidecars so the reads below rebuild them
+                self.store.binary.reset()
+                self.store.rollup.reset()
+            self.store.summarize()
+            self.store.daily_totals()
+        writer.join()
+        self.assertEqual(self.store.summarize(), (50 * 25, 50))
+        self.assertEqual(sum(n for _, n in self.store.daily_totals().values()), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Control API: the command queue's Tk hand-off and the socket server's dispatch."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import control_api
+
+
+class FakeWidget:
+    """Stands in for the Tk root: records after() calls and the thread that made them"""
+
+    def __init__(self, filehandlers=True):
+        self.scheduled = []
+        self.callers = set()
+        self.handlers = []
+        if filehandlers:
+            self.tk = self
+        else:
+            self.tk = None  # no createfilehandler: the queue must poll
+
+    def createfilehandler(self, fd, mask, callback):
+        self.handlers.append((fd, callback))
+
+    def after(self, ms, callback):
+        self.callers.add(threading.get_ident())
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, []
+        for callback in pending:
+            callback()
+
+
+def submit_from_thread(commands, request):
+    futures = []
+    thread = threading.Thread(target=lambda: futures.append(commands.submit(request)))
+    thread.start()
+    thread.join()
+    return futures[0]
+
+
+class CommandQueueTest(unittest.TestCase):
+    def test_polling_never_calls_tk_from_other_threads(self):
+        widget = FakeWidget(filehandlers=False)
+        commands = control_api.CommandQueue()
+        commands.attach(widget, lambda request: {'echo': request['cmd']})
+        widget.run_pending()
+        future = submit_from_thread(commands, {'cmd': 'start'})
+        self.assertEqual(widget.callers, {threading.get_ident()})
+        self.assertFalse(future.done())
+        widget.run_pending()
+        self.assertEqual(future.result(0), {'echo': 'start'})
+        self.assertEqual(len(widget.scheduled), 1)  # the poll loop keeps going
+
+    def test_self_pipe_wakes_the_file_handler(self):
+        widget = FakeWidget()
+        commands = control_api.CommandQueue()
+        commands.attach(widget, lambda request: 1 / 0)
+        [(fd, wake)] = widget.handlers
+        future = submit_from_thread(commands, {'cmd': 'reset'})
+        self.assertEqual(widget.scheduled, [])
+        wake(fd, None)
+        self.assertIsInstance(future.exception(0), ZeroDivisionError)
+
+
+class ControlServerTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.handled = []
+        self.commands = control_api.CommandQueue()
+        self.commands.attach(FakeWidget(), self.handle)
+        self.server = control_api.ControlServer(
+            self.commands, lambda: {'current': 'Pomodoro', 'timers': [{'name': 'Pomodoro', 'running': False}]},
+            path=os.path.join(tmp, 'control.sock'), offload={'history': lambda request: {'sessions': []}})
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.assertTrue(self.server.ready.wait(5))
+        self.assertIsNone(self.server.error)
+        # The test thread plays the Tk thread: it drains whenever the server is waiting
+        self.stop = threading.Event()
+        pump = threading.Thread(target=self.pump, daemon=True)
+        pump.start()
+        self.addCleanup(pump.join)
+        self.addCleanup(self.stop.set)
+
+    def pump(self):
+        while not self.stop.wait(0.01):
+            self.commands.drain()
+
+    def handle(self, request):
+        self.handled.append(request)
+        if request.get('timer', 'Pomodoro') != 'Pomodoro':
+            raise ValueError(f"no timer named {request['timer']!r}")
+        return {'timer': 'Pomodoro', 'running': True}
+
+    def send(self, request):
+        return control_api.send(request, self.server.path)
+
+    def test_commands_run_through_the_queue(self):
+        self.assertEqual(self.send({'cmd': 'start'}), {'ok': True, 'timer': 'Pomodoro', 'running': True})
+        self.assertEqual(self.send({'cmd': 'pause', 'timer': 'Nope'}), {'ok': False, 'error': "no timer named 'Nope'"})
+        self.assertEqual([r['cmd'] for r in self.handled], ['start', 'pause'])
+
+    def test_status_and_history_skip_the_queue(self):
+        status = self.send({'cmd': 'status'})
+        self.assertEqual((status['ok'], status['current']), (True, 'Pomodoro'))
+        self.assertEqual(self.send({'cmd': 'history'}), {'ok': True, 'sessions': []})
+        self.assertEqual(self.handled, [])
+
+    def test_bad_requests_are_answered(self):
+        self.assertEqual(self.send({'cmd': 'explode'}), {'ok': False, 'error': "unknown command 'explode'"})
+        self.assertEqual(self.send([1]), {'ok': False, 'error': 'request must be a JSON object'})
+
+
+if __name__ == '__main__':
+    unittest.main()
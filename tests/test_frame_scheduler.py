@@ -0,0 +1,150 @@
+"""FrameScheduler batching and suspension, against a fake Tk root and widgets."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_scheduler import FrameScheduler
+
+
+class FakeRoot:
+    """Collects after()/after_idle() jobs; the test runs them by hand"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = callback
+        return self.next_id
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+class FakeWidget:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+        self.alive = True
+
+    def __str__(self):
+        return self.name
+
+    def winfo_exists(self):
+        return self.alive
+
+    def configure(self, **opts):
+        self.calls.append(('configure', opts))
+
+    def itemconfig(self, item, **opts):
+        self.calls.append(('itemconfig', item, opts))
+
+    def coords(self, item, *coords):
+        self.calls.append(('coords', item, coords))
+
+
+class FrameSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.frames = FrameScheduler(self.root)
+        self.label = FakeWidget('.!label')
+        self.canvas = FakeWidget('.!canvas')
+
+    def test_staged_changes_go_out_in_one_idle_flush(self):
+        self.frames.config(self.label, text='24:59')
+        self.frames.config(self.label, text='24:58', foreground='red')
+        self.frames.itemconfig(self.canvas, 7, extent=-90)
+        self.frames.coords(self.canvas, 7, 0, 0, 10, 10)
+        self.assertEqual(len(self.root.jobs), 1)
+        self.assertEqual(self.label.calls, [])
+        self.root.run_jobs()
+        self.assertEqual(self.label.calls, [('configure', {'text': '24:58', 'foreground': 'red'})])
+        self.assertEqual(self.canvas.calls, [('itemconfig', 7, {'extent': -90}), ('coords', 7, (0, 0, 10, 10))])
+        self.assertEqual(self.frames.tk_calls, 3)
+
+    def test_only_changed_options_reach_tk(self):
+        self.frames.config(self.label, text='24:58', foreground='red')
+        self.root.run_jobs()
+        self.frames.config(self.label, text='24:58', foreground='blue')
+        self.frames.config(self.canvas, background='black')
+        self.frames.config(self.canvas, background='black')
+        self.root.run_jobs()
+        self.frames.config(self.canvas, background='black')
+        self.root.run_jobs()
+        self.assertEqual(self.label.calls[1:], [('configure', {'foreground': 'blue'})])
+        self.assertEqual(self.canvas.calls, [('configure', {'background': 'black'})])
+
+    def test_invalidate_resends_the_same_value(self):
+        self.frames.config(self.label, text='Focus')
+        self.root.run_jobs()
+        self.frames.invalidate(self.label)
+        self.frames.config(self.label, text='Focus')
+        self.root.run_jobs()
+        self.assertEqual(len(self.label.calls), 2)
+
+    def test_suspended_changes_wait_for_resume(self):
+        self.frames.suspend()
+        self.frames.config(self.label, text='1')
+        self.frames.config(self.label, text='2')
+        self.assertEqual(self.root.jobs, {})
+        self.frames.resume()
+        self.root.run_jobs()
+        self.assertEqual(self.label.calls, [('configure', {'text': '2'})])
+
+    def test_animation_frame_flushes_its_changes(self):
+        steps = []
+
+        def step():
+            steps.append(len(steps))
+            self.frames.config(self.label, text=str(len(steps)))
+            return len(steps) < 2
+
+        self.frames.add_animation('pulse', 0, step)
+        self.root.run_jobs()
+        self.root.run_jobs()
+        self.assertEqual(steps, [0, 1])
+        self.assertFalse(self.frames.has_animation('pulse'))  # returned False
+        self.assertEqual([call[1]['text'] for call in self.label.calls], ['1', '2'])
+
+    def test_owned_animation_runs_while_suspended(self):
+        popup = FakeWidget('.!toplevel')
+        popup_label = FakeWidget('.!toplevel.!label')
+        ran = []
+
+        def stretch():
+            ran.append('stretch')
+            self.frames.config(popup_label, text='x')
+
+        self.frames.add_animation('pulse', 0, lambda: ran.append('pulse'))
+        self.frames.config(self.label, text='hidden')
+        self.frames.suspend()
+        self.root.run_jobs()
+        self.assertEqual(ran, [])  # no owner: it waits for resume()
+        self.frames.add_animation('stretch', 0, stretch, owner=popup)
+        self.root.run_jobs()
+        self.assertEqual(ran, ['stretch'])
+        self.assertEqual(popup_label.calls, [('configure', {'text': 'x'})])
+        self.assertEqual(self.label.calls, [])  # the main window's change is still held
+        popup.alive = False
+        self.root.run_jobs()
+        self.assertEqual((ran, self.root.jobs), (['stretch'], {}))
+        self.frames.resume()
+        self.root.run_jobs()
+        self.assertEqual(self.label.calls, [('configure', {'text': 'hidden'})])
+        self.assertIn('pulse', ran)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Chart binning: the bin size follows the window, and bars sum the days they cover."""
+
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history_chart
+from history_chart import MAX_BARS, bin_daily, bin_start, choose_unit
+
+TODAY = date(2026, 3, 11)  # a Wednesday
+
+
+class BinningTest(unittest.TestCase):
+    def test_bin_start(self):
+        self.assertEqual(bin_start(TODAY, 'day'), TODAY)
+        self.assertEqual(bin_start(TODAY, 'week'), date(2026, 3, 9))
+        self.assertEqual(bin_start(TODAY, 'month'), date(2026, 3, 1))
+        self.assertEqual(bin_start(TODAY, 'year'), date(2026, 1, 1))
+
+    def test_unit_is_the_smallest_that_fits(self):
+        def unit(days):
+            return choose_unit(TODAY - timedelta(days=days - 1), TODAY)
+        self.assertEqual(unit(MAX_BARS), 'day')
+        self.assertEqual(unit(MAX_BARS + 1), 'week')
+        self.assertEqual(unit(MAX_BARS * 7), 'week')
+        self.assertEqual(unit(MAX_BARS * 7 + 1), 'month')
+        self.assertEqual(unit(365 * 4), 'month')
+        self.assertEqual(unit(365 * 6), 'year')
+
+    def test_every_window_stays_within_max_bars(self):
+        daily = {TODAY - timedelta(days=i): 25 for i in range(3000)}
+        for days in history_chart.WINDOWS.values():
+            unit, bins = bin_daily(daily, TODAY, days)
+            self.assertLessEqual(len(bins), MAX_BARS)
+            self.assertEqual(sum(minutes for _, minutes in bins), 25 * min(days or 3000, 3000), unit)
+
+    def test_window_drops_days_outside_it_and_idle_days(self):
+        daily = {TODAY: 30, TODAY - timedelta(days=1): 0, TODAY - timedelta(days=29): 50,
+                 TODAY - timedelta(days=30): 70}
+        self.assertEqual(bin_daily(daily, TODAY, 30),
+                         ('day', [(TODAY - timedelta(days=29), 50), (TODAY, 30)]))
+
+    def test_week_bins_sum_their_days(self):
+        daily = {date(2026, 3, 9): 25, date(2026, 3, 11): 50, date(2026, 3, 8): 100}
+        unit, bins = bin_daily(daily, TODAY, 90)
+        self.assertEqual(unit, 'week')
+        self.assertEqual(bins, [(date(2026, 3, 2), 100), (date(2026, 3, 9), 75)])
+
+    def test_all_time_spans_the_whole_history(self):
+        self.assertEqual(bin_daily({}, TODAY), ('day', []))
+        daily = {date(2020, 5, 17): 60, date(2026, 2, 1): 30}
+        self.assertEqual(bin_daily(daily, TODAY), ('year', [(date(2020, 1, 1), 60), (date(2026, 1, 1), 30)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
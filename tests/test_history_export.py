@@ -0,0 +1,99 @@
+"""Streaming export: date/type filters, every output format, cancellation."""
+
+import csv
+import datetime
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_export import ExportCancelled, detect_format, export_entries
+
+ENTRIES = [
+    {'type': 'focus', 'minutes': 25, 'ts': '2026-03-01T08:00:00+00:00', 'timer': 'Pomodoro'},
+    {'type': 'break', 'minutes': 5, 'ts': '2026-03-01T08:25:00+00:00', 'timer': 'Pomodoro'},
+    {'type': 'focus', 'minutes': 50, 'ts': '2026-03-02T09:00:00+00:00', 'timer': 'Meeting'},
+    {'type': 'focus', 'minutes': 25, 'timestamp': '2026-03-03T10:00:00'},
+    {'type': 'focus', 'minutes': 25},
+]
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def read_jsonl(self, path, opener=open):
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format('out.CSV'), ('csv', False))
+        self.assertEqual(detect_format('out.json.gz'), ('json', True))
+        self.assertEqual(detect_format('out.jsonl'), ('jsonl', False))
+        self.assertEqual(detect_format('out.txt'), ('jsonl', False))
+
+    def test_unfiltered_jsonl_keeps_every_record(self):
+        path = self.path('all.jsonl')
+        self.assertEqual(export_entries(iter(ENTRIES), path), 5)
+        self.assertEqual(self.read_jsonl(path), ENTRIES)
+
+    def test_date_range_is_inclusive_and_drops_undated_records(self):
+        path = self.path('range.jsonl')
+        written = export_entries(ENTRIES, path, datetime.date(2026, 3, 2), datetime.date(2026, 3, 3))
+        self.assertEqual(written, 2)
+        self.assertEqual(self.read_jsonl(path), ENTRIES[2:4])
+
+    def test_kind_filter(self):
+        path = self.path('breaks.jsonl.gz')
+        self.assertEqual(export_entries(ENTRIES, path, kinds={'break'}), 1)
+        self.assertEqual(self.read_jsonl(path, gzip.open), [ENTRIES[1]])
+
+    def test_csv_fills_ts_from_legacy_timestamp(self):
+        path = self.path('focus.csv')
+        export_entries(ENTRIES, path, start=datetime.date(2026, 3, 2))
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(r['ts'], r['minutes'], r['timer']) for r in rows],
+                         [('2026-03-02T09:00:00+00:00', '50', 'Meeting'), ('2026-03-03T10:00:00', '25', '')])
+
+    def test_json_array(self):
+        path = self.path('focus.json')
+        export_entries(ENTRIES, path, kinds={'focus'})
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [e for e in ENTRIES if e['type'] == 'focus'])
+        self.assertEqual(export_entries([], path), 0)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [])
+
+    def test_progress_reports_scanned_and_written(self):
+        calls = []
+        export_entries(ENTRIES, self.path('p.jsonl'), kinds={'break'}, every=2,
+                       progress=lambda scanned, written: calls.append((scanned, written)))
+        self.assertEqual(calls, [(2, 1), (4, 1), (5, 1)])
+
+    def test_cancel_removes_the_partial_file(self):
+        cancel = threading.Event()
+        path = self.path('cancelled.csv')
+
+        def entries():
+            yield ENTRIES[0]
+            cancel.set()
+            yield ENTRIES[1]
+
+        with self.assertRaises(ExportCancelled):
+            export_entries(entries(), path, cancel=cancel)
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""HistoryStore.read_page_reverse: newest-first pages straight from the journal."""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+
+START = datetime.datetime(2026, 3, 1, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def session(i, kind='focus', minutes=25, **extra):
+    return dict({'type': kind, 'minutes': minutes, 'ts': (START + datetime.timedelta(hours=i)).isoformat()}, **extra)
+
+
+class TempDirTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+
+class ReadPageReverseTest(TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.store = HistoryStore(self.path('history.jsonl'))
+        self.entries = [session(i, timer=f'timer {i % 3}') for i in range(250)]
+        self.store.append_many(self.entries)
+
+    def read_all(self, count, block_size):
+        pages, cursor = [], None
+        while cursor != 0:
+            page, cursor = self.store.read_page_reverse(cursor, count, block_size)
+            pages.append(page)
+        return pages
+
+    def test_pages_cover_the_journal_newest_first(self):
+        for block_size in (64, 1000, 64 * 1024):
+            pages = self.read_all(100, block_size)
+            self.assertEqual([len(page) for page in pages], [100, 100, 50])
+            self.assertEqual([e for page in pages for e in page], self.entries[::-1])
+
+    def test_damaged_lines_are_skipped(self):
+        with open(self.store.path, 'a') as f:
+            f.write('{"type": "focus", "minu\n[1, 2]\n\n')
+        self.store.append_many([session(300)])
+        page, _ = self.store.read_page_reverse(None, 2)
+        self.assertEqual(page, [session(300), self.entries[-1]])
+
+    def test_missing_journal_reads_empty(self):
+        self.assertEqual(HistoryStore(self.path('none.jsonl')).read_page_reverse(), ([], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
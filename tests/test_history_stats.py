@@ -0,0 +1,57 @@
+"""Stats over a history that records breaks too: only focus sessions count."""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore, dashboard_stats, day_epoch
+from sqlite_history import SQLiteHistoryStore
+
+START = datetime.datetime(2026, 3, 1, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def session(i, kind='focus', minutes=25, **extra):
+    return dict({'type': kind, 'minutes': minutes, 'ts': (START + datetime.timedelta(hours=i)).isoformat()}, **extra)
+
+
+class StatsTest(unittest.TestCase):
+    """Run against the JSON journal; SQLiteStatsTest reruns it on the SQLite backend"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.store = self.open_store()
+
+    def open_store(self):
+        return HistoryStore(os.path.join(self.dir, 'history.jsonl'))
+
+    def test_summarize_counts_focus_only(self):
+        self.store.append_many([session(0), session(1, 'break', 5), session(2, minutes=50)])
+        self.assertEqual(self.store.summarize(), (75, 2))
+        day = START.date()
+        self.assertEqual(self.store.summarize(day_epoch(day), day_epoch(day + datetime.timedelta(days=1))), (75, 2))
+        self.assertEqual(self.store.daily_totals(), {day: (75, 2)})
+
+    def test_session_count_leaves_out_breaks(self):
+        self.store.append_many([session(0), session(1, 'break', 5)])
+        self.assertEqual(self.store.session_count(), 1)
+        self.assertEqual(self.store.record_count(), 2)
+        stats = dashboard_stats(self.store, START.date())
+        self.assertEqual((stats['today'], stats['sessions']), (25, 1))
+        self.assertEqual(stats['daily'], {START.date(): 25})
+
+
+class SQLiteStatsTest(StatsTest):
+    def open_store(self):
+        store = SQLiteHistoryStore(os.path.join(self.dir, 'history.db'))
+        self.addCleanup(store.close)
+        return store
+
+
+if __name__ == '__main__':
+    unittest.main()
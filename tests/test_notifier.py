@@ -0,0 +1,79 @@
+"""Notifier: in-app fallback, batching of bursts and de-duplication."""
+
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import notifier
+
+
+class NotifierTest(unittest.TestCase):
+    def make(self, desktop=False, **kwargs):
+        self.shown = []
+        n = notifier.Notifier(fallback=lambda title, message: self.shown.append((title, message)), **kwargs)
+        n._desktop = desktop
+        self.addCleanup(n.close)
+        return n
+
+    def test_falls_back_without_plyer(self):
+        n = self.make(gather=0)
+        n.notify('Focus done', 'Take a break')
+        n.close()
+        self.assertEqual(self.shown, [('Focus done', 'Take a break')])
+        self.assertEqual(n.sent, 1)
+
+    def test_falls_back_when_plyer_fails(self):
+        with mock.patch.dict(sys.modules, {'plyer': None}):  # import plyer raises ImportError
+            n = self.make(desktop=True, gather=0)
+            n.notify('Focus done', 'Take a break')
+            n.close()
+        self.assertEqual(self.shown, [('Focus done', 'Take a break')])
+        self.assertFalse(n._desktop)  # later notifications go straight to the fallback
+
+    def test_burst_is_shown_once(self):
+        n = self.make(gather=0.5)
+        for name in ('Pomodoro', 'Meeting', 'Reading'):
+            n.notify(f'{name} done', 'Break time')
+        n.close()
+        self.assertEqual(self.shown, [('3 sessions finished',
+                                       'Pomodoro done: Break time\nMeeting done: Break time\nReading done: Break time')])
+
+    def test_repeats_within_the_window_are_skipped(self):
+        n = self.make(gather=0, dedup_window=60)
+        n.notify('Focus done', 'Take a break')
+        n.notify('Focus done', 'Take a break')
+        n.close()
+        self.assertEqual((len(self.shown), n.deduped), (1, 1))
+
+    def test_failing_fallback_does_not_stop_the_worker(self):
+        calls = []
+        failed = threading.Event()
+
+        def fallback(title, message):
+            calls.append(title)
+            if len(calls) == 1:
+                failed.set()
+                raise RuntimeError('toast window is gone')
+
+        n = notifier.Notifier(fallback=fallback, gather=0)
+        n._desktop = False
+        n.notify('a', 'b')
+        self.assertTrue(failed.wait(5))
+        n.notify('c', 'd')
+        n.close()
+        self.assertEqual(calls, ['a', 'c'])
+
+    def test_combine_caps_the_lines(self):
+        notes = [(f'Timer {i}', 'done') for i in range(6)] + [('Timer 0', 'done')]
+        title, message = notifier.combine(notes)
+        self.assertEqual(title, '6 sessions finished')
+        self.assertEqual(message.splitlines()[-1], '…and 2 more')
+        self.assertEqual(len(message.splitlines()), notifier.MAX_LINES + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Persistence helpers: salvaging damaged JSON and the write-behind queue."""
+
+import datetime
+import json
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from persistence import WriteBehind, salvage_json_records
+
+START = datetime.datetime(2026, 3, 1, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def session(i, kind='focus', minutes=25, **extra):
+    return dict({'type': kind, 'minutes': minutes, 'ts': (START + datetime.timedelta(hours=i)).isoformat()}, **extra)
+
+
+class SalvageJsonRecordsTest(unittest.TestCase):
+    def test_truncated_array(self):
+        text = json.dumps([session(0), session(1)]) + ', {"type": "fo'
+        self.assertEqual(salvage_json_records(text[:-1]), [session(0), session(1)])
+
+    def test_garbage_between_records(self):
+        text = '[' + json.dumps(session(0)) + ', {"broken": tru, ' + json.dumps(session(1)) + ']'
+        self.assertEqual(salvage_json_records(text), [session(0), session(1)])
+
+    def test_nested_objects_stay_whole(self):
+        record = session(0, meta={'tags': ['a']})
+        self.assertEqual(salvage_json_records(json.dumps([record])), [record])
+
+    def test_nothing_to_salvage(self):
+        self.assertEqual(salvage_json_records(''), [])
+        self.assertEqual(salvage_json_records('[1, 2, "{"]'), [])
+
+
+class WriteBehindTest(unittest.TestCase):
+    def setUp(self):
+        self.writer = WriteBehind('test-writer')
+        self.addCleanup(self.writer.close)
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def block(self):
+        """Queue a write that holds the writer thread until self.release is set"""
+        def hold():
+            self.started.set()
+            self.release.wait(5)
+        self.writer.replace('block', hold)
+        self.assertTrue(self.started.wait(5))
+
+    def test_appends_for_one_key_are_written_together(self):
+        batches = []
+        self.block()
+        for i in range(5):
+            self.writer.append('history', i, batches.append)
+        self.release.set()
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(batches, [[0, 1, 2, 3, 4]])
+        self.assertEqual(self.writer.coalesced, 4)
+
+    def test_only_the_newest_replace_runs(self):
+        written = []
+        self.block()
+        for i in range(3):
+            self.writer.replace('config', lambda i=i: written.append(i))
+        self.release.set()
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(written, [2])
+        self.assertEqual(self.writer.coalesced, 2)
+
+    def test_keys_run_in_first_queued_order(self):
+        order = []
+        self.block()
+        self.writer.append('a', 1, lambda items: order.append(('a', items)))
+        self.writer.replace('b', lambda: order.append(('b', None)))
+        self.writer.append('a', 2, lambda items: order.append(('a', items)))
+        self.release.set()
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(order, [('a', [1, 2]), ('b', None)])
+
+    def test_flush_times_out_while_busy(self):
+        self.block()
+        self.assertFalse(self.writer.flush(0.05))
+        self.release.set()
+        self.assertTrue(self.writer.flush(5))
+
+    def test_failed_write_does_not_stop_the_writer(self):
+        written = []
+        self.writer.append('bad', 1, lambda items: 1 / 0)
+        self.writer.append('good', 2, written.extend)
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(written, [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
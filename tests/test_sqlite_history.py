@@ -0,0 +1,78 @@
+"""SQLite backend: all-or-nothing imports, paging and record round trips."""
+
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlite_history import SQLiteHistoryStore, read_json_history
+
+START = datetime.datetime(2026, 3, 1, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def session(i, kind='focus', minutes=25, **extra):
+    return dict({'type': kind, 'minutes': minutes, 'ts': (START + datetime.timedelta(hours=i)).isoformat()}, **extra)
+
+
+class SQLiteHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.store = SQLiteHistoryStore(self.path('history.db'))
+        self.addCleanup(self.store.close)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def test_failed_import_keeps_nothing(self):
+        self.store.append(session(0))
+
+        def entries():
+            for i in range(1, 6):
+                yield session(i)
+            raise OSError('disk went away')
+
+        with self.assertRaises(OSError):
+            self.store.import_entries(entries(), batch=2)  # two batches were already inserted
+        self.assertEqual(list(self.store.iter_entries()), [session(0)])
+        self.assertEqual(self.store.import_entries(session(i) for i in range(1, 6)), 5)
+        self.assertEqual(self.store.record_count(), 6)
+
+    def test_pages_cover_the_history_newest_first(self):
+        entries = [session(i, timer=f'timer {i % 3}') for i in range(250)]
+        self.store.import_entries(entries)
+        pages, cursor = [], None
+        while cursor != 0:
+            page, cursor = self.store.read_page_reverse(cursor, 100)
+            pages.append(page)
+        self.assertEqual([len(page) for page in pages], [100, 100, 50])
+        self.assertEqual([e for page in pages for e in page], entries[::-1])
+
+    def test_records_round_trip(self):
+        entries = [session(0, timer='Meeting', note='x'), session(1, 'break', 5),
+                   {'type': 'focus', 'minutes': 25, 'timestamp': '2020-01-01T10:00:00'}]
+        self.store.append_many(entries)
+        self.assertEqual(list(self.store.iter_entries(chunk=2)), entries[:2] + [
+            {'type': 'focus', 'minutes': 25, 'ts': '2020-01-01T10:00:00'}])  # legacy key comes back as 'ts'
+        start = int(START.timestamp())
+        legacy = int(datetime.datetime(2020, 1, 1, 10, tzinfo=datetime.timezone.utc).timestamp())
+        self.assertEqual(self.store.range(), [(legacy, 'focus', 25), (start, 'focus', 25), (start + 3600, 'break', 5)])
+        self.assertEqual(self.store.range(start + 1), [(start + 3600, 'break', 5)])
+
+    def test_read_json_history_accepts_both_layouts(self):
+        entries = [session(0), session(1, 'break', 5)]
+        with open(self.path('legacy.json'), 'w') as f:
+            json.dump(entries + [1], f)
+        with open(self.path('journal.jsonl'), 'w') as f:
+            f.write(json.dumps(entries[0]) + '\n{"torn": \n\n' + json.dumps(entries[1]) + '\n')
+        self.assertEqual(list(read_json_history(self.path('legacy.json'))), entries)
+        self.assertEqual(list(read_json_history(self.path('journal.jsonl'))), entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""TimerCore driven by a VirtualClock."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timer_core import TimerCore, VirtualClock, simulate
+
+
+class Recorder:
+    """Collects every event a timer emits as (event, args) tuples"""
+
+    def __init__(self, timer):
+        self.events = []
+        for event in timer.EVENTS:
+            timer.subscribe(event, lambda *args, _event=event: self.events.append((_event, args)))
+
+    def named(self, event):
+        return [args for name, args in self.events if name == event]
+
+
+class TimerCoreTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(1000.0)
+        self.core = TimerCore(60, 30, auto_repeat=True, clock=self.clock)
+        self.events = Recorder(self.core)
+
+    def test_pause_keeps_remaining_time(self):
+        self.core.start()
+        self.clock.advance(20)
+        self.core.poll()
+        self.assertEqual(self.core.remaining, 40)
+        self.core.pause()
+        self.clock.advance(500)
+        self.assertIsNone(self.core.poll())
+        self.assertEqual(self.core.remaining, 40)
+        self.assertAlmostEqual(self.core.elapsed(), 20)
+
+        self.core.start()
+        self.assertEqual(self.core.deadline, self.clock.now + 40)
+        self.clock.advance(39.5)
+        self.core.poll()
+        self.assertEqual(self.events.named('session_complete'), [])
+        self.clock.advance(0.5)
+        self.core.poll()
+        [(kind, minutes, drift)] = self.events.named('session_complete')
+        self.assertEqual((kind, minutes), ('focus', 1))
+        self.assertFalse(self.core.is_focus)
+
+    def test_poll_wakes_just_after_the_second_rolls_over(self):
+        self.core.start()
+        self.clock.advance(0.25)
+        self.assertAlmostEqual(self.core.poll(), 0.75)
+        self.assertAlmostEqual(self.core.poll(until_deadline=True), 59.75)
+
+    def test_auto_repeat_chains_off_the_old_deadline(self):
+        self.core.start()
+        focus_deadline = self.core.deadline
+        self.clock.now = focus_deadline + 0.3  # woke a little late
+        self.core.poll()
+        self.assertTrue(self.core.is_running)
+        self.assertFalse(self.core.is_focus)
+        self.assertEqual(self.core.deadline, focus_deadline + 30)
+        self.assertEqual(self.events.named('phase_change'), [(False,)])
+        self.assertAlmostEqual(self.events.named('session_complete')[0][2]['end_late'], 0.3)
+
+        self.clock.now = self.core.deadline
+        self.core.poll()
+        self.assertTrue(self.core.is_focus)
+        self.assertEqual(self.core.deadline, focus_deadline + 30 + 60)
+        self.assertEqual([args[0] for args in self.events.named('session_complete')], ['focus', 'break'])
+        self.assertEqual(self.events.named('cycle_complete'), [])
+
+    def test_auto_repeat_restarts_from_now_after_a_long_sleep(self):
+        self.core.start()
+        self.clock.now = self.core.deadline + 45  # past the break's deadline too
+        self.core.poll()
+        self.assertEqual(self.core.deadline, self.clock.now + 30)
+
+    def test_cycle_complete_stops_at_the_break(self):
+        self.core.auto_repeat = False
+        self.core.start()
+        self.clock.now = self.core.deadline
+        self.assertIsNone(self.core.poll())
+        self.assertEqual(self.events.named('cycle_complete'), [()])
+        self.assertFalse(self.core.is_running)
+        self.assertFalse(self.core.is_focus)
+        self.assertEqual(self.core.remaining, 30)
+
+        # Starting again runs the break, then stops once more at the next break
+        self.core.start()
+        self.assertEqual(self.core.deadline, self.clock.now + 30)
+        self.clock.now = self.core.deadline
+        self.core.poll()
+        self.assertTrue(self.core.is_focus)
+        self.assertTrue(self.core.is_running)
+        self.assertEqual(len(self.events.named('cycle_complete')), 1)
+
+    def test_reset_forgets_the_session(self):
+        self.core.start()
+        self.clock.advance(10)
+        self.core.poll()
+        self.core.reset()
+        self.assertEqual((self.core.is_running, self.core.remaining, self.core.deadline), (False, 0, None))
+        self.core.start()
+        self.assertEqual(self.core.deadline, self.clock.now + 60)
+
+    def test_simulate_counts_whole_cycles(self):
+        self.assertEqual(simulate(self.core, self.clock, 50), 50)
+        kinds = [args[0] for args in self.events.named('session_complete')]
+        self.assertEqual(kinds, ['focus', 'break'] * 50)
+        self.assertFalse(self.core.is_running)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""TimerEngine: named timers sharing one deadline heap, driven by a VirtualClock."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timer_core import VirtualClock
+from timer_engine import TimerEngine
+
+
+class TimerEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(0.0)
+        self.engine = TimerEngine(clock=self.clock)
+        self.engine.add('a', 60, 30)
+        self.engine.add('b', 120, 30)
+        self.completed = []
+        self.engine.subscribe('session_complete', lambda name, kind, minutes, drift: self.completed.append((name, kind)))
+
+    def test_unwatched_timers_wake_only_at_deadlines(self):
+        self.engine.start('a')
+        self.engine.start('b')
+        self.assertEqual(self.engine.poll(), 60)
+        self.clock.now = 60
+        self.assertEqual(self.engine.poll(), 30)  # a's break ends before b's focus
+        self.assertEqual(self.completed, [('a', 'focus')])
+        self.assertEqual(self.engine.polls, 3)
+
+    def test_watched_timer_polls_every_second(self):
+        self.engine.watch('a')
+        self.engine.start('a')
+        self.assertEqual(self.engine.poll(), 1.0)
+        polls = self.engine.polls
+        for _ in range(10):
+            self.clock.advance(1)
+            self.engine.poll()
+        self.assertEqual(self.engine.polls, polls + 10)
+        self.assertEqual(self.engine.get('a').remaining, 50)
+
+    def test_pause_invalidates_the_heap_entry(self):
+        self.engine.start('a')
+        self.engine.poll()
+        self.engine.pause('a')
+        self.assertIsNone(self.engine.next_delay())
+        self.assertEqual(self.engine._heap, [])  # the stale entry was dropped
+        self.clock.now = 1000
+        polls = self.engine.polls
+        self.assertIsNone(self.engine.poll())
+        self.assertEqual(self.engine.polls, polls)
+        self.assertEqual(self.completed, [])
+
+    def test_rescheduling_leaves_one_live_entry(self):
+        self.engine.start('a')
+        for _ in range(5):
+            self.engine.watch('a', True)
+            self.engine.watch('a', False)
+        self.assertEqual(len(self.engine._heap), 11)
+        self.clock.now = 60
+        self.engine.poll()
+        self.assertEqual(self.completed, [('a', 'focus')])
+        self.assertEqual(self.engine.polls, 1)
+
+    def test_listener_pausing_its_timer_is_not_rescheduled(self):
+        self.engine.subscribe('session_complete', lambda name, *args: self.engine.pause(name))
+        self.engine.start('a')
+        self.engine.poll()
+        self.clock.now = 60
+        self.assertIsNone(self.engine.poll())
+        core = self.engine.get('a')
+        self.assertFalse(core.is_running)
+        self.assertFalse(core.is_focus)
+        self.engine.start('a')
+        self.assertEqual(core.deadline, 60 + 30)  # the break, in full
+
+    def test_listener_resetting_its_timer_stays_reset(self):
+        self.engine.subscribe('session_complete', lambda name, *args: self.engine.reset(name))
+        self.engine.start('a')
+        self.engine.poll()
+        self.clock.now = 60
+        self.assertIsNone(self.engine.poll())
+        core = self.engine.get('a')
+        self.assertEqual((core.is_running, core.is_focus, core.session_total_seconds), (False, True, 0))
+
+    def test_removed_timer_entries_are_skipped(self):
+        self.engine.start('a')
+        self.engine.start('b')
+        self.engine.remove('a')
+        self.assertEqual(self.engine.names(), ['b'])
+        self.assertEqual(self.engine.poll(), 120)
+        self.clock.now = 120
+        self.engine.poll()
+        self.assertEqual(self.completed, [('b', 'focus')])
+
+    def test_duplicate_names_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.engine.add('a')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+"""Headless Pomodoro timer state machine.
+
+TimerCore owns the focus/break cycle, the deadline-based countdown and the
+drift bookkeeping, but knows nothing about Tk. The UI (or a test, or a
+benchmark) drives it by calling poll() whenever it wakes up and subscribes to
+its events:
+
+    'tick'              (remaining_seconds)
+    'session_complete'  (kind, minutes, drift)   kind is 'focus' or 'break'
+    'phase_change'      (is_focus)
+    'cycle_complete'    ()                       auto-repeat off, break reached
+    'wakeup'            (late_seconds)           how late a poll came vs. its target
+
+The clock is injectable; VirtualClock plus simulate() run thousands of
+focus/break cycles per second for load-testing the history pipeline.
+"""
+
+import math
+import time
+
+
+class TimerCore:
+    EVENTS = ('tick', 'session_complete', 'phase_change', 'cycle_complete', 'wakeup')
+
+    def __init__(self, focus_seconds=25 * 60, break_seconds=5 * 60, auto_repeat=True, clock=time.monotonic):
+        self.clock = clock
+        self.focus_seconds = focus_seconds
+        self.break_seconds = break_seconds
+        self.auto_repeat = auto_repeat
+
+        self.is_running = False
+        self.is_focus = True
+        self.remaining = 0
+        self.session_total_seconds = 0
+        self.deadline = None
+        self._left = None
+        self._wake_target = None
+        self._drift = None
+        self.last_session_drift = None
+        self._listeners = {name: [] for name in self.EVENTS}
+
+    def subscribe(self, event, callback):
+        self._listeners[event].append(callback)
+
+    def unsubscribe(self, event, callback):
+        self._listeners[event].remove(callback)
+
+    def _emit(self, event, *args):
+        for callback in self._listeners[event]:
+            callback(*args)
+
+    def phase_seconds(self):
+        return self.focus_seconds if self.is_focus else self.break_seconds
+
+    def progress_ratio(self):
+        if self.session_total_seconds <= 0:
+            return 0.0
+        done = max(0, self.session_total_seconds - max(0, self.remaining))
+        return min(1.0, done / self.session_total_seconds)
+
+    def elapsed(self):
+        """Seconds into the current session, with sub-second precision"""
+        if self.is_running:
+            return self.session_total_seconds - (self.deadline - self.clock())
+        if self._left is not None:
+            return self.session_total_seconds - self._left
+        return 0.0
+
+    # --- Controls ---
+    def start(self):
+        if self.is_running:
+            return
+        self.session_total_seconds = self.phase_seconds()
+        if self._left is None or self._left <= 0 or self._left > self.session_total_seconds:
+            self._left = float(self.session_total_seconds)
+        self.deadline = self.clock() + self._left
+        self._wake_target = None
+        if self._drift is None:
+            self._reset_drift()
+        self.is_running = True
+
+    def pause(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        # Keep what is left of the session; resuming sets a fresh deadline from it
+        self._left = max(0.0, self.deadline - self.clock())
+        self.deadline = None
+        self.remaining = math.ceil(self._left)
+
+    def reset(self):
+        self.is_running = False
+        self.is_focus = True
+        self.remaining = 0
+        self.session_total_seconds = 0
+        self.deadline = None
+        self._left = None
+        self._drift = None
+
+    def poll(self, until_deadline=False):
+        """Advance to the clock's current time.
+
+        Returns the delay in seconds until the next useful wakeup (just after
+        the displayed second rolls over), or None when the timer is stopped.
+        With until_deadline=True nothing is being displayed, so the next
+        wakeup is the session deadline itself.
+        """
+        if not self.is_running:
+            return None
+        now = self.clock()
+        if self._wake_target is not None:
+            self._record_wakeup(now - self._wake_target)
+        left = self.deadline - now
+        if left <= 0:
+            self._complete(now)
+            if not self.is_running:
+                return None
+            now = self.clock()
+            left = self.deadline - now
+        self.remaining = math.ceil(left)
+        self._emit('tick', self.remaining)
+        if until_deadline:
+            delay = left
+        else:
+            delay = (left - math.floor(left)) or 1.0
+        self._wake_target = now + delay
+        return delay
+
+    def _complete(self, now):
+        kind = 'focus' if self.is_focus else 'break'
+        drift = self._finish_drift(now - self.deadline)
+        self._emit('session_complete', kind, self.session_total_seconds // 60, drift)
+        if self._drift is None:
+            return  # a listener reset the timer
+        self.is_focus = not self.is_focus
+        self.session_total_seconds = self.phase_seconds()
+        self.remaining = self.session_total_seconds
+        self._reset_drift()
+        self._emit('phase_change', self.is_focus)
+        if not self.auto_repeat and not self.is_focus:
+            self.is_running = False
+            self.deadline = None
+            self._left = float(self.session_total_seconds)
+            self._emit('cycle_complete')
+            return
+        if not self.is_running:
+            return  # a listener paused it; start() runs the new phase in full
+        # Chain off the old deadline so completion work adds no drift,
+        # unless we are already past it (e.g. after the machine slept)
+        now = self.clock()
+        self.deadline += self.session_total_seconds
+        if self.deadline <= now:
+            self.deadline = now + self.session_total_seconds
+
+    # --- Drift instrumentation ---
+    def _reset_drift(self):
+        self._drift = {'wakeups': 0, 'late_total': 0.0, 'late_max': 0.0}
+
+    def _record_wakeup(self, late):
+        d = self._drift
+        late = max(0.0, late)
+        d['wakeups'] += 1
+        d['late_total'] += late
+        d['late_max'] = max(d['late_max'], late)
+        self._emit('wakeup', late)
+
+    def _finish_drift(self, end_late):
+        d = dict(self._drift or {'wakeups': 0, 'late_total': 0.0, 'late_max': 0.0})
+        d['end_late'] = max(0.0, end_late)
+        self.last_session_drift = d
+        return d
+
+
+class VirtualClock:
+    """Manually advanced clock for driving TimerCore without waiting"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def simulate(core, clock, cycles, per_second=False):
+    """Run `cycles` focus+break cycles on a VirtualClock.
+
+    By default the clock jumps straight to each deadline, so one cycle costs
+    two polls. With per_second=True every displayed second is polled too,
+    which is what the UI would see.
+    """
+    completed = [0]
+
+    def count(kind, minutes, drift):
+        if kind == 'break':
+            completed[0] += 1
+
+    core.subscribe('session_complete', count)
+    core.auto_repeat = True
+    core.start()
+    delay = core.poll()
+    while completed[0] < cycles:
+        if per_second:
+            clock.advance(delay if delay is not None else 1.0)
+            delay = core.poll()
+        else:
+            clock.now = core.deadline
+            core.poll()
+    core.pause()
+    core.unsubscribe('session_complete', count)
+    return completed[0]
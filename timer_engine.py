@@ -0,0 +1,130 @@
+"""Many named timers on one deadline scheduler.
+
+Each timer is a TimerCore with its own focus/break durations and
+auto-repeat. The engine keeps one heap of (wake time, timer) entries, so the
+UI needs a single `after` wakeup for all of them: poll() runs whichever
+timers are due and returns the delay until the next one.
+
+Only "watched" timers (the one on screen) are polled every second; the rest
+wake at their session deadlines. CPU use therefore grows with the number of
+session boundaries, not with timers x seconds.
+
+Listeners get the timer name first, then TimerCore's event arguments:
+
+    engine.subscribe('session_complete', lambda name, kind, minutes, drift: ...)
+
+Start, pause and reset timers through the engine so their heap entries stay
+in step; calling the TimerCore controls directly bypasses scheduling.
+"""
+
+import heapq
+import itertools
+import time
+
+from timer_core import TimerCore
+
+
+class TimerEngine:
+    EVENTS = TimerCore.EVENTS
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.timers = {}
+        self.watched = set()
+        self.polls = 0
+        self._heap = []  # (wake time, seq, name, generation)
+        self._gen = {}
+        self._seq = itertools.count()
+        self._listeners = {name: [] for name in self.EVENTS}
+
+    # --- Timers ---
+    def add(self, name, focus_seconds=25 * 60, break_seconds=5 * 60, auto_repeat=True):
+        if name in self.timers:
+            raise ValueError(f"Timer {name!r} already exists")
+        core = TimerCore(focus_seconds, break_seconds, auto_repeat, clock=self.clock)
+        for event in self.EVENTS:
+            core.subscribe(event, lambda *args, _event=event, _name=name: self._emit(_event, _name, *args))
+        self.timers[name] = core
+        self._gen[name] = 0
+        return core
+
+    def remove(self, name):
+        self.timers.pop(name).reset()
+        del self._gen[name]  # its heap entries are skipped from now on
+        self.watched.discard(name)
+
+    def get(self, name):
+        return self.timers[name]
+
+    def names(self):
+        return list(self.timers)
+
+    def __contains__(self, name):
+        return name in self.timers
+
+    def __len__(self):
+        return len(self.timers)
+
+    def running(self):
+        return [name for name, core in self.timers.items() if core.is_running]
+
+    # --- Events ---
+    def subscribe(self, event, callback):
+        self._listeners[event].append(callback)
+
+    def unsubscribe(self, event, callback):
+        self._listeners[event].remove(callback)
+
+    def _emit(self, event, name, *args):
+        for callback in self._listeners[event]:
+            callback(name, *args)
+
+    # --- Controls ---
+    def start(self, name):
+        self.timers[name].start()
+        self._schedule(name, self.clock())
+
+    def pause(self, name):
+        self.timers[name].pause()
+        self._gen[name] += 1
+
+    def reset(self, name):
+        self.timers[name].reset()
+        self._gen[name] += 1
+
+    def watch(self, name, watched=True):
+        """Poll `name` every displayed second (watched) or only at its deadline"""
+        if watched:
+            self.watched.add(name)
+        else:
+            self.watched.discard(name)
+        if name in self.timers and self.timers[name].is_running:
+            self._schedule(name, self.clock())  # re-poll now to pick up the new cadence
+
+    # --- Scheduling ---
+    def _schedule(self, name, when):
+        # Bumping the generation drops any older heap entry for this timer
+        self._gen[name] += 1
+        heapq.heappush(self._heap, (when, next(self._seq), name, self._gen[name]))
+
+    def poll(self):
+        """Poll every timer that is due; returns seconds until the next wakeup, or None when idle"""
+        now = self.clock()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, name, gen = heapq.heappop(heap)
+            if self._gen.get(name) != gen:
+                continue
+            self.polls += 1
+            delay = self.timers[name].poll(until_deadline=name not in self.watched)
+            if delay is not None and self._gen.get(name) == gen:  # a listener may have paused it
+                self._schedule(name, self.clock() + delay)
+        return self.next_delay()
+
+    def next_delay(self):
+        heap = self._heap
+        while heap and self._gen.get(heap[0][2]) != heap[0][3]:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - self.clock())